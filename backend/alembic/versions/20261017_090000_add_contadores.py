@@ -0,0 +1,55 @@
+"""add contadores table
+
+Revision ID: 20261017_090000
+Revises: 20260107_063753
+Create Date: 2026-10-17 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_090000'
+down_revision = '20260107_063753'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### 1. Criar tabela contadores ###
+    op.create_table('contadores',
+        sa.Column('dimensao', sa.String(length=50), nullable=False),
+        sa.Column('valor', sa.String(length=50), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atualizado_em', sa.DateTime(), nullable=True, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('dimensao', 'valor')
+    )
+
+    # ### DATA MIGRATION ###
+
+    # Popula contadores a partir das tabelas base
+    op.execute("""
+        INSERT INTO contadores (dimensao, valor, total)
+        SELECT 'contribuicoes_status', status_moderacao::text, count(*)
+        FROM contribuicoes GROUP BY status_moderacao
+        UNION ALL
+        SELECT 'aprovadas_tipo', tipo::text, count(*)
+        FROM contribuicoes WHERE status_moderacao = 'APROVADA' GROUP BY tipo
+        UNION ALL
+        SELECT 'aprovadas_documento', documento::text, count(*)
+        FROM contribuicoes WHERE status_moderacao = 'APROVADA' GROUP BY documento
+        UNION ALL
+        SELECT 'participantes_tipo', tipo::text, count(*)
+        FROM participantes GROUP BY tipo
+        UNION ALL
+        SELECT 'participantes_uf', uf, count(*)
+        FROM participantes GROUP BY uf
+        UNION ALL
+        SELECT 'protocolos_documento', documento, count(*)
+        FROM protocolos GROUP BY documento
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('contadores')
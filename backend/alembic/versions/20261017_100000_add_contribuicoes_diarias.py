@@ -0,0 +1,48 @@
+"""add contribuicoes_diarias rollup
+
+Revision ID: 20261017_100000
+Revises: 20261017_090000
+Create Date: 2026-10-17 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_100000'
+down_revision = '20261017_090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Enums já existentes (criados na migração inicial e no sistema admin)
+    documento_enum = postgresql.ENUM('CEO', 'CPEO', name='documentoconsulta', create_type=False)
+    tipo_enum = postgresql.ENUM('ALTERACAO', 'INCLUSAO', 'EXCLUSAO', 'COMENTARIO', name='tipocontribuicao', create_type=False)
+    status_moderacao_enum = postgresql.ENUM('PENDENTE', 'APROVADA', 'REJEITADA', name='statusmoderacao', create_type=False)
+
+    # ### 1. Criar tabela contribuicoes_diarias ###
+    op.create_table('contribuicoes_diarias',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('documento', documento_enum, nullable=False),
+        sa.Column('tipo', tipo_enum, nullable=False),
+        sa.Column('uf', sa.String(length=2), nullable=False),
+        sa.Column('status_moderacao', status_moderacao_enum, nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('dia', 'documento', 'tipo', 'uf', 'status_moderacao')
+    )
+
+    # ### 2. Criar tabela rollup_dias_selados ###
+    # Os dias passados são consolidados sob demanda na primeira leitura do dashboard
+    op.create_table('rollup_dias_selados',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('selado_em', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('dia')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_dias_selados')
+    op.drop_table('contribuicoes_diarias')
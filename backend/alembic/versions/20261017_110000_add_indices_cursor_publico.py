@@ -0,0 +1,39 @@
+"""add indices for public keyset pagination
+
+Revision ID: 20261017_110000
+Revises: 20261017_100000
+Create Date: 2026-10-17 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_110000'
+down_revision = '20261017_100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Índices parciais (apenas aprovadas) na ordem da listagem pública
+    op.create_index(
+        'idx_contribuicao_publica_cursor',
+        'contribuicoes',
+        [sa.text('criado_em DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text("status_moderacao = 'APROVADA'")
+    )
+    op.create_index(
+        'idx_contribuicao_publica_doc_cursor',
+        'contribuicoes',
+        ['documento', sa.text('criado_em DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text("status_moderacao = 'APROVADA'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contribuicao_publica_doc_cursor', table_name='contribuicoes')
+    op.drop_index('idx_contribuicao_publica_cursor', table_name='contribuicoes')
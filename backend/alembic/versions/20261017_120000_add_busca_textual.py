@@ -0,0 +1,51 @@
+"""add full-text search vector to contribuicoes
+
+Revision ID: 20261017_120000
+Revises: 20261017_110000
+Create Date: 2026-10-17 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_120000'
+down_revision = '20261017_110000'
+branch_labels = None
+depends_on = None
+
+
+# Mesma expressão de app.models.contribuicao.EXPRESSAO_BUSCA_VETOR
+EXPRESSAO_BUSCA_VETOR = (
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(titulo_capitulo, '')), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(texto_proposto, '')), 'B') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(fundamentacao, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Coluna gerada: preenchida para as linhas existentes e mantida pelo banco
+    op.add_column(
+        'contribuicoes',
+        sa.Column(
+            'busca_vetor',
+            postgresql.TSVECTOR(),
+            sa.Computed(EXPRESSAO_BUSCA_VETOR, persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'idx_contribuicao_busca_vetor',
+        'contribuicoes',
+        ['busca_vetor'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_where=sa.text("status_moderacao = 'APROVADA'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contribuicao_busca_vetor', table_name='contribuicoes')
+    op.drop_column('contribuicoes', 'busca_vetor')
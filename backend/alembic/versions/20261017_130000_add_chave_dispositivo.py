@@ -0,0 +1,107 @@
+"""add normalized article key to contribuicoes
+
+Revision ID: 20261017_130000
+Revises: 20261017_120000
+Create Date: 2026-10-17 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.dispositivo import extrair_chave_dispositivo, extrair_numero_capitulo
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_130000'
+down_revision = '20261017_120000'
+branch_labels = None
+depends_on = None
+
+TAMANHO_LOTE = 1000
+
+
+def upgrade() -> None:
+    # ### 1. Colunas da chave normalizada ###
+    op.add_column('contribuicoes', sa.Column('capitulo_numero', sa.Integer(), nullable=True))
+    op.add_column('contribuicoes', sa.Column('artigo_numero', sa.Integer(), nullable=True))
+    op.add_column('contribuicoes', sa.Column('paragrafo_numero', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('contribuicoes', sa.Column('inciso_numero', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('contribuicoes', sa.Column('alinea_numero', sa.Integer(), nullable=False, server_default='0'))
+
+    # ### 2. Backfill (mesmo parser usado na criação) ###
+    conn = op.get_bind()
+    contribuicoes = sa.table(
+        'contribuicoes',
+        sa.column('id', sa.Integer),
+        sa.column('titulo_capitulo', sa.String),
+        sa.column('artigo', sa.String),
+        sa.column('paragrafo_inciso_alinea', sa.String),
+        sa.column('capitulo_numero', sa.Integer),
+        sa.column('artigo_numero', sa.Integer),
+        sa.column('paragrafo_numero', sa.Integer),
+        sa.column('inciso_numero', sa.Integer),
+        sa.column('alinea_numero', sa.Integer),
+    )
+    atualizar = (
+        contribuicoes.update()
+        .where(contribuicoes.c.id == sa.bindparam('_id'))
+        .values(
+            capitulo_numero=sa.bindparam('capitulo_numero'),
+            artigo_numero=sa.bindparam('artigo_numero'),
+            paragrafo_numero=sa.bindparam('paragrafo_numero'),
+            inciso_numero=sa.bindparam('inciso_numero'),
+            alinea_numero=sa.bindparam('alinea_numero'),
+        )
+    )
+
+    ultimo_id = 0
+    while True:
+        linhas = conn.execute(
+            sa.select(
+                contribuicoes.c.id,
+                contribuicoes.c.titulo_capitulo,
+                contribuicoes.c.artigo,
+                contribuicoes.c.paragrafo_inciso_alinea
+            )
+            .where(contribuicoes.c.id > ultimo_id)
+            .order_by(contribuicoes.c.id)
+            .limit(TAMANHO_LOTE)
+        ).all()
+
+        if not linhas:
+            break
+
+        parametros = []
+        for linha in linhas:
+            chave = extrair_chave_dispositivo(linha.artigo, linha.paragrafo_inciso_alinea)
+            parametros.append({
+                '_id': linha.id,
+                'capitulo_numero': extrair_numero_capitulo(linha.titulo_capitulo),
+                'artigo_numero': chave.artigo,
+                'paragrafo_numero': chave.paragrafo,
+                'inciso_numero': chave.inciso,
+                'alinea_numero': chave.alinea,
+            })
+        conn.execute(atualizar, parametros)
+        ultimo_id = linhas[-1].id
+
+    # ### 3. Índices (substitui o índice por texto livre de artigo) ###
+    op.drop_index('idx_contribuicao_doc_artigo', table_name='contribuicoes')
+    op.create_index(
+        'idx_contribuicao_doc_dispositivo',
+        'contribuicoes',
+        ['documento', 'artigo_numero', 'paragrafo_numero', 'inciso_numero', 'alinea_numero'],
+        unique=False
+    )
+    op.create_index('idx_contribuicao_doc_capitulo', 'contribuicoes', ['documento', 'capitulo_numero'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contribuicao_doc_capitulo', table_name='contribuicoes')
+    op.drop_index('idx_contribuicao_doc_dispositivo', table_name='contribuicoes')
+    op.create_index('idx_contribuicao_doc_artigo', 'contribuicoes', ['documento', 'artigo'], unique=False)
+    op.drop_column('contribuicoes', 'alinea_numero')
+    op.drop_column('contribuicoes', 'inciso_numero')
+    op.drop_column('contribuicoes', 'paragrafo_numero')
+    op.drop_column('contribuicoes', 'artigo_numero')
+    op.drop_column('contribuicoes', 'capitulo_numero')
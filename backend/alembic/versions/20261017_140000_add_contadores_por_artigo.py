@@ -0,0 +1,35 @@
+"""add per-article approved counters
+
+Revision ID: 20261017_140000
+Revises: 20261017_130000
+Create Date: 2026-10-17 14:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_140000'
+down_revision = '20261017_130000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### DATA MIGRATION ###
+
+    # Contadores de aprovadas por (documento, artigo, tipo) para o mapa de calor
+    op.execute("""
+        INSERT INTO contadores (dimensao, valor, total)
+        SELECT 'aprovadas_artigo',
+               documento::text || ':' || coalesce(artigo_numero, 0)::text || ':' || tipo::text,
+               count(*)
+        FROM contribuicoes
+        WHERE status_moderacao = 'APROVADA'
+        GROUP BY documento, coalesce(artigo_numero, 0), tipo
+        ON CONFLICT (dimensao, valor) DO UPDATE SET total = EXCLUDED.total
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM contadores WHERE dimensao = 'aprovadas_artigo'")
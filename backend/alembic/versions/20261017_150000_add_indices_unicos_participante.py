@@ -0,0 +1,109 @@
+"""deduplicate participants and add unique CPF/CNPJ hash indexes
+
+Revision ID: 20261017_150000
+Revises: 20261017_140000
+Create Date: 2026-10-17 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_150000'
+down_revision = '20261017_140000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### DATA MIGRATION ###
+
+    # Mapeia duplicados (mesmo hash) para o participante mais antigo.
+    # Um participante duplicado por CPF e por CNPJ aparece nas duas
+    # partições: DISTINCT ON (id) mantém uma única linha (o menor destino),
+    # para que reatribuições e contadores não sejam aplicados em dobro.
+    op.execute("""
+        CREATE TEMPORARY TABLE participantes_duplicados ON COMMIT DROP AS
+        SELECT DISTINCT ON (id) id, manter_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY cpf_hash) AS manter_id
+            FROM participantes WHERE cpf_hash IS NOT NULL
+            UNION ALL
+            SELECT id, min(id) OVER (PARTITION BY cnpj_hash) AS manter_id
+            FROM participantes WHERE cnpj_hash IS NOT NULL
+        ) AS candidatos
+        WHERE id <> manter_id
+        ORDER BY id, manter_id
+    """)
+
+    # O destino pode ser, ele mesmo, duplicado pelo outro hash: segue a
+    # cadeia até um participante mantido (manter_id sempre diminui)
+    conexao = op.get_bind()
+    while conexao.execute(sa.text("""
+        UPDATE participantes_duplicados d SET manter_id = destino.manter_id
+        FROM participantes_duplicados destino
+        WHERE d.manter_id = destino.id
+    """)).rowcount:
+        pass
+
+    # Contribuições e protocolos passam para o participante mantido
+    op.execute("""
+        UPDATE contribuicoes c SET participante_id = d.manter_id
+        FROM participantes_duplicados d
+        WHERE c.participante_id = d.id
+    """)
+    op.execute("""
+        UPDATE protocolos p SET participante_id = d.manter_id
+        FROM participantes_duplicados d
+        WHERE p.participante_id = d.id
+    """)
+
+    # Desconta os duplicados dos contadores de participantes
+    op.execute("""
+        UPDATE contadores c
+        SET total = c.total - r.removidos, atualizado_em = now()
+        FROM (
+            SELECT 'participantes_tipo' AS dimensao, p.tipo::text AS valor, count(*) AS removidos
+            FROM participantes p JOIN participantes_duplicados d ON d.id = p.id
+            GROUP BY p.tipo
+            UNION ALL
+            SELECT 'participantes_uf', p.uf, count(*)
+            FROM participantes p JOIN participantes_duplicados d ON d.id = p.id
+            GROUP BY p.uf
+        ) AS r
+        WHERE c.dimensao = r.dimensao AND c.valor = r.valor
+    """)
+
+    op.execute("""
+        DELETE FROM participantes
+        WHERE id IN (SELECT id FROM participantes_duplicados)
+    """)
+
+    # ### ÍNDICES ###
+
+    # Índices únicos parciais substituem os índices simples dos hashes
+    op.drop_index('ix_participantes_cpf_hash', table_name='participantes')
+    op.drop_index('ix_participantes_cnpj_hash', table_name='participantes')
+    op.create_index(
+        'idx_participante_cpf_hash_unico',
+        'participantes',
+        ['cpf_hash'],
+        unique=True,
+        postgresql_where=sa.text('cpf_hash IS NOT NULL')
+    )
+    op.create_index(
+        'idx_participante_cnpj_hash_unico',
+        'participantes',
+        ['cnpj_hash'],
+        unique=True,
+        postgresql_where=sa.text('cnpj_hash IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    # Participantes removidos como duplicados não são restaurados
+    op.drop_index('idx_participante_cnpj_hash_unico', table_name='participantes')
+    op.drop_index('idx_participante_cpf_hash_unico', table_name='participantes')
+    op.create_index('ix_participantes_cnpj_hash', 'participantes', ['cnpj_hash'], unique=False)
+    op.create_index('ix_participantes_cpf_hash', 'participantes', ['cpf_hash'], unique=False)
@@ -0,0 +1,43 @@
+"""add protocol sequence counters per document and year
+
+Revision ID: 20261017_160000
+Revises: 20261017_150000
+Create Date: 2026-10-17 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_160000'
+down_revision = '20261017_150000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### 1. Criar tabela sequenciais_protocolo ###
+    op.create_table('sequenciais_protocolo',
+        sa.Column('documento', sa.String(length=10), nullable=False),
+        sa.Column('ano', sa.Integer(), nullable=False),
+        sa.Column('ultimo', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('documento', 'ano')
+    )
+
+    # ### DATA MIGRATION ###
+
+    # Continua a partir do maior sequencial já emitido (CP-{DOC}-{ANO}-{SEQ})
+    op.execute("""
+        INSERT INTO sequenciais_protocolo (documento, ano, ultimo)
+        SELECT split_part(numero_protocolo, '-', 2),
+               split_part(numero_protocolo, '-', 3)::integer,
+               max(split_part(numero_protocolo, '-', 4)::integer)
+        FROM protocolos
+        WHERE numero_protocolo ~ '^CP-[A-Z]+-[0-9]{4}-[0-9]+$'
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('sequenciais_protocolo')
@@ -0,0 +1,51 @@
+"""add protocol/contribution link table
+
+Revision ID: 20261017_170000
+Revises: 20261017_160000
+Create Date: 2026-10-17 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_170000'
+down_revision = '20261017_160000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### 1. Criar tabela protocolo_contribuicoes ###
+    op.create_table('protocolo_contribuicoes',
+        sa.Column('protocolo_id', sa.Integer(), nullable=False),
+        sa.Column('contribuicao_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['protocolo_id'], ['protocolos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['contribuicao_id'], ['contribuicoes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('protocolo_id', 'contribuicao_id')
+    )
+    op.create_index(
+        'idx_protocolo_contribuicao_contribuicao',
+        'protocolo_contribuicoes',
+        ['contribuicao_id'],
+        unique=False
+    )
+
+    # ### DATA MIGRATION ###
+
+    # Expande o array JSON contribuicoes_ids (ignora IDs inexistentes)
+    op.execute("""
+        INSERT INTO protocolo_contribuicoes (protocolo_id, contribuicao_id)
+        SELECT DISTINCT p.id, c.id
+        FROM protocolos p
+        CROSS JOIN LATERAL json_array_elements_text(p.contribuicoes_ids) AS item(valor)
+        JOIN contribuicoes c ON c.id = item.valor::integer
+        WHERE p.contribuicoes_ids IS NOT NULL
+          AND json_typeof(p.contribuicoes_ids) = 'array'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_protocolo_contribuicao_contribuicao', table_name='protocolo_contribuicoes')
+    op.drop_table('protocolo_contribuicoes')
@@ -0,0 +1,58 @@
+"""add email outbox
+
+Revision ID: 20261017_180000
+Revises: 20261017_170000
+Create Date: 2026-10-17 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_180000'
+down_revision = '20261017_170000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### Criar Enum type ###
+    postgresql.ENUM('PENDENTE', 'ENVIADO', 'FALHOU', name='statusemail').create(
+        op.get_bind(), checkfirst=True
+    )
+    status_email_enum = postgresql.ENUM('PENDENTE', 'ENVIADO', 'FALHOU', name='statusemail', create_type=False)
+
+    # ### 1. Criar tabela email_outbox ###
+    op.create_table('email_outbox',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('tipo', sa.String(length=50), nullable=False),
+        sa.Column('protocolo_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', status_email_enum, nullable=False, server_default='PENDENTE'),
+        sa.Column('tentativas', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('proxima_tentativa_em', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('ultimo_erro', sa.Text(), nullable=True),
+        sa.Column('criado_em', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('enviado_em', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['protocolo_id'], ['protocolos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_email_outbox_protocolo_id'), 'email_outbox', ['protocolo_id'], unique=False)
+    op.create_index(
+        'idx_email_outbox_fila',
+        'email_outbox',
+        ['proxima_tentativa_em'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDENTE'")
+    )
+    op.create_index('idx_email_outbox_status_criado', 'email_outbox', ['status', 'criado_em'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_email_outbox_status_criado', table_name='email_outbox')
+    op.drop_index('idx_email_outbox_fila', table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_protocolo_id'), table_name='email_outbox')
+    op.drop_table('email_outbox')
+    postgresql.ENUM(name='statusemail').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,43 @@
+"""add moderation queue claims (lease) to contributions
+
+Revision ID: 20261017_190000
+Revises: 20261017_180000
+Create Date: 2026-10-17 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_190000'
+down_revision = '20261017_180000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ### 1. Colunas de reserva ###
+    op.add_column('contribuicoes', sa.Column('reservado_por_id', sa.Integer(), nullable=True))
+    op.add_column('contribuicoes', sa.Column('reservado_ate', sa.DateTime(), nullable=True))
+    op.create_foreign_key(
+        'contribuicoes_reservado_por_id_fkey',
+        'contribuicoes', 'admins',
+        ['reservado_por_id'], ['id']
+    )
+
+    # ### ÍNDICES ###
+    op.create_index(
+        'idx_contribuicao_reservado_por',
+        'contribuicoes',
+        ['reservado_por_id'],
+        unique=False,
+        postgresql_where=sa.text('reservado_por_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_contribuicao_reservado_por', table_name='contribuicoes')
+    op.drop_constraint('contribuicoes_reservado_por_id_fkey', 'contribuicoes', type_='foreignkey')
+    op.drop_column('contribuicoes', 'reservado_ate')
+    op.drop_column('contribuicoes', 'reservado_por_id')
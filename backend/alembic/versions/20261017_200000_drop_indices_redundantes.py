@@ -0,0 +1,46 @@
+"""drop redundant indexes on contribuicoes and historico_moderacao
+
+Revision ID: 20261017_200000
+Revises: 20261017_190000
+Create Date: 2026-10-17 20:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_200000'
+down_revision = '20261017_190000'
+branch_labels = None
+depends_on = None
+
+
+# Índices duplicados (PK) ou cobertos pelo início de um índice composto.
+# Toda moderação atualiza a linha fora de HOT e paga a manutenção de cada
+# índice; em lote, o custo é proporcional ao número de índices.
+INDICES_REDUNDANTES = {
+    'contribuicoes': [
+        ('ix_contribuicoes_id', ['id']),                       # = chave primária
+        ('ix_contribuicoes_documento', ['documento']),         # idx_contribuicao_doc_dispositivo
+        ('ix_contribuicoes_tipo', ['tipo']),                   # idx_contribuicao_tipo_doc
+        ('ix_contribuicoes_publicada', ['publicada']),         # sempre TRUE
+        ('idx_contribuicao_publicada_criado', ['publicada', 'criado_em']),  # ix_contribuicoes_criado_em
+    ],
+    'historico_moderacao': [
+        ('ix_historico_moderacao_id', ['id']),                            # = chave primária
+        ('ix_historico_moderacao_contribuicao_id', ['contribuicao_id']),  # idx_moderacao_contribuicao_criado
+        ('ix_historico_moderacao_admin_id', ['admin_id']),                # idx_moderacao_admin_criado
+    ],
+}
+
+
+def upgrade() -> None:
+    for tabela, indices in INDICES_REDUNDANTES.items():
+        for nome, _ in indices:
+            op.execute(f'DROP INDEX IF EXISTS {nome}')
+
+
+def downgrade() -> None:
+    for tabela, indices in INDICES_REDUNDANTES.items():
+        for nome, colunas in indices:
+            op.create_index(nome, tabela, colunas, unique=False)
@@ -22,7 +22,7 @@ from ...utils.security import (
     descriptografar_dados
 )
 from ...utils.permissions import obter_admin_atual
-from ...models.admin import Admin
+from ...utils.cache_admin import PrincipalAdmin
 
 router = APIRouter(prefix="/admin/auth", tags=["Admin - Autenticação"])
 
@@ -131,7 +131,7 @@ async def refresh_token(
 @router.post("/logout")
 async def logout_admin(
     request: Request,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -153,7 +153,7 @@ async def logout_admin(
 async def alterar_senha(
     data: AdminAlterarSenha,
     request: Request,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -10,7 +10,7 @@ from ...schemas.consulta import ConsultaCreate, ConsultaUpdate, ConsultaResponse
 from ...services import consulta_service, auditoria_service
 from ...services.auditoria_service import AcoesLog
 from ...utils.permissions import obter_admin_atual, require_super_admin
-from ...models.admin import Admin
+from ...utils.cache_admin import PrincipalAdmin
 from ...models.consulta import StatusConsulta
 
 router = APIRouter(prefix="/admin/consultas", tags=["Admin - Consultas Públicas"])
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/admin/consultas", tags=["Admin - Consultas Públicas
 async def criar_consulta(
     data: ConsultaCreate,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -48,7 +48,7 @@ async def criar_consulta(
 @router.get("", response_model=List[ConsultaResponse])
 async def listar_consultas(
     status: Optional[StatusConsulta] = None,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -60,7 +60,7 @@ async def listar_consultas(
 
 @router.get("/ativa", response_model=Optional[ConsultaResponse])
 async def obter_consulta_ativa(
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -73,7 +73,7 @@ async def obter_consulta_ativa(
 @router.get("/{consulta_id}", response_model=ConsultaResponse)
 async def obter_consulta(
     consulta_id: int,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -95,7 +95,7 @@ async def atualizar_consulta(
     consulta_id: int,
     data: ConsultaUpdate,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -131,7 +131,7 @@ async def atualizar_consulta(
 async def encerrar_consulta(
     consulta_id: int,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
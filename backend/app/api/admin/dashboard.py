@@ -2,87 +2,171 @@
 Router de dashboard e estatísticas
 """
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.database import get_db
 from ...services import dashboard_service
-from ...utils.permissions import obter_admin_atual
-from ...models.admin import Admin
+from ...services.metricas_tempo_real_service import transmissor_metricas
+from ...utils.cache import CacheAssincrono, EventosCache, estatisticas_caches
+from ...utils.permissions import obter_admin_atual, require_super_admin
+from ...utils.cache_admin import PrincipalAdmin
 
 router = APIRouter(prefix="/admin/dashboard", tags=["Admin - Dashboard"])
 
+# Cache compartilhado entre admins (invalidado por escritas após o commit)
+cache_dashboard = CacheAssincrono("dashboard")
+
 
 @router.get("/estatisticas")
 async def obter_estatisticas(
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna estatísticas gerais do sistema
     """
-    stats = await dashboard_service.obter_estatisticas_gerais(db)
+    stats = await cache_dashboard.obter_ou_calcular(
+        "estatisticas",
+        settings.CACHE_DASHBOARD_TTL_SEGUNDOS,
+        lambda: dashboard_service.obter_estatisticas_gerais(db),
+        eventos=[
+            EventosCache.CONTRIBUICAO,
+            EventosCache.MODERACAO,
+            EventosCache.PARTICIPANTE,
+            EventosCache.PROTOCOLO
+        ]
+    )
     return stats
 
 
 @router.get("/contribuicoes-por-uf")
 async def obter_contribuicoes_por_uf(
     limit: int = 27,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna contribuições agrupadas por UF
     """
-    dados = await dashboard_service.obter_contribuicoes_por_uf(db, limit)
+    dados = await cache_dashboard.obter_ou_calcular(
+        f"contribuicoes-por-uf:{limit}",
+        settings.CACHE_DASHBOARD_TTL_SEGUNDOS,
+        lambda: dashboard_service.obter_contribuicoes_por_uf(db, limit),
+        eventos=[EventosCache.MODERACAO]
+    )
     return {"dados": dados}
 
 
 @router.get("/contribuicoes-por-periodo")
 async def obter_contribuicoes_por_periodo(
     dias: int = 30,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna contribuições agrupadas por dia (últimos N dias)
     """
-    dados = await dashboard_service.obter_contribuicoes_por_periodo(db, dias)
+    dados = await cache_dashboard.obter_ou_calcular(
+        f"contribuicoes-por-periodo:{dias}",
+        settings.CACHE_DASHBOARD_TTL_SEGUNDOS,
+        lambda: dashboard_service.obter_contribuicoes_por_periodo(db, dias),
+        eventos=[EventosCache.CONTRIBUICAO]
+    )
     return {"dados": dados}
 
 
 @router.get("/contribuicoes-recentes")
 async def obter_contribuicoes_recentes(
     limit: int = 10,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna contribuições mais recentes
     """
-    contribuicoes = await dashboard_service.obter_contribuicoes_recentes(db, limit)
+    contribuicoes = await cache_dashboard.obter_ou_calcular(
+        f"contribuicoes-recentes:{limit}",
+        settings.CACHE_DASHBOARD_TTL_TEMPO_REAL_SEGUNDOS,
+        lambda: dashboard_service.obter_contribuicoes_recentes(db, limit),
+        eventos=[EventosCache.CONTRIBUICAO, EventosCache.MODERACAO]
+    )
     return {"contribuicoes": contribuicoes}
 
 
 @router.get("/metricas-tempo-real")
 async def obter_metricas_tempo_real(
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna métricas em tempo real
     """
-    metrics = await dashboard_service.obter_metricas_tempo_real(db)
+    metrics = await cache_dashboard.obter_ou_calcular(
+        "metricas-tempo-real",
+        settings.CACHE_DASHBOARD_TTL_TEMPO_REAL_SEGUNDOS,
+        lambda: dashboard_service.obter_metricas_tempo_real(db),
+        eventos=[
+            EventosCache.CONTRIBUICAO,
+            EventosCache.MODERACAO,
+            EventosCache.PROTOCOLO
+        ]
+    )
     return metrics
 
 
+@router.get("/metricas-tempo-real/stream")
+async def transmitir_metricas_tempo_real(
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream (Server-Sent Events) das métricas em tempo real e de moderação
+
+    Substitui o polling de /metricas-tempo-real e /admin/moderacao/estatisticas.
+    As métricas são calculadas uma vez por intervalo para todos os clientes:
+    o primeiro evento é `snapshot` (completo) e os seguintes são `delta`
+    (apenas campos alterados).
+    """
+    # Libera a conexão do banco usada na autenticação durante o stream
+    await db.close()
+
+    return StreamingResponse(
+        transmissor_metricas.transmitir(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.get("/ranking-participantes")
 async def obter_ranking_participantes(
     limit: int = 10,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna ranking de participantes mais ativos
     """
-    ranking = await dashboard_service.obter_ranking_participantes(db, limit)
+    ranking = await cache_dashboard.obter_ou_calcular(
+        f"ranking-participantes:{limit}",
+        settings.CACHE_DASHBOARD_TTL_SEGUNDOS,
+        lambda: dashboard_service.obter_ranking_participantes(db, limit),
+        eventos=[EventosCache.MODERACAO]
+    )
     return {"ranking": ranking}
+
+
+@router.get("/cache")
+async def obter_estatisticas_cache(
+    admin: PrincipalAdmin = Depends(require_super_admin())
+):
+    """
+    Retorna acertos/falhas dos caches em memória deste processo
+
+    Requer: SUPER_ADMIN
+    """
+    return {"caches": estatisticas_caches()}
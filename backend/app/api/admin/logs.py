@@ -9,7 +9,7 @@ from datetime import datetime
 from ...core.database import get_db
 from ...services import auditoria_service
 from ...utils.permissions import obter_admin_atual, require_analista
-from ...models.admin import Admin
+from ...utils.cache_admin import PrincipalAdmin
 
 router = APIRouter(prefix="/admin/logs", tags=["Admin - Logs e Auditoria"])
 
@@ -22,7 +22,7 @@ async def listar_logs(
     data_fim: Optional[datetime] = None,
     page: int = 1,
     per_page: int = 50,
-    admin: Admin = Depends(require_analista()),
+    admin: PrincipalAdmin = Depends(require_analista()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -51,7 +51,7 @@ async def listar_logs(
 
 @router.get("/acoes")
 async def obter_acoes_disponiveis(
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -64,7 +64,7 @@ async def obter_acoes_disponiveis(
 @router.get("/{log_id}")
 async def obter_log(
     log_id: int,
-    admin: Admin = Depends(require_analista()),
+    admin: PrincipalAdmin = Depends(require_analista()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -12,14 +12,17 @@ from ...schemas.moderacao import (
     ModeracaoRejeitar,
     ModeracaoEmLote,
     ModeracaoRejeitarEmLote,
+    ModeracaoReivindicar,
+    ModeracaoLiberar,
     FiltrosModeracaoPendentes,
     EstatisticasModeracaoResponse
 )
 from ...schemas.contribuicao import ContribuicaoAdminResponse
 from ...services import moderacao_service, auditoria_service
 from ...services.auditoria_service import AcoesLog
+from ...utils.dispositivo import FiltroDispositivo, obter_filtro_dispositivo
 from ...utils.permissions import obter_admin_atual, require_moderador
-from ...models.admin import Admin
+from ...utils.cache_admin import PrincipalAdmin
 from ...models.contribuicao import DocumentoConsulta, TipoContribuicao
 
 router = APIRouter(prefix="/admin/moderacao", tags=["Admin - Moderação"])
@@ -31,9 +34,10 @@ async def listar_pendentes(
     tipo: Optional[TipoContribuicao] = None,
     data_inicio: Optional[datetime] = None,
     data_fim: Optional[datetime] = None,
+    filtro: FiltroDispositivo = Depends(obter_filtro_dispositivo),
     page: int = 1,
     per_page: int = 20,
-    admin: Admin = Depends(require_moderador()),
+    admin: PrincipalAdmin = Depends(require_moderador()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -47,6 +51,7 @@ async def listar_pendentes(
         tipo=tipo,
         data_inicio=data_inicio,
         data_fim=data_fim,
+        filtro=filtro,
         page=page,
         per_page=per_page
     )
@@ -61,11 +66,71 @@ async def listar_pendentes(
     }
 
 
+@router.post("/reivindicar")
+async def reivindicar_pendentes(
+    data: ModeracaoReivindicar,
+    filtro: FiltroDispositivo = Depends(obter_filtro_dispositivo),
+    admin: PrincipalAdmin = Depends(require_moderador()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Reserva as próximas contribuições pendentes para o moderador
+
+    Moderadores simultâneos recebem contribuições distintas. A reserva
+    expira após MODERACAO_RESERVA_SEGUNDOS; chamar novamente a renova.
+    Contribuições reservadas não podem ser moderadas por outros moderadores
+    enquanto a reserva estiver ativa.
+
+    Requer: MODERADOR ou SUPER_ADMIN
+    """
+    contribuicoes, reservado_ate = await moderacao_service.reivindicar_pendentes(
+        db,
+        admin.id,
+        data.quantidade,
+        documento=data.documento,
+        tipo=data.tipo,
+        filtro=filtro
+    )
+
+    await db.commit()
+
+    return {
+        "contribuicoes": contribuicoes,
+        "total": len(contribuicoes),
+        "reservado_ate": reservado_ate
+    }
+
+
+@router.post("/liberar")
+async def liberar_reservas(
+    data: ModeracaoLiberar,
+    admin: PrincipalAdmin = Depends(require_moderador()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Devolve à fila contribuições reservadas pelo moderador
+
+    Requer: MODERADOR ou SUPER_ADMIN
+    """
+    total = await moderacao_service.liberar_reservas(
+        db,
+        admin.id,
+        data.contribuicao_ids
+    )
+
+    await db.commit()
+
+    return {
+        "message": f"{total} reservas liberadas",
+        "total_liberadas": total
+    }
+
+
 @router.post("/{contribuicao_id}/aprovar")
 async def aprovar_contribuicao(
     contribuicao_id: int,
     request: Request,
-    admin: Admin = Depends(require_moderador()),
+    admin: PrincipalAdmin = Depends(require_moderador()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -82,7 +147,7 @@ async def aprovar_contribuicao(
     if not contribuicao:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Contribuição não encontrada ou já moderada"
+            detail="Contribuição não encontrada, já moderada ou reservada por outro moderador"
         )
 
     await db.commit()
@@ -108,7 +173,7 @@ async def rejeitar_contribuicao(
     contribuicao_id: int,
     data: ModeracaoRejeitar,
     request: Request,
-    admin: Admin = Depends(require_moderador()),
+    admin: PrincipalAdmin = Depends(require_moderador()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -126,7 +191,7 @@ async def rejeitar_contribuicao(
     if not contribuicao:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Contribuição não encontrada ou já moderada"
+            detail="Contribuição não encontrada, já moderada ou reservada por outro moderador"
         )
 
     await db.commit()
@@ -152,7 +217,7 @@ async def rejeitar_contribuicao(
 async def aprovar_em_lote(
     data: ModeracaoEmLote,
     request: Request,
-    admin: Admin = Depends(require_moderador()),
+    admin: PrincipalAdmin = Depends(require_moderador()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -160,7 +225,7 @@ async def aprovar_em_lote(
 
     Requer: MODERADOR ou SUPER_ADMIN
     """
-    count = await moderacao_service.aprovar_em_lote(
+    alterados, ignorados = await moderacao_service.aprovar_em_lote(
         db,
         data.contribuicao_ids,
         admin.id
@@ -173,14 +238,19 @@ async def aprovar_em_lote(
         db,
         admin_id=admin.id,
         acao=AcoesLog.APROVAR_EM_LOTE,
-        detalhes={"quantidade": count, "ids": data.contribuicao_ids},
+        detalhes={"quantidade": len(alterados), "ids": data.contribuicao_ids, "ignorados": list(ignorados)},
         request=request
     )
     await db.commit()
 
     return {
-        "message": f"{count} contribuições aprovadas com sucesso",
-        "total_aprovadas": count
+        "message": f"{len(alterados)} contribuições aprovadas com sucesso",
+        "total_aprovadas": len(alterados),
+        "aprovadas": alterados,
+        "ignoradas": [
+            {"id": contribuicao_id, "motivo": motivo}
+            for contribuicao_id, motivo in ignorados.items()
+        ]
     }
 
 
@@ -188,7 +258,7 @@ async def aprovar_em_lote(
 async def rejeitar_em_lote(
     data: ModeracaoRejeitarEmLote,
     request: Request,
-    admin: Admin = Depends(require_moderador()),
+    admin: PrincipalAdmin = Depends(require_moderador()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -196,7 +266,7 @@ async def rejeitar_em_lote(
 
     Requer: MODERADOR ou SUPER_ADMIN
     """
-    count = await moderacao_service.rejeitar_em_lote(
+    alterados, ignorados = await moderacao_service.rejeitar_em_lote(
         db,
         data.contribuicao_ids,
         admin.id,
@@ -210,20 +280,25 @@ async def rejeitar_em_lote(
         db,
         admin_id=admin.id,
         acao=AcoesLog.REJEITAR_EM_LOTE,
-        detalhes={"quantidade": count, "ids": data.contribuicao_ids, "motivo": data.motivo},
+        detalhes={"quantidade": len(alterados), "ids": data.contribuicao_ids, "ignorados": list(ignorados), "motivo": data.motivo},
         request=request
     )
     await db.commit()
 
     return {
-        "message": f"{count} contribuições rejeitadas com sucesso",
-        "total_rejeitadas": count
+        "message": f"{len(alterados)} contribuições rejeitadas com sucesso",
+        "total_rejeitadas": len(alterados),
+        "rejeitadas": alterados,
+        "ignoradas": [
+            {"id": contribuicao_id, "motivo": motivo}
+            for contribuicao_id, motivo in ignorados.items()
+        ]
     }
 
 
 @router.get("/estatisticas", response_model=EstatisticasModeracaoResponse)
 async def obter_estatisticas(
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -236,7 +311,7 @@ async def obter_estatisticas(
 @router.get("/historico/{contribuicao_id}")
 async def obter_historico(
     contribuicao_id: int,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -1,20 +1,23 @@
 """
 Router de gerenciamento de participantes
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from typing import Optional
+from typing import AsyncIterator, Optional
 from io import StringIO
+import asyncio
 import csv
 
-from ...core.database import get_db
+from ...core.config import settings
+from ...core.database import get_db, AsyncSessionLocal
 from ...models.participante import Participante, TipoParticipante
-from ...services import auditoria_service
+from ...services import auditoria_service, participante_service
 from ...services.auditoria_service import AcoesLog
 from ...utils.permissions import obter_admin_atual
-from ...utils.security import descriptografar_dados
-from ...models.admin import Admin
+from ...utils.security import crypto_async, descriptografar_dados
+from ...utils.cache_admin import PrincipalAdmin
 
 router = APIRouter(prefix="/admin/participantes", tags=["Admin - Participantes"])
 
@@ -25,7 +28,7 @@ async def listar_participantes(
     uf: Optional[str] = None,
     page: int = 1,
     per_page: int = 50,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -54,12 +57,16 @@ async def listar_participantes(
     result = await db.execute(query)
     participantes = list(result.scalars().all())
 
-    # Descriptografa dados
+    # Descriptografa dados (um único lote no pool de criptografia)
+    valores = await crypto_async.decrypt_many([
+        campo
+        for p in participantes
+        for campo in (p.email_criptografado, p.cpf_criptografado, p.cnpj_criptografado)
+    ])
+
     participantes_descriptografados = []
-    for p in participantes:
-        email = descriptografar_dados(p.email_criptografado)
-        cpf = descriptografar_dados(p.cpf_criptografado) if p.cpf_criptografado else None
-        cnpj = descriptografar_dados(p.cnpj_criptografado) if p.cnpj_criptografado else None
+    for i, p in enumerate(participantes):
+        email, cpf, cnpj = valores[3 * i:3 * i + 3]
 
         participantes_descriptografados.append({
             "id": p.id,
@@ -85,7 +92,7 @@ async def listar_participantes(
 @router.get("/{participante_id}")
 async def obter_participante(
     participante_id: int,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -100,9 +107,11 @@ async def obter_participante(
         )
 
     # Descriptografa
-    email = descriptografar_dados(participante.email_criptografado)
-    cpf = descriptografar_dados(participante.cpf_criptografado) if participante.cpf_criptografado else None
-    cnpj = descriptografar_dados(participante.cnpj_criptografado) if participante.cnpj_criptografado else None
+    email, cpf, cnpj = await crypto_async.decrypt_many([
+        participante.email_criptografado,
+        participante.cpf_criptografado,
+        participante.cnpj_criptografado
+    ])
 
     return {
         "id": participante.id,
@@ -123,7 +132,7 @@ async def obter_participante(
 @router.post("/buscar-cpf")
 async def buscar_por_cpf(
     cpf: str,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -147,8 +156,10 @@ async def buscar_por_cpf(
         )
 
     # Descriptografa
-    email = descriptografar_dados(participante.email_criptografado)
-    cpf_desc = descriptografar_dados(participante.cpf_criptografado)
+    email, cpf_desc = await crypto_async.decrypt_many([
+        participante.email_criptografado,
+        participante.cpf_criptografado
+    ])
 
     return {
         "id": participante.id,
@@ -163,7 +174,7 @@ async def buscar_por_cpf(
 @router.post("/buscar-cnpj")
 async def buscar_por_cnpj(
     cnpj: str,
-    admin: Admin = Depends(obter_admin_atual),
+    admin: PrincipalAdmin = Depends(obter_admin_atual),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -187,8 +198,10 @@ async def buscar_por_cnpj(
         )
 
     # Descriptografa
-    email = descriptografar_dados(participante.email_criptografado)
-    cnpj_desc = descriptografar_dados(participante.cnpj_criptografado)
+    email, cnpj_desc = await crypto_async.decrypt_many([
+        participante.email_criptografado,
+        participante.cnpj_criptografado
+    ])
 
     return {
         "id": participante.id,
@@ -200,41 +213,17 @@ async def buscar_por_cnpj(
     }
 
 
-@router.get("/exportar/csv")
-async def exportar_participantes_csv(
-    request: Request,
-    tipo: Optional[TipoParticipante] = None,
-    uf: Optional[str] = None,
-    admin: Admin = Depends(obter_admin_atual),
-    db: AsyncSession = Depends(get_db)
-):
+def _linhas_csv_participantes(lote) -> str:
     """
-    Exporta participantes para CSV
+    Descriptografa um lote de participantes e o serializa em CSV
 
-    IMPORTANTE: Registra log de exportação (LGPD)
+    Executado no pool de criptografia: a descriptografia Fernet não
+    bloqueia o event loop.
     """
-    query = select(Participante)
-
-    if tipo:
-        query = query.where(Participante.tipo == tipo)
-
-    if uf:
-        query = query.where(Participante.uf == uf.upper())
-
-    query = query.order_by(Participante.criado_em.desc())
-
-    result = await db.execute(query)
-    participantes = list(result.scalars().all())
-
-    # Gera CSV
     output = StringIO()
     writer = csv.writer(output)
 
-    # Header
-    writer.writerow(['ID', 'Tipo', 'Nome/Razão Social', 'CPF/CNPJ', 'Email', 'UF', 'Data Cadastro'])
-
-    # Dados
-    for p in participantes:
+    for p in lote:
         email = descriptografar_dados(p.email_criptografado)
         documento = None
 
@@ -257,20 +246,88 @@ async def exportar_participantes_csv(
             p.criado_em.strftime('%Y-%m-%d %H:%M:%S')
         ])
 
-    # Registra log de exportação
-    await auditoria_service.registrar_log(
-        db,
-        admin_id=admin.id,
-        acao=AcoesLog.EXPORTAR_PARTICIPANTES,
-        detalhes={"total_registros": len(participantes), "filtros": {"tipo": tipo.value if tipo else None, "uf": uf}},
-        request=request
-    )
-    await db.commit()
+    return output.getvalue()
+
 
-    # Retorna CSV
-    csv_data = output.getvalue()
-    return Response(
-        content=csv_data,
+async def _registrar_exportacao(
+    request: Request,
+    admin_id: int,
+    total_registros: int,
+    completa: bool,
+    tipo: Optional[TipoParticipante],
+    uf: Optional[str]
+) -> None:
+    """Registra o log de exportação (LGPD) com o total efetivamente exportado"""
+    async with AsyncSessionLocal() as db:
+        await auditoria_service.registrar_log(
+            db,
+            admin_id=admin_id,
+            acao=AcoesLog.EXPORTAR_PARTICIPANTES,
+            detalhes={
+                "total_registros": total_registros,
+                "completa": completa,
+                "filtros": {"tipo": tipo.value if tipo else None, "uf": uf}
+            },
+            request=request
+        )
+        await db.commit()
+
+
+async def _gerar_csv_participantes(
+    request: Request,
+    admin_id: int,
+    tipo: Optional[TipoParticipante],
+    uf: Optional[str]
+) -> AsyncIterator[str]:
+    """
+    Gera o CSV em blocos (um por lote), com uso de memória constante
+
+    O log de auditoria é gravado ao final, mesmo se o cliente desconectar.
+    """
+    total_registros = 0
+    completa = False
+
+    # Header
+    output = StringIO()
+    csv.writer(output).writerow(['ID', 'Tipo', 'Nome/Razão Social', 'CPF/CNPJ', 'Email', 'UF', 'Data Cadastro'])
+    yield output.getvalue()
+
+    try:
+        async with AsyncSessionLocal() as db:
+            async for lote in participante_service.iterar_participantes(
+                db, tipo, uf, tamanho_lote=settings.EXPORTACAO_TAMANHO_LOTE
+            ):
+                # Encerra a transação de leitura enquanto o lote é processado e enviado
+                await db.commit()
+
+                bloco = await crypto_async.executar(_linhas_csv_participantes, lote)
+                total_registros += len(lote)
+                yield bloco
+
+        completa = True
+    finally:
+        await asyncio.shield(
+            _registrar_exportacao(request, admin_id, total_registros, completa, tipo, uf)
+        )
+
+
+@router.get("/exportar/csv")
+async def exportar_participantes_csv(
+    request: Request,
+    tipo: Optional[TipoParticipante] = None,
+    uf: Optional[str] = None,
+    admin: PrincipalAdmin = Depends(obter_admin_atual)
+):
+    """
+    Exporta participantes para CSV
+
+    A resposta é transmitida em blocos: leitura em lotes por keyset e
+    descriptografia no pool de criptografia, sem carregar todos os participantes.
+
+    IMPORTANTE: Registra log de exportação (LGPD) com o total exportado
+    """
+    return StreamingResponse(
+        _gerar_csv_participantes(request, admin.id, tipo, uf),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=participantes.csv"}
     )
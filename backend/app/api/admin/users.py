@@ -10,7 +10,7 @@ from ...schemas.admin import AdminCreate, AdminUpdate, AdminResponse
 from ...services import admin_service, auditoria_service
 from ...services.auditoria_service import AcoesLog
 from ...utils.permissions import require_super_admin
-from ...models.admin import Admin
+from ...utils.cache_admin import PrincipalAdmin
 
 router = APIRouter(prefix="/admin/users", tags=["Admin - Usuários"])
 
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/admin/users", tags=["Admin - Usuários"])
 async def criar_admin(
     data: AdminCreate,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -68,7 +68,7 @@ async def criar_admin(
 @router.get("", response_model=List[AdminResponse])
 async def listar_admins(
     ativo: Optional[bool] = None,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -100,7 +100,7 @@ async def listar_admins(
 @router.get("/{admin_id}", response_model=AdminResponse)
 async def obter_admin(
     admin_id: int,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -134,7 +134,7 @@ async def atualizar_admin(
     admin_id: int,
     data: AdminUpdate,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -191,7 +191,7 @@ async def atualizar_admin(
 async def desativar_admin(
     admin_id: int,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -239,7 +239,7 @@ async def desativar_admin(
 async def ativar_admin(
     admin_id: int,
     request: Request,
-    admin: Admin = Depends(require_super_admin()),
+    admin: PrincipalAdmin = Depends(require_super_admin()),
     db: AsyncSession = Depends(get_db)
 ):
     """
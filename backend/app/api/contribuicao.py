@@ -1,68 +1,19 @@
 """
 Endpoints de Contribuição
 """
-from fastapi import APIRouter, Depends, HTTPException, Header, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 
 from ..core.database import get_db
 from ..schemas.contribuicao import ContribuicaoCreate, ContribuicaoResponse
-from ..services import contribuicao_service, participante_service
-from ..utils.security import verificar_token_sessao
+from ..services import contribuicao_service
+from ..utils.sessao import obter_participante_da_sessao
 from ..models.contribuicao import DocumentoConsulta
 
 router = APIRouter(prefix="/contribuicoes", tags=["Contribuições"])
 
 
-async def obter_participante_da_sessao(
-    authorization: str = Header(...),
-    db: AsyncSession = Depends(get_db)
-) -> int:
-    """
-    Dependency para obter participante do token
-
-    Args:
-        authorization: Header Authorization com Bearer token
-
-    Returns:
-        ID do participante
-
-    Raises:
-        HTTPException 401: Token inválido ou ausente
-    """
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido"
-        )
-
-    token = authorization.replace("Bearer ", "")
-    payload = verificar_token_sessao(token)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Sessão expirada ou inválida"
-        )
-
-    participante_id = payload.get("participante_id")
-    if not participante_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido"
-        )
-
-    # Verifica se participante existe
-    participante = await participante_service.buscar_participante_por_id(db, participante_id)
-    if not participante:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Participante não encontrado"
-        )
-
-    return participante_id
-
-
 @router.post("", response_model=ContribuicaoResponse, status_code=status.HTTP_201_CREATED)
 async def criar_contribuicao(
     data: ContribuicaoCreate,
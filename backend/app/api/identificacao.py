@@ -34,27 +34,8 @@ async def identificar_pessoa_fisica(
     ip_origem = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
 
-    # Verifica se CPF já está cadastrado (usando hash)
-    participante_existente = await participante_service.buscar_participante_por_cpf(
-        db, data.cpf
-    )
-
-    if participante_existente:
-        # Se já existe, retorna token para o participante existente
-        token = gerar_token_sessao(
-            participante_existente.id,
-            TipoParticipante.PESSOA_FISICA.value
-        )
-
-        return {
-            "message": "Participante já identificado anteriormente",
-            "token": token,
-            "participante_id": participante_existente.id,
-            "nome": participante_existente.nome_completo
-        }
-
-    # Cria novo participante
-    participante = await participante_service.criar_participante_pf(
+    # Obtém pelo hash do CPF ou cria (criptografa só se for novo)
+    participante, criado = await participante_service.identificar_participante_pf(
         db, data, ip_origem, user_agent
     )
 
@@ -65,7 +46,10 @@ async def identificar_pessoa_fisica(
     )
 
     return {
-        "message": "Identificação realizada com sucesso",
+        "message": (
+            "Identificação realizada com sucesso" if criado
+            else "Participante já identificado anteriormente"
+        ),
         "token": token,
         "participante_id": participante.id,
         "nome": participante.nome_completo
@@ -89,27 +73,8 @@ async def identificar_pessoa_juridica(
     ip_origem = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
 
-    # Verifica se CNPJ já está cadastrado
-    participante_existente = await participante_service.buscar_participante_por_cnpj(
-        db, data.cnpj
-    )
-
-    if participante_existente:
-        # Se já existe, retorna token
-        token = gerar_token_sessao(
-            participante_existente.id,
-            TipoParticipante.PESSOA_JURIDICA.value
-        )
-
-        return {
-            "message": "Entidade já identificada anteriormente",
-            "token": token,
-            "participante_id": participante_existente.id,
-            "razao_social": participante_existente.razao_social
-        }
-
-    # Cria novo participante
-    participante = await participante_service.criar_participante_pj(
+    # Obtém pelo hash do CNPJ ou cria (criptografa só se for novo)
+    participante, criado = await participante_service.identificar_participante_pj(
         db, data, ip_origem, user_agent
     )
 
@@ -120,7 +85,10 @@ async def identificar_pessoa_juridica(
     )
 
     return {
-        "message": "Identificação realizada com sucesso",
+        "message": (
+            "Identificação realizada com sucesso" if criado
+            else "Entidade já identificada anteriormente"
+        ),
         "token": token,
         "participante_id": participante.id,
         "razao_social": participante.razao_social
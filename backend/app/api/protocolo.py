@@ -1,46 +1,25 @@
 """
 Endpoints de Protocolo
 """
-from fastapi import APIRouter, Depends, HTTPException, Header, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import logging
 
+from ..core.config import settings
 from ..core.database import get_db
 from ..schemas.protocolo import ProtocoloResponse, ProtocoloCompletoResponse
 from ..schemas.contribuicao import ContribuicaoResponse
-from ..services import protocolo_service, contribuicao_service, participante_service
-from ..services.email_service import email_service
-from ..utils.security import verificar_token_sessao
+from ..services import protocolo_service, contribuicao_service, participante_service, email_outbox_service
+from ..services.email_outbox_service import processador_email_outbox
+from ..utils.sessao import obter_participante_da_sessao
+from ..utils.http_cache import gerar_etag, nao_modificado, aplicar_cabecalhos, resposta_304
 from ..models.contribuicao import DocumentoConsulta
 
 router = APIRouter(prefix="/protocolos", tags=["Protocolos"])
 logger = logging.getLogger(__name__)
 
 
-async def obter_participante_da_sessao(
-    authorization: str = Header(...),
-    db: AsyncSession = Depends(get_db)
-) -> int:
-    """Dependency para obter participante do token"""
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido"
-        )
-
-    token = authorization.replace("Bearer ", "")
-    payload = verificar_token_sessao(token)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Sessão expirada ou inválida"
-        )
-
-    return payload.get("participante_id")
-
-
 @router.post("/finalizar", response_model=ProtocoloCompletoResponse, status_code=status.HTTP_201_CREATED)
 async def finalizar_contribuicoes(
     documento: DocumentoConsulta,
@@ -57,7 +36,8 @@ async def finalizar_contribuicoes(
     1. Busca todas as contribuições do participante para o documento
     2. Valida que existem contribuições
     3. Gera protocolo único
-    4. Retorna dados completos (para exibição e email)
+    4. Enfileira o email de confirmação
+    5. Retorna dados completos (para exibição)
 
     **Formato do Protocolo**: CP-{DOCUMENTO}-{ANO}-{SEQUENCIAL}
     Exemplo: CP-CEO-2026-000154
@@ -84,52 +64,18 @@ async def finalizar_contribuicoes(
     protocolo = await protocolo_service.criar_protocolo(
         db, participante_id, documento, contribuicoes_ids, ip_origem, user_agent
     )
-    
-    # Commit do protocolo
-    await db.commit()
-    await db.refresh(protocolo)
 
-    # Busca participante para resposta
+    # Busca participante para resposta e email
     participante = await participante_service.buscar_participante_por_id(db, participante_id)
 
-    # Prepara dados para email
-    contribuicoes_dict = [
-        {
-            "id": c.id,
-            "artigo": c.artigo or "",
-            "tipo": c.tipo.value if hasattr(c.tipo, 'value') else str(c.tipo),
-            "texto_proposto": c.texto_proposto or "",
-            "fundamentacao": c.fundamentacao or ""
-        }
-        for c in contribuicoes
-    ]
-
-    # Envia email de confirmação (em background, não bloqueia resposta)
-    try:
-        email_enviado = await email_service.enviar_email_protocolo(
-            email_criptografado=participante.email_criptografado,
-            numero_protocolo=protocolo.numero_protocolo,
-            documento=protocolo.documento,
-            nome_participante=participante.nome_publico,
-            total_contribuicoes=protocolo.total_contribuicoes,
-            data_submissao=protocolo.criado_em_brasilia,
-            contribuicoes=contribuicoes_dict,
-            public_url=None  # Será usado o PUBLIC_URL do settings
-        )
+    # Email de confirmação entra na caixa de saída na mesma transação do
+    # protocolo; o envio (com novas tentativas) é feito em segundo plano
+    await email_outbox_service.enfileirar_email_protocolo(db, protocolo, participante)
+
+    # Commit do protocolo
+    await db.commit()
 
-        if email_enviado:
-            # Marca email como enviado
-            await protocolo_service.marcar_email_enviado(db, protocolo.id)
-            await db.commit()
-            logger.info(f"Email de protocolo {protocolo.numero_protocolo} enviado com sucesso")
-        else:
-            logger.warning(f"Falha ao enviar email para protocolo {protocolo.numero_protocolo}")
-    except Exception as e:
-        # Não falha a requisição se o email falhar, apenas loga o erro
-        logger.error(f"Erro ao enviar email de protocolo {protocolo.numero_protocolo}: {str(e)}", exc_info=True)
-    except Exception as e:
-        # Não falha a requisição se o email falhar, apenas loga o erro
-        logger.error(f"Erro ao enviar email de protocolo {protocolo.numero_protocolo}: {str(e)}")
+    processador_email_outbox.acordar()
 
     # Monta resposta
     return {
@@ -148,6 +94,8 @@ async def finalizar_contribuicoes(
 @router.get("/{numero_protocolo}", response_model=ProtocoloCompletoResponse)
 async def consultar_protocolo(
     numero_protocolo: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -163,8 +111,23 @@ async def consultar_protocolo(
     - Nome público do participante (sem CPF/CNPJ)
     - Lista de contribuições
 
+    **Cache**: ETag (protocolo + última moderação); responde 304 se não mudou
+
     **LGPD**: Não exibe dados sensíveis (CPF, CNPJ, email)
     """
+    # Versão barata: o protocolo é imutável, só a moderação das contribuições muda
+    versao = await protocolo_service.obter_versao_protocolo(db, numero_protocolo)
+
+    if versao is not None:
+        protocolo_id, ultima_moderacao = versao
+        etag = gerar_etag("protocolo", protocolo_id, ultima_moderacao)
+        cache_control = f"public, max-age={settings.HTTP_CACHE_MAX_AGE_PUBLICO}"
+
+        if nao_modificado(request, etag):
+            return resposta_304(etag, cache_control)
+
+        aplicar_cabecalhos(response, etag, cache_control)
+
     resultado = await protocolo_service.buscar_protocolo_completo(db, numero_protocolo)
 
     if not resultado:
@@ -1,25 +1,67 @@
 """
 Endpoints Públicos (sem autenticação)
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
+from datetime import datetime
+from io import StringIO
+import csv
+import gzip
+import json
 
-from ..core.database import get_db
+from ..core.database import get_db, AsyncSessionLocal
 from ..core.config import settings
 from ..schemas.contribuicao import ContribuicaoPublicaResponse
 from ..services import contribuicao_service
 from ..models.contribuicao import DocumentoConsulta
+from ..utils.paginacao import (
+    codificar_cursor,
+    decodificar_cursor,
+    codificar_cursor_relevancia,
+    decodificar_cursor_relevancia
+)
+from ..utils.dispositivo import FiltroDispositivo, obter_filtro_dispositivo
+from ..utils.http_cache import (
+    gerar_etag, etag_codificado, aceita_codificacao, nao_modificado, aplicar_cabecalhos, resposta_304
+)
+from ..utils.cache import CacheAssincrono, EventosCache
 
 router = APIRouter(prefix="/publico", tags=["Público"])
 
+# Documentos da consulta (estáticos)
+DOCUMENTOS_PUBLICOS = [
+    {
+        "codigo": "CEO",
+        "nome": "Código de Ética Odontológica",
+        "descricao": "Novo Código de Ética Odontológica"
+    },
+    {
+        "codigo": "CPEO",
+        "nome": "Código de Processo Ético Odontológico",
+        "descricao": "Novo Código de Processo Ético Odontológico"
+    }
+]
+ETAG_DOCUMENTOS = gerar_etag(DOCUMENTOS_PUBLICOS)
+
+# Estruturas públicas pré-calculadas (ex: corpo JSON/gzip do mapa por artigo)
+cache_publico = CacheAssincrono("publico")
+
+
+def _cache_control_publico() -> str:
+    return f"public, max-age={settings.HTTP_CACHE_MAX_AGE_PUBLICO}"
+
 
 @router.get("/contribuicoes", response_model=dict)
 async def listar_contribuicoes_publicas(
+    request: Request,
+    response: Response,
     documento: Optional[DocumentoConsulta] = None,
-    artigo: Optional[str] = None,
+    filtro: FiltroDispositivo = Depends(obter_filtro_dispositivo),
     page: int = Query(1, ge=1, description="Página (inicia em 1)"),
     per_page: int = Query(50, ge=1, le=100, description="Itens por página (máx 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (next_cursor); vazio inicia do começo"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -29,27 +71,66 @@ async def listar_contribuicoes_publicas(
 
     **Filtros**:
     - documento: CEO ou CPEO (opcional)
-    - artigo: Filtrar por artigo específico (opcional)
+    - artigo: Filtrar por artigo/dispositivo, em qualquer grafia ("Art. 7º", "art 7, inciso IV")
+    - artigo_inicio / artigo_fim: Intervalo de artigos (opcional)
+    - capitulo: Filtrar por capítulo ("III" ou "3") (opcional)
     - page: Número da página (padrão: 1)
     - per_page: Itens por página (padrão: 50, máx: 100)
+    - cursor: Paginação por cursor (ignora page; recomendado para páginas profundas)
 
     **Retorna**:
     - Lista de contribuições (sem dados sensíveis)
-    - Total de contribuições
-    - Informações de paginação
+    - Total de contribuições (apenas na paginação por página)
+    - Informações de paginação, incluindo next_cursor
+
+    **Cache**: ETag/Last-Modified; responde 304 se nada foi aprovado desde então
 
     **LGPD**: Exibe apenas nome público e UF. Sem CPF, CNPJ ou email.
     """
+    # Versão barata (contador de aprovadas): evita a consulta completa se não mudou
+    total_aprovadas, ultima_aprovacao = await contribuicao_service.obter_versao_contribuicoes_publicas(
+        db, documento
+    )
+    etag = gerar_etag("contribuicoes", documento, total_aprovadas, ultima_aprovacao)
+
+    if nao_modificado(request, etag, ultima_aprovacao):
+        return resposta_304(etag, _cache_control_publico(), ultima_aprovacao)
+
+    aplicar_cabecalhos(response, etag, _cache_control_publico(), ultima_aprovacao)
+
+    if cursor is not None:
+        # Paginação por cursor: sem OFFSET e sem contagem total
+        try:
+            apos = decodificar_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+
+        contribuicoes, tem_mais = await contribuicao_service.listar_contribuicoes_publicas_cursor(
+            db, documento, filtro, limit=per_page, apos=apos
+        )
+
+        return {
+            "data": contribuicoes,
+            "pagination": {
+                "per_page": per_page,
+                "has_more": tem_mais,
+                "next_cursor": _proximo_cursor(contribuicoes) if tem_mais else None
+            }
+        }
+
     # Calcula offset
     offset = (page - 1) * per_page
 
     # Busca contribuições
     contribuicoes = await contribuicao_service.listar_contribuicoes_publicas(
-        db, documento, artigo, limit=per_page, offset=offset
+        db, documento, filtro, limit=per_page, offset=offset
     )
 
     # Conta total
-    total = await contribuicao_service.contar_contribuicoes_publicas(db, documento)
+    total = await contribuicao_service.contar_contribuicoes_publicas(db, documento, filtro)
 
     # Calcula total de páginas
     total_pages = (total + per_page - 1) // per_page
@@ -60,13 +141,214 @@ async def listar_contribuicoes_publicas(
             "page": page,
             "per_page": per_page,
             "total": total,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": _proximo_cursor(contribuicoes) if page < total_pages else None
         }
     }
 
 
+@router.get("/contribuicoes/busca", response_model=dict)
+async def buscar_contribuicoes_publicas(
+    q: str = Query(..., min_length=2, max_length=200, description="Termos da busca"),
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: FiltroDispositivo = Depends(obter_filtro_dispositivo),
+    per_page: int = Query(50, ge=1, le=100, description="Itens por página (máx 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (next_cursor)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca textual nas contribuições públicas
+
+    **Público**: Não requer autenticação
+
+    **Busca**:
+    - Capítulo, texto proposto e fundamentação (português, com radicalização)
+    - Sintaxe: palavras, "frase exata", -excluir, OR
+    - Ordenada por relevância
+    - Aceita os mesmos filtros de localização da listagem (artigo, intervalo, capítulo)
+
+    **Retorna**:
+    - Lista de contribuições (sem dados sensíveis) com relevância e
+      trechos destacados com <mark> (demais HTML escapado)
+    - Paginação por cursor (next_cursor)
+
+    **LGPD**: Exibe apenas nome público e UF. Sem CPF, CNPJ ou email.
+    """
+    try:
+        apos = decodificar_cursor_relevancia(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+    contribuicoes, tem_mais = await contribuicao_service.buscar_contribuicoes_publicas(
+        db, q, documento, filtro, limit=per_page, apos=apos
+    )
+
+    proximo_cursor = None
+    if tem_mais:
+        ultima = contribuicoes[-1]
+        proximo_cursor = codificar_cursor_relevancia(ultima["relevancia"], ultima["id"])
+
+    return {
+        "data": contribuicoes,
+        "pagination": {
+            "per_page": per_page,
+            "has_more": tem_mais,
+            "next_cursor": proximo_cursor
+        }
+    }
+
+
+def _proximo_cursor(contribuicoes: List[dict]) -> Optional[str]:
+    """Cursor que continua a listagem após o último item da página"""
+    if not contribuicoes:
+        return None
+    ultima = contribuicoes[-1]
+    return codificar_cursor(ultima["criado_em"], ultima["id"])
+
+
+# Colunas da exportação (mesma projeção LGPD da listagem pública)
+COLUNAS_EXPORTACAO = [
+    "id", "documento", "localizacao", "tipo", "texto_proposto",
+    "fundamentacao", "nome_participante", "uf", "criado_em"
+]
+
+
+def _serializar_lote(lote: List[dict], formato: str) -> str:
+    """Serializa um lote de contribuições em NDJSON ou CSV (sem cabeçalho)"""
+    lote = [{**item, "criado_em": item["criado_em"].isoformat()} for item in lote]
+
+    if formato == "csv":
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=COLUNAS_EXPORTACAO)
+        writer.writerows(lote)
+        return output.getvalue()
+
+    return "".join(
+        json.dumps(item, ensure_ascii=False) + "\n"
+        for item in lote
+    )
+
+
+async def _gerar_exportacao(
+    formato: str,
+    documento: Optional[DocumentoConsulta],
+    filtro: FiltroDispositivo
+) -> AsyncIterator[str]:
+    """
+    Gera a exportação em blocos (um por lote do cursor)
+
+    Usa sessão própria: a sessão da requisição é encerrada antes do envio
+    do corpo de respostas em streaming.
+    """
+    if formato == "csv":
+        yield ",".join(COLUNAS_EXPORTACAO) + "\r\n"
+
+    async with AsyncSessionLocal() as db:
+        async for lote in contribuicao_service.iterar_contribuicoes_publicas(
+            db, documento, filtro, tamanho_lote=settings.EXPORTACAO_TAMANHO_LOTE
+        ):
+            yield _serializar_lote(lote, formato)
+
+
+@router.get("/contribuicoes/exportar")
+async def exportar_contribuicoes_publicas(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson ou csv"),
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: FiltroDispositivo = Depends(obter_filtro_dispositivo)
+):
+    """
+    Exporta todas as contribuições públicas (dados abertos)
+
+    **Público**: Não requer autenticação
+
+    **Formatos**:
+    - ndjson: um objeto JSON por linha (padrão)
+    - csv: com cabeçalho
+
+    **Filtros**: documento e os mesmos filtros de localização da listagem
+
+    A resposta é transmitida em blocos, com uso de memória constante.
+
+    **LGPD**: Exibe apenas nome público e UF. Sem CPF, CNPJ ou email.
+    """
+    media_type = "text/csv" if formato == "csv" else "application/x-ndjson"
+    nome_arquivo = f"contribuicoes_aprovadas_{datetime.utcnow():%Y%m%d}.{formato}"
+
+    return StreamingResponse(
+        _gerar_exportacao(formato, documento, filtro),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={nome_arquivo}"}
+    )
+
+
+async def _serializar_mapa_artigos(db: AsyncSession, versao: str) -> Tuple[str, bytes, bytes]:
+    """Calcula o mapa por artigo e o serializa (JSON puro e comprimido)"""
+    mapa = await contribuicao_service.obter_mapa_artigos(db)
+    corpo = json.dumps(mapa, separators=(",", ":")).encode()
+    return versao, corpo, gzip.compress(corpo)
+
+
+@router.get("/contribuicoes/por-artigo", response_model=dict)
+async def obter_mapa_artigos(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Contagem de contribuições aprovadas por documento, artigo e tipo
+
+    **Público**: Não requer autenticação
+
+    **Retorna** (CEO e CPEO completos, em uma resposta):
+    - documentos.{DOC}.total
+    - documentos.{DOC}.artigos.{N}: total e contagem por tipo
+      (artigo "0" = artigo não identificado)
+
+    **Cache**: corpo pré-calculado (JSON e gzip) reaproveitado até a próxima
+    aprovação; ETag/304 e compressão gzip quando aceita pelo cliente
+    """
+    # Toda aprovação atualiza o carimbo de versão das contribuições públicas
+    total_aprovadas, ultima_aprovacao = await contribuicao_service.obter_versao_contribuicoes_publicas(db)
+    versao = gerar_etag("mapa-artigos", total_aprovadas, ultima_aprovacao)
+
+    # Cada content-coding tem seu próprio ETag
+    usar_gzip = aceita_codificacao(request, "gzip")
+    etag = etag_codificado(versao, "gz") if usar_gzip else versao
+
+    if nao_modificado(request, etag, ultima_aprovacao):
+        return resposta_304(etag, _cache_control_publico(), ultima_aprovacao)
+
+    # Chave fixa: moderações neste processo invalidam pelo evento; aprovações
+    # feitas em outros workers são detectadas pela versão guardada com o corpo
+    for _ in range(2):
+        versao_cache, corpo, corpo_gzip = await cache_publico.obter_ou_calcular(
+            "mapa-artigos",
+            settings.CACHE_PUBLICO_TTL_SEGUNDOS,
+            lambda: _serializar_mapa_artigos(db, versao),
+            eventos=[EventosCache.MODERACAO]
+        )
+        if versao_cache == versao:
+            break
+        cache_publico.invalidar("mapa-artigos")
+
+    headers = {"Vary": "Accept-Encoding"}
+    if usar_gzip:
+        corpo = corpo_gzip
+        headers["Content-Encoding"] = "gzip"
+
+    response = Response(content=corpo, media_type="application/json", headers=headers)
+    aplicar_cabecalhos(response, etag, _cache_control_publico(), ultima_aprovacao)
+
+    return response
+
+
 @router.get("/documentos", response_model=List[dict])
-async def listar_documentos():
+async def listar_documentos(
+    request: Request,
+    response: Response
+):
     """
     Lista documentos disponíveis para consulta pública
 
@@ -75,24 +357,20 @@ async def listar_documentos():
     **Retorna**:
     - Lista de documentos com código e nome
     """
-    documentos = [
-        {
-            "codigo": "CEO",
-            "nome": "Código de Ética Odontológica",
-            "descricao": "Novo Código de Ética Odontológica"
-        },
-        {
-            "codigo": "CPEO",
-            "nome": "Código de Processo Ético Odontológico",
-            "descricao": "Novo Código de Processo Ético Odontológico"
-        }
-    ]
+    cache_control = f"public, max-age={settings.HTTP_CACHE_MAX_AGE_DOCUMENTOS}"
 
-    return documentos
+    if nao_modificado(request, ETAG_DOCUMENTOS):
+        return resposta_304(ETAG_DOCUMENTOS, cache_control)
+
+    aplicar_cabecalhos(response, ETAG_DOCUMENTOS, cache_control)
+
+    return DOCUMENTOS_PUBLICOS
 
 
 @router.get("/estatisticas", response_model=dict)
 async def obter_estatisticas(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -104,6 +382,14 @@ async def obter_estatisticas(
     - Total de contribuições por documento
     - Total geral
     """
+    total_aprovadas, ultima_aprovacao = await contribuicao_service.obter_versao_contribuicoes_publicas(db)
+    etag = gerar_etag("estatisticas", total_aprovadas, ultima_aprovacao)
+
+    if nao_modificado(request, etag, ultima_aprovacao):
+        return resposta_304(etag, _cache_control_publico(), ultima_aprovacao)
+
+    aplicar_cabecalhos(response, etag, _cache_control_publico(), ultima_aprovacao)
+
     total_ceo = await contribuicao_service.contar_contribuicoes_publicas(
         db, DocumentoConsulta.CEO
     )
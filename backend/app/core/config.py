@@ -38,6 +38,11 @@ class Settings(BaseSettings):
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
     SMTP_FROM: str = "Consulta Pública CFO <noreply@cfo.org.br>"
+    SMTP_TIMEOUT_SEGUNDOS: float = 30
+    SMTP_POOL_TAMANHO: int = 3  # Conexões SMTP simultâneas
+    SMTP_POOL_OCIOSO_SEGUNDOS: float = 60  # Conexão ociosa além disso é encerrada
+    SMTP_POOL_VERIFICACAO_SEGUNDOS: float = 15  # NOOP antes de reutilizar conexão ociosa
+    SMTP_MAX_MENSAGENS_POR_SEGUNDO: float = 10  # 0 = sem limite
 
     # Timezone
     TIMEZONE: str = "America/Sao_Paulo"
@@ -90,6 +95,58 @@ class Settings(BaseSettings):
         "RS", "RO", "RR", "SC", "SP", "SE", "TO"
     ]
 
+    # Cache do dashboard administrativo (segundos)
+    CACHE_DASHBOARD_TTL_SEGUNDOS: int = 30
+    CACHE_DASHBOARD_TTL_TEMPO_REAL_SEGUNDOS: int = 10
+
+    # Cache do principal de admins (id, role, ativo) por requisição
+    CACHE_ADMIN_TTL_SEGUNDOS: int = 30
+
+    # Cache de participantes existentes (validação do token de sessão)
+    CACHE_PARTICIPANTES_MAX_ITENS: int = 50000
+    CACHE_PARTICIPANTES_TTL_SEGUNDOS: int = 3600
+
+    # Threads dedicadas à criptografia (Fernet/SHA-256 fora do event loop)
+    CRYPTO_MAX_WORKERS: int = 4
+
+    # Executor bcrypt (senhas de admin): threads e operações aguardando vaga
+    SENHAS_MAX_WORKERS: int = 2
+    SENHAS_LIMITE_FILA: int = 8
+
+    # Exportação de dados abertos (linhas buscadas por lote do cursor)
+    EXPORTACAO_TAMANHO_LOTE: int = 1000
+
+    # Cache em memória de estruturas públicas pré-calculadas (segundos)
+    CACHE_PUBLICO_TTL_SEGUNDOS: int = 300
+
+    # Cache HTTP dos endpoints públicos (Cache-Control max-age, segundos)
+    HTTP_CACHE_MAX_AGE_PUBLICO: int = 60
+    HTTP_CACHE_MAX_AGE_DOCUMENTOS: int = 86400
+
+    # Stream (SSE) de métricas em tempo real
+    METRICAS_STREAM_INTERVALO_SEGUNDOS: float = 5
+    METRICAS_STREAM_LIMITE_FILA: int = 10
+
+    # Caixa de saída de emails (outbox)
+    EMAIL_OUTBOX_INTERVALO_SEGUNDOS: float = 5
+    EMAIL_OUTBOX_TAMANHO_LOTE: int = 20
+    EMAIL_OUTBOX_MAX_TENTATIVAS: int = 8
+    EMAIL_OUTBOX_BACKOFF_BASE_SEGUNDOS: int = 30
+    EMAIL_OUTBOX_BACKOFF_MAX_SEGUNDOS: int = 3600
+    EMAIL_OUTBOX_CONCESSAO_SEGUNDOS: int = 300  # Prazo da reserva de um lote por um worker
+
+    # Rollup diário: escritas do dia corrente dispensam a sincronização com a
+    # selagem fora desta janela antes da meia-noite (deve superar a duração
+    # de uma transação de escrita e a diferença entre relógios dos servidores)
+    ROLLUP_MARGEM_SELAGEM_SEGUNDOS: int = 300
+
+    # Moderação em lote (máximo de contribuições por requisição)
+    MODERACAO_LOTE_MAX_ITENS: int = 10000
+
+    # Fila de moderação (reserva de contribuições por moderador)
+    MODERACAO_RESERVA_SEGUNDOS: int = 900  # Reserva não concluída volta à fila
+    MODERACAO_RESERVA_MAX_ITENS: int = 50
+
     # Limites de caracteres
     MAX_CHARS_TEXTO_PROPOSTO: int = 5000
     MAX_CHARS_FUNDAMENTACAO: int = 5000
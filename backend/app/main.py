@@ -11,6 +11,10 @@ from slowapi.errors import RateLimitExceeded
 import time
 
 from .core.config import settings
+from .utils.cache_admin import ouvinte_invalidacao_admin
+from .services.email_outbox_service import processador_email_outbox
+from .services.email_service import email_service
+from .utils.security import ExecutorSenhasSaturado
 from .api import identificacao, contribuicao, protocolo, publico
 from .api.admin import auth, users, moderacao, dashboard, consultas, participantes, logs
 
@@ -93,6 +97,21 @@ app.include_router(participantes.router, prefix="/api/v1")
 app.include_router(logs.router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+async def iniciar_tarefas():
+    """Inicia tarefas de segundo plano"""
+    ouvinte_invalidacao_admin.iniciar()
+    processador_email_outbox.iniciar()
+
+
+@app.on_event("shutdown")
+async def encerrar_tarefas():
+    """Encerra tarefas de segundo plano"""
+    await ouvinte_invalidacao_admin.parar()
+    await processador_email_outbox.parar()
+    await email_service.fechar()
+
+
 @app.get("/")
 async def root():
     """Endpoint raiz"""
@@ -113,6 +132,17 @@ async def health_check():
     }
 
 
+# Executor de senhas saturado: rejeita rápido em vez de enfileirar
+@app.exception_handler(ExecutorSenhasSaturado)
+async def executor_senhas_saturado_handler(request: Request, exc: ExecutorSenhasSaturado):
+    """Handler para sobrecarga do executor bcrypt"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Serviço de autenticação sobrecarregado. Tente novamente em instantes."},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Handler global de erros
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
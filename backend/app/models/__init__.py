@@ -8,6 +8,11 @@ from .admin import Admin
 from .consulta import ConsultaPublica
 from .historico_moderacao import HistoricoModeracao
 from .admin_log import AdminLog
+from .contador import Contador
+from .contribuicao_diaria import ContribuicaoDiaria, DiaSelado
+from .sequencial_protocolo import SequencialProtocolo
+from .protocolo_contribuicao import ProtocoloContribuicao
+from .email_outbox import EmailOutbox
 
 __all__ = [
     "Participante",
@@ -16,5 +21,11 @@ __all__ = [
     "Admin",
     "ConsultaPublica",
     "HistoricoModeracao",
-    "AdminLog"
+    "AdminLog",
+    "Contador",
+    "ContribuicaoDiaria",
+    "DiaSelado",
+    "SequencialProtocolo",
+    "ProtocoloContribuicao",
+    "EmailOutbox"
 ]
@@ -0,0 +1,36 @@
+"""
+Modelo de Contadores Agregados
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..core.database import Base
+
+
+class Contador(Base):
+    """
+    Tabela de contadores agregados
+
+    Mantém totais pré-calculados por (dimensão, valor), atualizados na
+    mesma transação das escritas que os afetam:
+    - Contribuições por status de moderação
+    - Contribuições aprovadas por tipo e por documento
+    - Participantes por tipo e por UF
+    - Protocolos por documento
+
+    Permite leituras O(1) no dashboard e nas estatísticas públicas.
+    Pode ser reconstruída a partir das tabelas base (reconciliar_contadores.py).
+    """
+    __tablename__ = "contadores"
+
+    # Chave composta (ex: dimensao="contribuicoes_status", valor="PENDENTE")
+    dimensao = Column(String(50), primary_key=True)
+    valor = Column(String(50), primary_key=True)
+
+    # Total acumulado
+    total = Column(Integer, default=0, nullable=False)
+
+    # Auditoria
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Contador {self.dimensao}={self.valor}: {self.total}>"
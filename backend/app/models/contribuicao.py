@@ -1,8 +1,9 @@
 """
 Modelo de Contribuição
 """
-from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, ForeignKey, Boolean, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, ForeignKey, Boolean, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import enum
 from ..core.database import Base
@@ -22,6 +23,17 @@ class DocumentoConsulta(str, enum.Enum):
     CPEO = "CPEO"  # Código de Processo Ético Odontológico
 
 
+# Configuração de texto do PostgreSQL usada na busca textual
+CONFIGURACAO_BUSCA = "portuguese"
+
+# Vetor de busca: capítulo (peso A), texto proposto (B) e fundamentação (C)
+EXPRESSAO_BUSCA_VETOR = (
+    f"setweight(to_tsvector('{CONFIGURACAO_BUSCA}'::regconfig, coalesce(titulo_capitulo, '')), 'A') || "
+    f"setweight(to_tsvector('{CONFIGURACAO_BUSCA}'::regconfig, coalesce(texto_proposto, '')), 'B') || "
+    f"setweight(to_tsvector('{CONFIGURACAO_BUSCA}'::regconfig, coalesce(fundamentacao, '')), 'C')"
+)
+
+
 class StatusModeracao(str, enum.Enum):
     """Status de moderação da contribuição"""
     PENDENTE = "PENDENTE"    # Aguardando moderação
@@ -44,32 +56,46 @@ class Contribuicao(Base):
     __tablename__ = "contribuicoes"
 
     # Identificação
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     # Vínculo com participante
     participante_id = Column(Integer, ForeignKey("participantes.id"), nullable=False, index=True)
 
     # Documento e localização na minuta
-    documento = Column(Enum(DocumentoConsulta), nullable=False, index=True)
+    documento = Column(Enum(DocumentoConsulta), nullable=False)
     titulo_capitulo = Column(String(500), nullable=False)  # Ex: "Capítulo III - Dos Deveres Fundamentais"
     secao = Column(String(500), nullable=True)  # Opcional
     artigo = Column(String(100), nullable=False)  # Ex: "Art. 7º"
     paragrafo_inciso_alinea = Column(String(200), nullable=True)  # Ex: "inciso IV" ou "§ 2º"
 
+    # Chave normalizada da localização (extraída do texto livre na criação)
+    capitulo_numero = Column(Integer, nullable=True)  # Ex: 3 para "Capítulo III"
+    artigo_numero = Column(Integer, nullable=True)    # Ex: 7 para "Art. 7º" (None se não identificado)
+    paragrafo_numero = Column(Integer, default=0, nullable=False)  # 0 = caput; parágrafo único = 1
+    inciso_numero = Column(Integer, default=0, nullable=False)
+    alinea_numero = Column(Integer, default=0, nullable=False)  # a = 1, b = 2, ...
+
     # Tipo e conteúdo da contribuição
-    tipo = Column(Enum(TipoContribuicao), nullable=False, index=True)
+    tipo = Column(Enum(TipoContribuicao), nullable=False)
     texto_proposto = Column(Text, nullable=False)  # Máx 5000 chars (validado em schema)
     fundamentacao = Column(Text, nullable=False)  # Máx 5000 chars (validado em schema)
 
+    # Busca textual (coluna gerada pelo banco a cada INSERT/UPDATE; não carregada por padrão)
+    busca_vetor = deferred(Column(TSVECTOR, Computed(EXPRESSAO_BUSCA_VETOR, persisted=True)))
+
     # Transparência pública
-    publicada = Column(Boolean, default=True, nullable=False, index=True)
+    publicada = Column(Boolean, default=True, nullable=False)
 
     # Moderação (novo sistema)
-    status_moderacao = Column(Enum(StatusModeracao), default=StatusModeracao.PENDENTE, nullable=False, index=True)
-    moderado_por_id = Column(Integer, ForeignKey("admins.id"), nullable=True, index=True)
+    status_moderacao = Column(Enum(StatusModeracao), default=StatusModeracao.PENDENTE, nullable=False)
+    moderado_por_id = Column(Integer, ForeignKey("admins.id"), nullable=True)
     moderado_em = Column(DateTime, nullable=True)
     motivo_rejeicao = Column(Text, nullable=True)  # Obrigatório quando status=REJEITADA
 
+    # Reserva na fila de moderação (expira em reservado_ate)
+    reservado_por_id = Column(Integer, ForeignKey("admins.id"), nullable=True)
+    reservado_ate = Column(DateTime, nullable=True)
+
     # Auditoria
     criado_em = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -81,13 +107,40 @@ class Contribuicao(Base):
     moderado_por = relationship("Admin", back_populates="contribuicoes_moderadas", foreign_keys=[moderado_por_id])
     historico_moderacao = relationship("HistoricoModeracao", back_populates="contribuicao")
 
-    # Índices compostos
+    # Índices compostos (colunas já no início de um composto não têm índice
+    # próprio: cada índice a mais é mantido em toda moderação)
     __table_args__ = (
-        Index('idx_contribuicao_doc_artigo', 'documento', 'artigo'),
+        Index(
+            'idx_contribuicao_doc_dispositivo',
+            'documento', 'artigo_numero', 'paragrafo_numero', 'inciso_numero', 'alinea_numero'
+        ),
+        Index('idx_contribuicao_doc_capitulo', 'documento', 'capitulo_numero'),
         Index('idx_contribuicao_tipo_doc', 'tipo', 'documento'),
-        Index('idx_contribuicao_publicada_criado', 'publicada', 'criado_em'),
         Index('idx_contribuicao_status_moderacao', 'status_moderacao', 'criado_em'),
         Index('idx_contribuicao_moderado_por', 'moderado_por_id', 'moderado_em'),
+        Index(
+            'idx_contribuicao_reservado_por',
+            'reservado_por_id',
+            postgresql_where=text("reservado_por_id IS NOT NULL")
+        ),
+        # Listagem pública por cursor (keyset sobre criado_em, id)
+        Index(
+            'idx_contribuicao_publica_cursor',
+            text('criado_em DESC'), text('id DESC'),
+            postgresql_where=text("status_moderacao = 'APROVADA'")
+        ),
+        Index(
+            'idx_contribuicao_publica_doc_cursor',
+            'documento', text('criado_em DESC'), text('id DESC'),
+            postgresql_where=text("status_moderacao = 'APROVADA'")
+        ),
+        # Busca textual pública
+        Index(
+            'idx_contribuicao_busca_vetor',
+            'busca_vetor',
+            postgresql_using='gin',
+            postgresql_where=text("status_moderacao = 'APROVADA'")
+        ),
     )
 
     def __repr__(self):
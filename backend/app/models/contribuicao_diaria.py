@@ -0,0 +1,51 @@
+"""
+Modelo de Consolidação Diária de Contribuições (rollup)
+"""
+from sqlalchemy import Column, Integer, String, Enum, Date, DateTime
+from datetime import datetime
+from ..core.database import Base
+from .contribuicao import DocumentoConsulta, TipoContribuicao, StatusModeracao
+
+
+class ContribuicaoDiaria(Base):
+    """
+    Tabela de consolidação diária de contribuições
+
+    Totais por dia (horário de Brasília), documento, tipo, UF do
+    participante e status de moderação. Alimenta os gráficos temporais
+    do dashboard sem varrer a tabela de contribuições.
+
+    Apenas dias já encerrados (selados) são gravados aqui; o dia corrente
+    é sempre calculado ao vivo. Mudanças de status de moderação em dias
+    selados são aplicadas incrementalmente.
+    """
+    __tablename__ = "contribuicoes_diarias"
+
+    # Chave composta
+    dia = Column(Date, primary_key=True)  # Dia em horário de Brasília
+    documento = Column(Enum(DocumentoConsulta), primary_key=True)
+    tipo = Column(Enum(TipoContribuicao), primary_key=True)
+    uf = Column(String(2), primary_key=True)
+    status_moderacao = Column(Enum(StatusModeracao), primary_key=True)
+
+    # Total do dia
+    total = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<ContribuicaoDiaria {self.dia} {self.documento.value}/{self.tipo.value}/{self.uf}: {self.total}>"
+
+
+class DiaSelado(Base):
+    """
+    Tabela de dias selados da consolidação diária
+
+    Um registro por dia já consolidado em `contribuicoes_diarias`.
+    Também serve de trava: só a transação que insere o dia o consolida.
+    """
+    __tablename__ = "rollup_dias_selados"
+
+    dia = Column(Date, primary_key=True)
+    selado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DiaSelado {self.dia}>"
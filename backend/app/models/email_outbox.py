@@ -0,0 +1,67 @@
+"""
+Modelo de Caixa de Saída de Emails (outbox)
+"""
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, ForeignKey, Index, JSON, text
+from datetime import datetime
+import enum
+from ..core.database import Base
+
+
+class StatusEmail(str, enum.Enum):
+    """Status de um email na caixa de saída"""
+    PENDENTE = "PENDENTE"  # Aguardando envio (ou nova tentativa)
+    ENVIADO = "ENVIADO"
+    FALHOU = "FALHOU"      # Tentativas esgotadas (dead letter)
+
+
+class TiposEmail:
+    """Constantes para tipos de email (para consistência)"""
+    PROTOCOLO = "PROTOCOLO"
+    RESULTADO_MODERACAO = "RESULTADO_MODERACAO"
+    CONSULTA_ENCERRADA = "CONSULTA_ENCERRADA"
+
+
+class EmailOutbox(Base):
+    """
+    Tabela de caixa de saída de emails
+
+    O email é gravado na mesma transação da escrita que o origina (ex:
+    protocolo) e enviado depois por um worker em segundo plano, com
+    novas tentativas e backoff exponencial. Se o commit falhar, o email
+    não existe; se o envio falhar, ele continua na fila.
+    """
+    __tablename__ = "email_outbox"
+
+    # Identificação
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tipo = Column(String(50), nullable=False)  # TiposEmail
+
+    # Vínculo (para marcar Protocolo.email_enviado)
+    protocolo_id = Column(Integer, ForeignKey("protocolos.id", ondelete="CASCADE"), nullable=True, index=True)
+
+    # Dados para montagem do email (email do destinatário criptografado)
+    payload = Column(JSON, nullable=False)
+
+    # Entrega
+    status = Column(Enum(StatusEmail), default=StatusEmail.PENDENTE, nullable=False)
+    tentativas = Column(Integer, default=0, nullable=False)
+    proxima_tentativa_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    ultimo_erro = Column(Text, nullable=True)
+
+    # Auditoria
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    enviado_em = Column(DateTime, nullable=True)
+
+    # Índices
+    __table_args__ = (
+        # Fila: apenas pendentes, na ordem de tentativa
+        Index(
+            'idx_email_outbox_fila',
+            'proxima_tentativa_em',
+            postgresql_where=text("status = 'PENDENTE'")
+        ),
+        Index('idx_email_outbox_status_criado', 'status', 'criado_em'),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox {self.id}: {self.tipo} {self.status.value}>"
@@ -28,11 +28,11 @@ class HistoricoModeracao(Base):
     __tablename__ = "historico_moderacao"
 
     # Identificação
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     # Vínculos
-    contribuicao_id = Column(Integer, ForeignKey("contribuicoes.id"), nullable=False, index=True)
-    admin_id = Column(Integer, ForeignKey("admins.id"), nullable=False, index=True)
+    contribuicao_id = Column(Integer, ForeignKey("contribuicoes.id"), nullable=False)
+    admin_id = Column(Integer, ForeignKey("admins.id"), nullable=False)
 
     # Ação
     acao = Column(Enum(AcaoModeracao), nullable=False)
@@ -45,7 +45,7 @@ class HistoricoModeracao(Base):
     contribuicao = relationship("Contribuicao", back_populates="historico_moderacao")
     admin = relationship("Admin", back_populates="moderacoes")
 
-    # Índices compostos
+    # Índices compostos (também atendem buscas só por contribuição ou admin)
     __table_args__ = (
         Index('idx_moderacao_contribuicao_criado', 'contribuicao_id', 'criado_em'),
         Index('idx_moderacao_admin_criado', 'admin_id', 'criado_em'),
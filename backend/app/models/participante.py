@@ -1,7 +1,7 @@
 """
 Modelo de Participante (Pessoa Física ou Jurídica)
 """
-from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, Index
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -54,13 +54,13 @@ class Participante(Base):
 
     # Pessoa Física
     nome_completo = Column(String(255), nullable=True)  # PF
-    cpf_hash = Column(String(64), nullable=True, index=True)  # Hash SHA-256 para busca
+    cpf_hash = Column(String(64), nullable=True)  # Hash SHA-256 para busca (único)
     cpf_criptografado = Column(Text, nullable=True)  # CPF criptografado (AES-256)
     categoria_pf = Column(Enum(CategoriaParticipantePF), nullable=True)
 
     # Pessoa Jurídica
     razao_social = Column(String(255), nullable=True)  # PJ
-    cnpj_hash = Column(String(64), nullable=True, index=True)  # Hash SHA-256
+    cnpj_hash = Column(String(64), nullable=True)  # Hash SHA-256 (único)
     cnpj_criptografado = Column(Text, nullable=True)  # CNPJ criptografado
     natureza_entidade = Column(Enum(NaturezaEntidadePJ), nullable=True)
     nome_responsavel_legal = Column(String(255), nullable=True)
@@ -88,6 +88,19 @@ class Participante(Base):
     __table_args__ = (
         Index('idx_participante_tipo_criado', 'tipo', 'criado_em'),
         Index('idx_participante_uf_tipo', 'uf', 'tipo'),
+        # Um participante por CPF/CNPJ (alvo do INSERT ... ON CONFLICT)
+        Index(
+            'idx_participante_cpf_hash_unico',
+            'cpf_hash',
+            unique=True,
+            postgresql_where=text('cpf_hash IS NOT NULL')
+        ),
+        Index(
+            'idx_participante_cnpj_hash_unico',
+            'cnpj_hash',
+            unique=True,
+            postgresql_where=text('cnpj_hash IS NOT NULL')
+        ),
     )
 
     def __repr__(self):
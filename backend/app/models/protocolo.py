@@ -31,7 +31,8 @@ class Protocolo(Base):
     documento = Column(String(10), nullable=False, index=True)  # CEO ou CPEO
     total_contribuicoes = Column(Integer, default=0, nullable=False)
 
-    # IDs das contribuições vinculadas (JSON array)
+    # IDs das contribuições vinculadas (JSON array, mantido por compatibilidade;
+    # consultas usam a tabela protocolo_contribuicoes)
     contribuicoes_ids = Column(JSON, nullable=True)
 
     # Timestamps (horário de Brasília)
@@ -0,0 +1,30 @@
+"""
+Modelo de vínculo Protocolo x Contribuição
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from ..core.database import Base
+
+
+class ProtocoloContribuicao(Base):
+    """
+    Tabela de vínculo entre protocolos e contribuições
+
+    Uma contribuição pode aparecer em mais de um protocolo (o participante
+    pode finalizar o mesmo documento mais de uma vez). Substitui a leitura
+    do array JSON Protocolo.contribuicoes_ids: a página do protocolo é
+    carregada com um único JOIN, e o índice por contribuição responde
+    "em quais protocolos está a contribuição X".
+    """
+    __tablename__ = "protocolo_contribuicoes"
+
+    # Chave composta
+    protocolo_id = Column(Integer, ForeignKey("protocolos.id", ondelete="CASCADE"), primary_key=True)
+    contribuicao_id = Column(Integer, ForeignKey("contribuicoes.id", ondelete="CASCADE"), primary_key=True)
+
+    # Índices
+    __table_args__ = (
+        Index('idx_protocolo_contribuicao_contribuicao', 'contribuicao_id'),
+    )
+
+    def __repr__(self):
+        return f"<ProtocoloContribuicao {self.protocolo_id} -> {self.contribuicao_id}>"
@@ -0,0 +1,27 @@
+"""
+Modelo de Sequencial de Protocolos
+"""
+from sqlalchemy import Column, Integer, String
+from ..core.database import Base
+
+
+class SequencialProtocolo(Base):
+    """
+    Tabela de sequenciais de protocolo por (documento, ano)
+
+    Guarda o último número emitido. A alocação é um único
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING sobre a linha: O(1) e
+    serializada pelo lock da linha até o commit, sem colisões entre
+    finalizações concorrentes.
+    """
+    __tablename__ = "sequenciais_protocolo"
+
+    # Chave composta (ex: documento="CEO", ano=2026)
+    documento = Column(String(10), primary_key=True)
+    ano = Column(Integer, primary_key=True)
+
+    # Último sequencial emitido
+    ultimo = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<SequencialProtocolo {self.documento}/{self.ano}: {self.ultimo}>"
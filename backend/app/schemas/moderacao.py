@@ -5,7 +5,8 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
 from ..models.historico_moderacao import AcaoModeracao
-from ..models.contribuicao import StatusModeracao
+from ..models.contribuicao import StatusModeracao, DocumentoConsulta, TipoContribuicao
+from ..core.config import settings
 from .admin import AdminResponse
 
 
@@ -29,29 +30,29 @@ class ModeracaoRejeitar(BaseModel):
 
 class ModeracaoEmLote(BaseModel):
     """Schema para moderação em lote"""
-    contribuicao_ids: List[int] = Field(..., min_items=1, max_items=100)
+    contribuicao_ids: List[int] = Field(..., min_items=1, max_items=settings.MODERACAO_LOTE_MAX_ITENS)
 
     @validator('contribuicao_ids')
     def validar_ids(cls, v):
         if not v:
             raise ValueError('Deve selecionar pelo menos uma contribuição')
-        if len(v) > 100:
-            raise ValueError('Máximo de 100 contribuições por vez')
+        if len(v) > settings.MODERACAO_LOTE_MAX_ITENS:
+            raise ValueError(f'Máximo de {settings.MODERACAO_LOTE_MAX_ITENS} contribuições por vez')
         # Remove duplicatas
         return list(set(v))
 
 
 class ModeracaoRejeitarEmLote(BaseModel):
     """Schema para rejeitar em lote"""
-    contribuicao_ids: List[int] = Field(..., min_items=1, max_items=100)
+    contribuicao_ids: List[int] = Field(..., min_items=1, max_items=settings.MODERACAO_LOTE_MAX_ITENS)
     motivo: str = Field(..., min_length=10, max_length=1000)
 
     @validator('contribuicao_ids')
     def validar_ids(cls, v):
         if not v:
             raise ValueError('Deve selecionar pelo menos uma contribuição')
-        if len(v) > 100:
-            raise ValueError('Máximo de 100 contribuições por vez')
+        if len(v) > settings.MODERACAO_LOTE_MAX_ITENS:
+            raise ValueError(f'Máximo de {settings.MODERACAO_LOTE_MAX_ITENS} contribuições por vez')
         return list(set(v))
 
     @validator('motivo')
@@ -62,6 +63,18 @@ class ModeracaoRejeitarEmLote(BaseModel):
         return v
 
 
+class ModeracaoReivindicar(BaseModel):
+    """Schema para reservar contribuições da fila de moderação"""
+    quantidade: int = Field(default=20, ge=1, le=settings.MODERACAO_RESERVA_MAX_ITENS)
+    documento: Optional[DocumentoConsulta] = None
+    tipo: Optional[TipoContribuicao] = None
+
+
+class ModeracaoLiberar(BaseModel):
+    """Schema para liberar reservas (sem IDs = todas do moderador)"""
+    contribuicao_ids: Optional[List[int]] = Field(default=None, max_items=settings.MODERACAO_RESERVA_MAX_ITENS)
+
+
 class HistoricoModeracaoResponse(BaseModel):
     """Schema de resposta de histórico de moderação"""
     id: int
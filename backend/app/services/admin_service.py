@@ -2,15 +2,15 @@
 Service para gerenciamento de administradores
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, update, func, and_
 from typing import List, Optional
 from datetime import datetime
 
 from ..models.admin import Admin, AdminRole
+from ..utils.cache_admin import registrar_alteracao_admin
 from ..schemas.admin import AdminCreate, AdminUpdate
 from ..utils.security import (
-    hash_senha,
-    verificar_senha,
+    executor_senhas,
     gerar_token_admin,
     gerar_refresh_token,
     gerar_hash_sha256,
@@ -49,11 +49,14 @@ async def autenticar_admin(
     )
     admin = result.scalar_one_or_none()
 
-    if not admin:
-        return None
+    # Verifica senha (contra hash fictício se o email não existir, com o
+    # mesmo custo, para não revelar quais emails estão cadastrados)
+    senha_valida = await executor_senhas.verificar(
+        senha,
+        admin.senha_hash if admin else None
+    )
 
-    # Verifica senha
-    if not verificar_senha(senha, admin.senha_hash):
+    if not admin or not senha_valida:
         return None
 
     return admin
@@ -79,15 +82,15 @@ async def criar_admin(
     admin = Admin(
         email_hash=gerar_hash_sha256(data.email),
         email_criptografado=criptografar_dados(data.email),
-        senha_hash=hash_senha(data.senha),
+        senha_hash=await executor_senhas.hash(data.senha),
         nome=data.nome,
         role=data.role,
         ativo=True
     )
 
+    # INSERT ... RETURNING id (demais valores já são conhecidos no cliente)
     db.add(admin)
     await db.flush()
-    await db.refresh(admin)
 
     return admin
 
@@ -132,6 +135,35 @@ async def obter_admin_por_id(
     return await db.get(Admin, admin_id)
 
 
+async def _atualizar_campos(
+    db: AsyncSession,
+    admin_id: int,
+    **valores
+) -> Optional[Admin]:
+    """
+    Atualiza campos do admin em um único UPDATE ... RETURNING
+
+    Também agenda a invalidação do principal em cache (todos os workers,
+    após o commit).
+
+    Returns:
+        Admin atualizado ou None se não encontrado
+    """
+    result = await db.execute(
+        update(Admin)
+        .where(Admin.id == admin_id)
+        .values(atualizado_em=datetime.utcnow(), **valores)
+        .returning(Admin),
+        execution_options={"populate_existing": True}
+    )
+    admin = result.scalar_one_or_none()
+
+    if admin:
+        await registrar_alteracao_admin(db, admin.id)
+
+    return admin
+
+
 async def atualizar_admin(
     db: AsyncSession,
     admin_id: int,
@@ -148,30 +180,23 @@ async def atualizar_admin(
     Returns:
         Admin atualizado ou None se não encontrado
     """
-    admin = await db.get(Admin, admin_id)
-    if not admin:
-        return None
-
     # Atualiza campos fornecidos
+    valores = {}
+
     if data.nome is not None:
-        admin.nome = data.nome
+        valores["nome"] = data.nome
 
     if data.email is not None:
-        admin.email_hash = gerar_hash_sha256(data.email)
-        admin.email_criptografado = criptografar_dados(data.email)
+        valores["email_hash"] = gerar_hash_sha256(data.email)
+        valores["email_criptografado"] = criptografar_dados(data.email)
 
     if data.role is not None:
-        admin.role = data.role
+        valores["role"] = data.role
 
     if data.ativo is not None:
-        admin.ativo = data.ativo
-
-    admin.atualizado_em = datetime.utcnow()
-
-    await db.flush()
-    await db.refresh(admin)
+        valores["ativo"] = data.ativo
 
-    return admin
+    return await _atualizar_campos(db, admin_id, **valores)
 
 
 async def desativar_admin(
@@ -188,17 +213,7 @@ async def desativar_admin(
     Returns:
         Admin desativado ou None se não encontrado
     """
-    admin = await db.get(Admin, admin_id)
-    if not admin:
-        return None
-
-    admin.ativo = False
-    admin.atualizado_em = datetime.utcnow()
-
-    await db.flush()
-    await db.refresh(admin)
-
-    return admin
+    return await _atualizar_campos(db, admin_id, ativo=False)
 
 
 async def ativar_admin(
@@ -215,17 +230,7 @@ async def ativar_admin(
     Returns:
         Admin ativado ou None se não encontrado
     """
-    admin = await db.get(Admin, admin_id)
-    if not admin:
-        return None
-
-    admin.ativo = True
-    admin.atualizado_em = datetime.utcnow()
-
-    await db.flush()
-    await db.refresh(admin)
-
-    return admin
+    return await _atualizar_campos(db, admin_id, ativo=True)
 
 
 async def contar_super_admins_ativos(db: AsyncSession) -> int:
@@ -272,11 +277,11 @@ async def alterar_senha(
         return False
 
     # Verifica senha atual
-    if not verificar_senha(senha_atual, admin.senha_hash):
+    if not await executor_senhas.verificar(senha_atual, admin.senha_hash):
         return False
 
     # Atualiza senha
-    admin.senha_hash = hash_senha(senha_nova)
+    admin.senha_hash = await executor_senhas.hash(senha_nova)
     admin.atualizado_em = datetime.utcnow()
 
     await db.flush()
@@ -323,17 +328,9 @@ async def resetar_senha(
     Returns:
         Admin ou None se não encontrado
     """
-    admin = await db.get(Admin, admin_id)
-    if not admin:
-        return None
-
-    admin.senha_hash = hash_senha(senha_nova)
-    admin.atualizado_em = datetime.utcnow()
+    senha_hash = await executor_senhas.hash(senha_nova)
 
-    await db.flush()
-    await db.refresh(admin)
-
-    return admin
+    return await _atualizar_campos(db, admin_id, senha_hash=senha_hash)
 
 
 def descriptografar_email_admin(admin: Admin) -> str:
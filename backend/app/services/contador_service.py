@@ -0,0 +1,393 @@
+"""
+Service para contadores agregados (leituras O(1) de totais)
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, String, column, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from collections import Counter, defaultdict
+
+from ..models.contador import Contador
+from ..models.contribuicao import Contribuicao, StatusModeracao
+from ..models.participante import Participante
+from ..models.protocolo import Protocolo
+
+
+# Constantes para dimensões dos contadores (para consistência)
+class DimensoesContador:
+    """Constantes para dimensões dos contadores"""
+    CONTRIBUICOES_STATUS = "contribuicoes_status"
+    APROVADAS_TIPO = "aprovadas_tipo"
+    APROVADAS_DOCUMENTO = "aprovadas_documento"
+    APROVADAS_ARTIGO = "aprovadas_artigo"  # valor: "DOCUMENTO:ARTIGO:TIPO" (artigo 0 = não identificado)
+    PARTICIPANTES_TIPO = "participantes_tipo"
+    PARTICIPANTES_UF = "participantes_uf"
+    PROTOCOLOS_DOCUMENTO = "protocolos_documento"
+
+
+def _valor(valor) -> str:
+    """Normaliza enums/strings para a coluna valor"""
+    return valor.value if hasattr(valor, "value") else str(valor)
+
+
+def valor_artigo(documento, artigo_numero: Optional[int], tipo) -> str:
+    """Monta o valor do contador por artigo ("CEO:7:ALTERACAO")"""
+    return f"{_valor(documento)}:{artigo_numero or 0}:{_valor(tipo)}"
+
+
+async def incrementar(
+    db: AsyncSession,
+    incrementos: Dict[Tuple[str, str], int]
+) -> None:
+    """
+    Aplica incrementos aos contadores em uma única instrução
+
+    Deve ser chamado na mesma transação da escrita que originou o incremento.
+    As chaves são ordenadas para que transações concorrentes bloqueiem as
+    linhas sempre na mesma ordem (evita deadlocks).
+
+    Deltas positivos usam INSERT ... ON CONFLICT (criam o contador se não
+    existir); deltas negativos apenas atualizam contadores existentes (em
+    uma CTE UPDATE na mesma instrução), para que um decremento de chave
+    ausente não grave um total negativo. Divergências assim são corrigidas
+    por reconciliar_contadores.
+
+    Contenção: a linha de cada contador fica bloqueada até o commit. Toda
+    contribuição criada incrementa contribuicoes_status/PENDENTE, então
+    criações concorrentes se serializam nessa linha pelo restante da
+    transação (o commit vem ao fim da requisição). Chamar este método por
+    último na escrita encurta a espera; se o volume de envios exigir, o
+    contador pode ser fragmentado (N linhas por chave, somadas na leitura).
+
+    Args:
+        db: Sessão do banco
+        incrementos: Dict {(dimensao, valor): delta}
+    """
+    linhas = [
+        {"dimensao": dimensao, "valor": _valor(valor), "total": delta}
+        for (dimensao, valor), delta in sorted(
+            incrementos.items(), key=lambda item: (item[0][0], _valor(item[0][1]))
+        )
+        if delta
+    ]
+
+    if not linhas:
+        return
+
+    agora = datetime.utcnow()
+    positivas = [linha for linha in linhas if linha["total"] > 0]
+    negativas = [linha for linha in linhas if linha["total"] < 0]
+
+    decremento = None
+    if negativas:
+        deltas = values(
+            column("dimensao", String),
+            column("valor", String),
+            column("delta", Integer),
+            name="deltas"
+        ).data([(linha["dimensao"], linha["valor"], linha["total"]) for linha in negativas])
+        decremento = (
+            update(Contador)
+            .where(Contador.dimensao == deltas.c.dimensao, Contador.valor == deltas.c.valor)
+            .values(total=Contador.total + deltas.c.delta, atualizado_em=agora)
+        )
+
+    if not positivas:
+        await db.execute(decremento.execution_options(synchronize_session=False))
+        return
+
+    stmt = insert(Contador).values(positivas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Contador.dimensao, Contador.valor],
+        set_={
+            "total": Contador.total + stmt.excluded.total,
+            "atualizado_em": agora
+        }
+    )
+    if decremento is not None:
+        stmt = stmt.add_cte(decremento.cte("decrementos"))
+    await db.execute(stmt)
+
+
+async def registrar_contribuicao_criada(
+    db: AsyncSession,
+    contribuicao: Contribuicao
+) -> None:
+    """Atualiza contadores após criação de contribuição"""
+    await incrementar(db, {
+        (DimensoesContador.CONTRIBUICOES_STATUS, contribuicao.status_moderacao): 1
+    })
+
+
+async def registrar_moderacao(
+    db: AsyncSession,
+    contribuicao: Contribuicao,
+    status_anterior: StatusModeracao
+) -> None:
+    """
+    Atualiza contadores após mudança de status de moderação
+
+    Args:
+        db: Sessão do banco
+        contribuicao: Contribuição já com o novo status
+        status_anterior: Status antes da moderação
+    """
+    await registrar_moderacoes(db, [contribuicao], status_anterior)
+
+
+async def registrar_moderacoes(
+    db: AsyncSession,
+    contribuicoes: Iterable,
+    status_anterior: StatusModeracao
+) -> None:
+    """
+    Atualiza contadores após moderação de várias contribuições (um único INSERT)
+
+    Args:
+        db: Sessão do banco
+        contribuicoes: Contribuições (ou linhas com status_moderacao, tipo,
+            documento e artigo_numero) já com o novo status
+        status_anterior: Status antes da moderação
+    """
+    incrementos = defaultdict(int)
+
+    # Agrupa antes de normalizar: lotes grandes têm poucas combinações distintas
+    grupos = Counter(
+        (c.status_moderacao, c.tipo, c.documento, c.artigo_numero)
+        for c in contribuicoes
+    )
+
+    for (status, tipo, documento, artigo_numero), quantidade in grupos.items():
+        incrementos[(DimensoesContador.CONTRIBUICOES_STATUS, _valor(status_anterior))] -= quantidade
+        incrementos[(DimensoesContador.CONTRIBUICOES_STATUS, _valor(status))] += quantidade
+
+        if status == StatusModeracao.APROVADA:
+            incrementos[(DimensoesContador.APROVADAS_TIPO, _valor(tipo))] += quantidade
+            incrementos[(DimensoesContador.APROVADAS_DOCUMENTO, _valor(documento))] += quantidade
+            incrementos[(
+                DimensoesContador.APROVADAS_ARTIGO,
+                valor_artigo(documento, artigo_numero, tipo)
+            )] += quantidade
+
+    await incrementar(db, incrementos)
+
+
+async def registrar_participante_criado(
+    db: AsyncSession,
+    participante: Participante
+) -> None:
+    """Atualiza contadores após criação de participante"""
+    await incrementar(db, {
+        (DimensoesContador.PARTICIPANTES_TIPO, participante.tipo): 1,
+        (DimensoesContador.PARTICIPANTES_UF, participante.uf): 1
+    })
+
+
+async def registrar_protocolo_criado(
+    db: AsyncSession,
+    protocolo: Protocolo
+) -> None:
+    """Atualiza contadores após criação de protocolo"""
+    await incrementar(db, {
+        (DimensoesContador.PROTOCOLOS_DOCUMENTO, protocolo.documento): 1
+    })
+
+
+async def obter_contadores(
+    db: AsyncSession,
+    dimensoes: Optional[List[str]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Lê os contadores em uma única consulta
+
+    Args:
+        db: Sessão do banco
+        dimensoes: Dimensões desejadas (None = todas)
+
+    Returns:
+        Dict {dimensao: {valor: total}}
+    """
+    query = select(Contador.dimensao, Contador.valor, Contador.total)
+
+    if dimensoes:
+        query = query.where(Contador.dimensao.in_(dimensoes))
+
+    result = await db.execute(query)
+
+    contadores = defaultdict(dict)
+    for row in result.all():
+        contadores[row.dimensao][row.valor] = row.total
+
+    return contadores
+
+
+async def obter_contador(
+    db: AsyncSession,
+    dimensao: str,
+    valor: Optional[str] = None
+) -> int:
+    """
+    Lê um contador (ou a soma de uma dimensão inteira)
+
+    Args:
+        db: Sessão do banco
+        dimensao: Dimensão do contador
+        valor: Valor específico (None = soma de todos os valores)
+
+    Returns:
+        Total
+    """
+    query = select(func.coalesce(func.sum(Contador.total), 0)).where(
+        Contador.dimensao == dimensao
+    )
+
+    if valor is not None:
+        query = query.where(Contador.valor == _valor(valor))
+
+    result = await db.execute(query)
+    return int(result.scalar() or 0)
+
+
+async def obter_versao(
+    db: AsyncSession,
+    dimensao: str,
+    valor: Optional[str] = None
+) -> Tuple[int, Optional[datetime]]:
+    """
+    Lê um carimbo de versão barato de uma dimensão (para ETags)
+
+    Args:
+        db: Sessão do banco
+        dimensao: Dimensão do contador
+        valor: Valor específico (None = todos os valores)
+
+    Returns:
+        Tupla (soma dos totais, última atualização)
+    """
+    query = select(
+        func.coalesce(func.sum(Contador.total), 0),
+        func.max(Contador.atualizado_em)
+    ).where(Contador.dimensao == dimensao)
+
+    if valor is not None:
+        query = query.where(Contador.valor == _valor(valor))
+
+    result = await db.execute(query)
+    total, atualizado_em = result.one()
+    return int(total or 0), atualizado_em
+
+
+async def calcular_contadores_esperados(db: AsyncSession) -> Dict[Tuple[str, str], int]:
+    """
+    Recalcula todos os contadores a partir das tabelas base
+
+    Returns:
+        Dict {(dimensao, valor): total}
+    """
+    esperados = {}
+
+    aprovada = Contribuicao.status_moderacao == StatusModeracao.APROVADA
+
+    consultas = [
+        (
+            DimensoesContador.CONTRIBUICOES_STATUS,
+            select(Contribuicao.status_moderacao, func.count(Contribuicao.id))
+            .group_by(Contribuicao.status_moderacao)
+        ),
+        (
+            DimensoesContador.APROVADAS_TIPO,
+            select(Contribuicao.tipo, func.count(Contribuicao.id))
+            .where(aprovada)
+            .group_by(Contribuicao.tipo)
+        ),
+        (
+            DimensoesContador.APROVADAS_DOCUMENTO,
+            select(Contribuicao.documento, func.count(Contribuicao.id))
+            .where(aprovada)
+            .group_by(Contribuicao.documento)
+        ),
+        (
+            DimensoesContador.PARTICIPANTES_TIPO,
+            select(Participante.tipo, func.count(Participante.id))
+            .group_by(Participante.tipo)
+        ),
+        (
+            DimensoesContador.PARTICIPANTES_UF,
+            select(Participante.uf, func.count(Participante.id))
+            .group_by(Participante.uf)
+        ),
+        (
+            DimensoesContador.PROTOCOLOS_DOCUMENTO,
+            select(Protocolo.documento, func.count(Protocolo.id))
+            .group_by(Protocolo.documento)
+        ),
+    ]
+
+    for dimensao, query in consultas:
+        result = await db.execute(query)
+        for valor, total in result.all():
+            esperados[(dimensao, _valor(valor))] = total
+
+    result = await db.execute(
+        select(
+            Contribuicao.documento,
+            Contribuicao.artigo_numero,
+            Contribuicao.tipo,
+            func.count(Contribuicao.id)
+        )
+        .where(aprovada)
+        .group_by(Contribuicao.documento, Contribuicao.artigo_numero, Contribuicao.tipo)
+    )
+    for documento, artigo_numero, tipo, total in result.all():
+        chave = (DimensoesContador.APROVADAS_ARTIGO, valor_artigo(documento, artigo_numero, tipo))
+        # artigo nulo e 0 compartilham o mesmo contador
+        esperados[chave] = esperados.get(chave, 0) + total
+
+    return esperados
+
+
+async def reconciliar_contadores(
+    db: AsyncSession,
+    corrigir: bool = True
+) -> List[dict]:
+    """
+    Compara os contadores armazenados com as tabelas base
+
+    Bloqueia escritas na tabela de contadores durante a reconciliação, de
+    modo que incrementos concorrentes aguardem o fim da transação e não
+    sejam perdidos nem contados em dobro.
+
+    Args:
+        db: Sessão do banco
+        corrigir: Se True, regrava os contadores divergentes
+
+    Returns:
+        Lista de divergências {dimensao, valor, armazenado, esperado}
+    """
+    await db.execute(text("LOCK TABLE contadores IN SHARE ROW EXCLUSIVE MODE"))
+
+    esperados = await calcular_contadores_esperados(db)
+
+    result = await db.execute(select(Contador.dimensao, Contador.valor, Contador.total))
+    armazenados = {(row.dimensao, row.valor): row.total for row in result.all()}
+
+    divergencias = []
+    for chave in sorted(set(esperados) | set(armazenados)):
+        esperado = esperados.get(chave, 0)
+        armazenado = armazenados.get(chave, 0)
+        if esperado != armazenado:
+            divergencias.append({
+                "dimensao": chave[0],
+                "valor": chave[1],
+                "armazenado": armazenado,
+                "esperado": esperado
+            })
+
+    if corrigir and divergencias:
+        await incrementar(db, {
+            (d["dimensao"], d["valor"]): d["esperado"] - d["armazenado"]
+            for d in divergencias
+        })
+
+    return divergencias
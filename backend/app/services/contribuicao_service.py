@@ -2,12 +2,19 @@
 Serviço de Contribuição
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from typing import List, Optional
+from sqlalchemy import select, and_, func, tuple_, cast
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import datetime
+import html
 
-from ..models.contribuicao import Contribuicao, DocumentoConsulta, StatusModeracao
+from ..models.contribuicao import Contribuicao, DocumentoConsulta, StatusModeracao, CONFIGURACAO_BUSCA
 from ..models.participante import Participante
 from ..schemas.contribuicao import ContribuicaoCreate
+from ..utils.dispositivo import FiltroDispositivo, extrair_chave_dispositivo, extrair_numero_capitulo
+from . import contador_service, rollup_service
+from .contador_service import DimensoesContador
+from ..utils.cache import EventosCache, registrar_evento
 
 
 async def criar_contribuicao(
@@ -30,6 +37,9 @@ async def criar_contribuicao(
     Returns:
         Contribuição criada
     """
+    # Chave normalizada da localização (para filtros e ordenação por artigo)
+    chave = extrair_chave_dispositivo(data.artigo, data.paragrafo_inciso_alinea)
+
     contribuicao = Contribuicao(
         participante_id=participante_id,
         documento=data.documento,
@@ -37,6 +47,11 @@ async def criar_contribuicao(
         secao=data.secao,
         artigo=data.artigo,
         paragrafo_inciso_alinea=data.paragrafo_inciso_alinea,
+        capitulo_numero=extrair_numero_capitulo(data.titulo_capitulo),
+        artigo_numero=chave.artigo,
+        paragrafo_numero=chave.paragrafo,
+        inciso_numero=chave.inciso,
+        alinea_numero=chave.alinea,
         tipo=data.tipo,
         texto_proposto=data.texto_proposto,
         fundamentacao=data.fundamentacao,
@@ -46,9 +61,14 @@ async def criar_contribuicao(
         user_agent=user_agent
     )
 
+    # INSERT ... RETURNING id (demais valores já são conhecidos no cliente)
     db.add(contribuicao)
     await db.flush()
-    await db.refresh(contribuicao)
+
+    # Atualiza contadores na mesma transação
+    await contador_service.registrar_contribuicao_criada(db, contribuicao)
+    await rollup_service.registrar_contribuicao_criada(db, contribuicao)
+    registrar_evento(db, EventosCache.CONTRIBUICAO)
 
     return contribuicao
 
@@ -72,18 +92,53 @@ async def listar_contribuicoes_participante(
     return list(result.scalars().all())
 
 
-async def listar_contribuicoes_publicas(
-    db: AsyncSession,
-    documento: Optional[DocumentoConsulta] = None,
-    artigo: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0
-) -> List[dict]:
+def filtrar_por_dispositivo(query, filtro: Optional[FiltroDispositivo]):
     """
-    Lista contribuições públicas (sem dados sensíveis)
+    Aplica filtros de localização usando a chave normalizada (indexada)
+
+    Args:
+        query: SELECT sobre Contribuicao
+        filtro: Filtro de artigo, intervalo de artigos e capítulo
 
     Returns:
-        Lista de dicts com dados públicos
+        Query filtrada
+    """
+    if filtro is None:
+        return query
+
+    if filtro.artigo is not None:
+        query = query.where(Contribuicao.artigo_numero == filtro.artigo.artigo)
+        # Parágrafo, inciso e alínea só restringem quando informados
+        if filtro.artigo.paragrafo:
+            query = query.where(Contribuicao.paragrafo_numero == filtro.artigo.paragrafo)
+        if filtro.artigo.inciso:
+            query = query.where(Contribuicao.inciso_numero == filtro.artigo.inciso)
+        if filtro.artigo.alinea:
+            query = query.where(Contribuicao.alinea_numero == filtro.artigo.alinea)
+    elif filtro.artigo_texto:
+        query = query.where(Contribuicao.artigo == filtro.artigo_texto)
+
+    if filtro.artigo_inicio is not None:
+        query = query.where(Contribuicao.artigo_numero >= filtro.artigo_inicio)
+
+    if filtro.artigo_fim is not None:
+        query = query.where(Contribuicao.artigo_numero <= filtro.artigo_fim)
+
+    if filtro.capitulo is not None:
+        query = query.where(Contribuicao.capitulo_numero == filtro.capitulo)
+
+    return query
+
+
+def _consulta_contribuicoes_publicas(
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: Optional[FiltroDispositivo] = None
+):
+    """
+    SELECT das contribuições públicas (apenas campos sem dados sensíveis)
+
+    Ordenado por (criado_em, id) decrescente, compatível com o índice
+    parcial de contribuições aprovadas.
     """
     query = (
         select(
@@ -109,55 +164,292 @@ async def listar_contribuicoes_publicas(
     if documento:
         query = query.where(Contribuicao.documento == documento)
 
-    if artigo:
-        query = query.where(Contribuicao.artigo == artigo)
+    query = filtrar_por_dispositivo(query, filtro)
 
-    query = query.order_by(Contribuicao.criado_em.desc())
+    return query.order_by(Contribuicao.criado_em.desc(), Contribuicao.id.desc())
+
+
+def _formatar_contribuicao_publica(row) -> dict:
+    """Monta o dict público (LGPD) a partir de uma linha da consulta pública"""
+    # Define nome público baseado no tipo
+    nome_publico = row.nome_completo if row.nome_completo else row.razao_social
+
+    # Monta localização completa
+    partes = [row.titulo_capitulo]
+    if row.secao:
+        partes.append(row.secao)
+    partes.append(row.artigo)
+    if row.paragrafo_inciso_alinea:
+        partes.append(row.paragrafo_inciso_alinea)
+    localizacao = " - ".join(partes)
+
+    return {
+        "id": row.id,
+        "documento": row.documento.value,
+        "localizacao": localizacao,
+        "tipo": row.tipo.value,
+        "texto_proposto": row.texto_proposto,
+        "fundamentacao": row.fundamentacao,
+        "nome_participante": nome_publico,
+        "uf": row.uf,
+        "criado_em": row.criado_em
+    }
+
+
+async def listar_contribuicoes_publicas(
+    db: AsyncSession,
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: Optional[FiltroDispositivo] = None,
+    limit: int = 100,
+    offset: int = 0
+) -> List[dict]:
+    """
+    Lista contribuições públicas (sem dados sensíveis)
+
+    Returns:
+        Lista de dicts com dados públicos
+    """
+    query = _consulta_contribuicoes_publicas(documento, filtro)
     query = query.limit(limit).offset(offset)
 
     result = await db.execute(query)
+
+    return [_formatar_contribuicao_publica(row) for row in result.all()]
+
+
+async def listar_contribuicoes_publicas_cursor(
+    db: AsyncSession,
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: Optional[FiltroDispositivo] = None,
+    limit: int = 100,
+    apos: Optional[Tuple[datetime, int]] = None
+) -> Tuple[List[dict], bool]:
+    """
+    Lista contribuições públicas por cursor (keyset), sem OFFSET
+
+    O custo independe da profundidade da página: a consulta parte da
+    posição (criado_em, id) do último item já entregue.
+
+    Args:
+        db: Sessão do banco
+        documento: Filtro por documento
+        filtro: Filtro por localização (artigo, intervalo, capítulo)
+        limit: Itens por página
+        apos: Posição (criado_em, id) do último item da página anterior
+
+    Returns:
+        Tupla (lista de dicts com dados públicos, há mais itens)
+    """
+    query = _consulta_contribuicoes_publicas(documento, filtro)
+
+    if apos is not None:
+        query = query.where(
+            tuple_(Contribuicao.criado_em, Contribuicao.id) < tuple_(*apos)
+        )
+
+    # Busca um item a mais para saber se existe próxima página
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+
+    contribuicoes = [_formatar_contribuicao_publica(row) for row in rows[:limit]]
+
+    return contribuicoes, len(rows) > limit
+
+
+async def iterar_contribuicoes_publicas(
+    db: AsyncSession,
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: Optional[FiltroDispositivo] = None,
+    tamanho_lote: int = 1000
+) -> AsyncIterator[List[dict]]:
+    """
+    Percorre todas as contribuições públicas em lotes (exportação)
+
+    Usa cursor no servidor (yield_per): apenas um lote fica em memória,
+    independente do tamanho do conjunto. Mesma projeção LGPD da listagem.
+
+    Args:
+        db: Sessão do banco (mantida aberta durante a iteração)
+        documento: Filtro por documento
+        filtro: Filtro por localização (artigo, intervalo, capítulo)
+        tamanho_lote: Linhas buscadas por vez
+
+    Yields:
+        Listas de dicts com dados públicos
+    """
+    query = _consulta_contribuicoes_publicas(documento, filtro)
+    result = await db.stream(query.execution_options(yield_per=tamanho_lote))
+
+    async for lote in result.partitions():
+        yield [_formatar_contribuicao_publica(row) for row in lote]
+
+
+# Opções de ts_headline para os trechos destacados
+OPCOES_DESTAQUE = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter=\" … \""
+
+
+def _sanitizar_destaque(trecho: Optional[str]) -> Optional[str]:
+    """Escapa o texto do participante mantendo apenas as marcações <mark>"""
+    if trecho is None:
+        return None
+    return (
+        html.escape(trecho, quote=False)
+        .replace("&lt;mark&gt;", "<mark>")
+        .replace("&lt;/mark&gt;", "</mark>")
+    )
+
+
+async def buscar_contribuicoes_publicas(
+    db: AsyncSession,
+    termo: str,
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: Optional[FiltroDispositivo] = None,
+    limit: int = 50,
+    apos: Optional[Tuple[float, int]] = None
+) -> Tuple[List[dict], bool]:
+    """
+    Busca textual (português) nas contribuições aprovadas
+
+    Usa o vetor de busca armazenado (índice GIN) e ordena por relevância.
+    Os trechos destacados são gerados apenas para os itens da página.
+
+    Args:
+        db: Sessão do banco
+        termo: Texto da busca (sintaxe de buscadores: "frase", -termo, OR)
+        documento: Filtro por documento
+        filtro: Filtro por localização (artigo, intervalo, capítulo)
+        limit: Itens por página
+        apos: Posição (relevância, id) do último item da página anterior
+
+    Returns:
+        Tupla (lista de dicts públicos com relevância e destaques, há mais itens)
+    """
+    configuracao = cast(CONFIGURACAO_BUSCA, REGCONFIG)
+    consulta_texto = func.websearch_to_tsquery(configuracao, termo)
+    relevancia = func.ts_rank_cd(Contribuicao.busca_vetor, consulta_texto)
+
+    query = (
+        _consulta_contribuicoes_publicas(documento, filtro)
+        .add_columns(relevancia.label("relevancia"))
+        .where(Contribuicao.busca_vetor.op("@@")(consulta_texto))
+        .order_by(None)
+        .order_by(relevancia.desc(), Contribuicao.id.desc())
+    )
+
+    if apos is not None:
+        query = query.where(tuple_(relevancia, Contribuicao.id) < tuple_(*apos))
+
+    # Busca um item a mais para saber se existe próxima página
+    pagina = query.limit(limit + 1).subquery("pagina")
+
+    result = await db.execute(
+        select(
+            pagina,
+            func.ts_headline(
+                configuracao, pagina.c.texto_proposto, consulta_texto, OPCOES_DESTAQUE
+            ).label("destaque_texto_proposto"),
+            func.ts_headline(
+                configuracao, pagina.c.fundamentacao, consulta_texto, OPCOES_DESTAQUE
+            ).label("destaque_fundamentacao")
+        ).order_by(pagina.c.relevancia.desc(), pagina.c.id.desc())
+    )
     rows = result.all()
 
     contribuicoes = []
-    for row in rows:
-        # Define nome público baseado no tipo
-        nome_publico = row.nome_completo if row.nome_completo else row.razao_social
-
-        # Monta localização completa
-        partes = [row.titulo_capitulo]
-        if row.secao:
-            partes.append(row.secao)
-        partes.append(row.artigo)
-        if row.paragrafo_inciso_alinea:
-            partes.append(row.paragrafo_inciso_alinea)
-        localizacao = " - ".join(partes)
-
-        contribuicoes.append({
-            "id": row.id,
-            "documento": row.documento.value,
-            "localizacao": localizacao,
-            "tipo": row.tipo.value,
-            "texto_proposto": row.texto_proposto,
-            "fundamentacao": row.fundamentacao,
-            "nome_participante": nome_publico,
-            "uf": row.uf,
-            "criado_em": row.criado_em
-        })
-
-    return contribuicoes
+    for row in rows[:limit]:
+        contribuicao = _formatar_contribuicao_publica(row)
+        contribuicao["relevancia"] = row.relevancia
+        contribuicao["destaques"] = {
+            "texto_proposto": _sanitizar_destaque(row.destaque_texto_proposto),
+            "fundamentacao": _sanitizar_destaque(row.destaque_fundamentacao)
+        }
+        contribuicoes.append(contribuicao)
 
+    return contribuicoes, len(rows) > limit
 
-async def contar_contribuicoes_publicas(
+
+async def obter_versao_contribuicoes_publicas(
     db: AsyncSession,
     documento: Optional[DocumentoConsulta] = None
+) -> Tuple[int, Optional[datetime]]:
+    """
+    Carimbo de versão da listagem pública (para ETag / Last-Modified)
+
+    A listagem só muda quando uma contribuição é aprovada (a aprovação é
+    definitiva), o que sempre atualiza o contador de aprovadas do documento.
+
+    Returns:
+        Tupla (total de aprovadas, momento da última aprovação)
+    """
+    return await contador_service.obter_versao(
+        db,
+        DimensoesContador.APROVADAS_DOCUMENTO,
+        documento
+    )
+
+
+async def obter_mapa_artigos(db: AsyncSession) -> dict:
+    """
+    Contagem de contribuições aprovadas por (documento, artigo, tipo)
+
+    Lido dos contadores por artigo (mantidos na aprovação), em uma consulta.
+
+    Returns:
+        Dict {"documentos": {DOC: {"total", "artigos": {"7": {"total", TIPO: n}}}}}
+        O artigo "0" agrupa contribuições cujo artigo não foi identificado.
+    """
+    contadores = (await contador_service.obter_contadores(
+        db, [DimensoesContador.APROVADAS_ARTIGO]
+    )).get(DimensoesContador.APROVADAS_ARTIGO, {})
+
+    documentos = {
+        documento.value: {"total": 0, "artigos": {}}
+        for documento in DocumentoConsulta
+    }
+
+    itens = []
+    for valor, total in contadores.items():
+        if total <= 0:
+            continue
+        documento, artigo_numero, tipo = valor.split(":")
+        itens.append((documento, int(artigo_numero), tipo, total))
+
+    for documento, artigo_numero, tipo, total in sorted(itens):
+        dados_documento = documentos.setdefault(documento, {"total": 0, "artigos": {}})
+        artigo = dados_documento["artigos"].setdefault(str(artigo_numero), {"total": 0})
+        artigo[tipo] = total
+        artigo["total"] += total
+        dados_documento["total"] += total
+
+    return {"documentos": documentos}
+
+
+async def contar_contribuicoes_publicas(
+    db: AsyncSession,
+    documento: Optional[DocumentoConsulta] = None,
+    filtro: Optional[FiltroDispositivo] = None
 ) -> int:
-    """Conta total de contribuições públicas"""
+    """
+    Conta total de contribuições públicas
+
+    Sem filtro de localização, o total é lido dos contadores agregados;
+    com filtro, é contado no banco com as mesmas condições da listagem.
+    """
+    if filtro is None or filtro == FiltroDispositivo():
+        return await contador_service.obter_contador(
+            db,
+            DimensoesContador.APROVADAS_DOCUMENTO,
+            documento
+        )
+
     query = select(func.count(Contribuicao.id)).where(
-        Contribuicao.status_moderacao == StatusModeracao.APROVADA  # MODIFICADO: Apenas aprovadas
+        Contribuicao.status_moderacao == StatusModeracao.APROVADA
     )
 
     if documento:
         query = query.where(Contribuicao.documento == documento)
 
+    query = filtrar_por_dispositivo(query, filtro)
+
     result = await db.execute(query)
-    return result.scalar()
+    return result.scalar() or 0
@@ -2,7 +2,7 @@
 Service para dashboard administrativo e estatísticas
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import select, func, desc
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 from collections import defaultdict
@@ -10,12 +10,18 @@ from collections import defaultdict
 from ..models.contribuicao import Contribuicao, StatusModeracao, TipoContribuicao, DocumentoConsulta
 from ..models.participante import Participante, TipoParticipante
 from ..models.protocolo import Protocolo
+from . import contador_service, rollup_service
+from .contador_service import DimensoesContador
 
 
 async def obter_estatisticas_gerais(db: AsyncSession) -> Dict[str, Any]:
     """
     Retorna estatísticas gerais do sistema
 
+    Totais por status/tipo/documento, participantes e protocolos são lidos
+    dos contadores agregados (uma consulta). Apenas as janelas de 24h/48h
+    são calculadas sobre a tabela de contribuições, com FILTER (WHERE ...).
+
     Args:
         db: Sessão do banco
 
@@ -24,102 +30,65 @@ async def obter_estatisticas_gerais(db: AsyncSession) -> Dict[str, Any]:
     """
     stats = {}
 
+    contadores = await contador_service.obter_contadores(db)
+    por_status = contadores.get(DimensoesContador.CONTRIBUICOES_STATUS, {})
+    aprovadas_tipo = contadores.get(DimensoesContador.APROVADAS_TIPO, {})
+    aprovadas_documento = contadores.get(DimensoesContador.APROVADAS_DOCUMENTO, {})
+    participantes_tipo = contadores.get(DimensoesContador.PARTICIPANTES_TIPO, {})
+    protocolos_documento = contadores.get(DimensoesContador.PROTOCOLOS_DOCUMENTO, {})
+
     # === CONTRIBUIÇÕES ===
 
-    # Total de contribuições
-    result_total = await db.execute(
-        select(func.count(Contribuicao.id))
-    )
-    stats["total_contribuicoes"] = result_total.scalar() or 0
+    stats["total_contribuicoes"] = sum(por_status.values())
 
     # Por status de moderação
     for status in StatusModeracao:
-        result = await db.execute(
-            select(func.count(Contribuicao.id)).where(
-                Contribuicao.status_moderacao == status
-            )
-        )
-        stats[f"contribuicoes_{status.value.lower()}"] = result.scalar() or 0
-
-    # Por tipo de contribuição
-    stats["por_tipo"] = {}
-    for tipo in TipoContribuicao:
-        result = await db.execute(
-            select(func.count(Contribuicao.id)).where(
-                and_(
-                    Contribuicao.tipo == tipo,
-                    Contribuicao.status_moderacao == StatusModeracao.APROVADA
-                )
-            )
-        )
-        stats["por_tipo"][tipo.value] = result.scalar() or 0
-
-    # Por documento
-    stats["por_documento"] = {}
-    for doc in DocumentoConsulta:
-        result = await db.execute(
-            select(func.count(Contribuicao.id)).where(
-                and_(
-                    Contribuicao.documento == doc,
-                    Contribuicao.status_moderacao == StatusModeracao.APROVADA
-                )
-            )
-        )
-        stats["por_documento"][doc.value] = result.scalar() or 0
+        stats[f"contribuicoes_{status.value.lower()}"] = por_status.get(status.value, 0)
 
-    # === PARTICIPANTES ===
+    # Por tipo de contribuição (apenas aprovadas)
+    stats["por_tipo"] = {
+        tipo.value: aprovadas_tipo.get(tipo.value, 0)
+        for tipo in TipoContribuicao
+    }
 
-    # Total de participantes
-    result_participantes = await db.execute(
-        select(func.count(Participante.id))
-    )
-    stats["total_participantes"] = result_participantes.scalar() or 0
+    # Por documento (apenas aprovadas)
+    stats["por_documento"] = {
+        doc.value: aprovadas_documento.get(doc.value, 0)
+        for doc in DocumentoConsulta
+    }
 
-    # Participantes por tipo
-    stats["participantes_pf"] = 0
-    stats["participantes_pj"] = 0
+    # === PARTICIPANTES ===
 
-    for tipo in TipoParticipante:
-        result = await db.execute(
-            select(func.count(Participante.id)).where(
-                Participante.tipo == tipo
-            )
-        )
-        if tipo == TipoParticipante.PESSOA_FISICA:
-            stats["participantes_pf"] = result.scalar() or 0
-        else:
-            stats["participantes_pj"] = result.scalar() or 0
+    stats["total_participantes"] = sum(participantes_tipo.values())
+    stats["participantes_pf"] = participantes_tipo.get(TipoParticipante.PESSOA_FISICA.value, 0)
+    stats["participantes_pj"] = participantes_tipo.get(TipoParticipante.PESSOA_JURIDICA.value, 0)
 
     # === PROTOCOLOS ===
 
-    # Total de protocolos
-    result_protocolos = await db.execute(
-        select(func.count(Protocolo.id))
-    )
-    stats["total_protocolos"] = result_protocolos.scalar() or 0
+    stats["total_protocolos"] = sum(protocolos_documento.values())
 
     # === TEMPO REAL (últimas 24h) ===
 
-    ontem = datetime.utcnow() - timedelta(days=1)
+    agora = datetime.utcnow()
+    ontem = agora - timedelta(days=1)
+    anteontem = agora - timedelta(days=2)
 
-    result_24h = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.criado_em >= ontem
-        )
+    result_janelas = await db.execute(
+        select(
+            func.count(Contribuicao.id).filter(
+                Contribuicao.criado_em >= ontem
+            ).label("ultimas_24h"),
+            func.count(Contribuicao.id).filter(
+                Contribuicao.criado_em < ontem
+            ).label("anteriores_24h")
+        ).where(Contribuicao.criado_em >= anteontem)
     )
-    stats["contribuicoes_24h"] = result_24h.scalar() or 0
+    janelas = result_janelas.one()
+
+    stats["contribuicoes_24h"] = janelas.ultimas_24h or 0
 
     # Taxa de crescimento (últimas 24h vs anterior)
-    anteontem = datetime.utcnow() - timedelta(days=2)
-    result_anterior = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            and_(
-                Contribuicao.criado_em >= anteontem,
-                Contribuicao.criado_em < ontem
-            )
-        )
-    )
-    contrib_anterior = result_anterior.scalar() or 0
+    contrib_anterior = janelas.anteriores_24h or 0
 
     if contrib_anterior > 0:
         taxa = ((stats["contribuicoes_24h"] - contrib_anterior) / contrib_anterior) * 100
@@ -135,7 +104,9 @@ async def obter_contribuicoes_por_uf(
     limit: int = 27
 ) -> List[Dict[str, Any]]:
     """
-    Retorna contribuições agrupadas por UF (top N)
+    Retorna contribuições aprovadas agrupadas por UF (top N)
+
+    Lê a consolidação diária (dias selados + dia corrente ao vivo).
 
     Args:
         db: Sessão do banco
@@ -144,19 +115,22 @@ async def obter_contribuicoes_por_uf(
     Returns:
         Lista de dicts com {uf, total}
     """
+    await rollup_service.selar_dias_pendentes(db)
+    rollup = rollup_service.fonte_rollup()
+
     result = await db.execute(
         select(
-            Participante.uf,
-            func.count(Contribuicao.id).label("total")
+            rollup.c.uf,
+            func.sum(rollup.c.total).label("total")
         )
-        .join(Contribuicao, Contribuicao.participante_id == Participante.id)
-        .where(Contribuicao.status_moderacao == StatusModeracao.APROVADA)
-        .group_by(Participante.uf)
+        .where(rollup.c.status_moderacao == StatusModeracao.APROVADA)
+        .group_by(rollup.c.uf)
+        .having(func.sum(rollup.c.total) > 0)
         .order_by(desc("total"))
         .limit(limit)
     )
 
-    return [{"uf": row.uf, "total": row.total} for row in result.all()]
+    return [{"uf": row.uf, "total": int(row.total)} for row in result.all()]
 
 
 async def obter_contribuicoes_por_periodo(
@@ -166,6 +140,9 @@ async def obter_contribuicoes_por_periodo(
     """
     Retorna contribuições agrupadas por dia (últimos N dias)
 
+    Dias no horário de Brasília (settings.TIMEZONE), lidos da consolidação
+    diária; apenas o dia corrente é calculado ao vivo.
+
     Args:
         db: Sessão do banco
         dias: Quantidade de dias
@@ -173,32 +150,30 @@ async def obter_contribuicoes_por_periodo(
     Returns:
         Lista de dicts com {data, total}
     """
-    data_inicio = datetime.utcnow() - timedelta(days=dias)
+    hoje = rollup_service.hoje_brasilia()
+    dia_inicio = hoje - timedelta(days=dias - 1)
+
+    await rollup_service.selar_dias_pendentes(db)
+    rollup = rollup_service.fonte_rollup(dia_inicio)
 
     result = await db.execute(
         select(
-            func.date(Contribuicao.criado_em).label("data"),
-            func.count(Contribuicao.id).label("total")
+            rollup.c.dia,
+            func.sum(rollup.c.total).label("total")
         )
-        .where(Contribuicao.criado_em >= data_inicio)
-        .group_by(func.date(Contribuicao.criado_em))
-        .order_by("data")
+        .group_by(rollup.c.dia)
     )
 
     # Converte para dict
-    dados = {}
-    for row in result.all():
-        data_str = row.data.strftime("%Y-%m-%d") if row.data else ""
-        dados[data_str] = row.total
+    dados = {row.dia: int(row.total) for row in result.all()}
 
     # Preenche dias sem contribuição com 0
     resultado = []
     for i in range(dias):
-        data = (datetime.utcnow() - timedelta(days=dias - i - 1)).date()
-        data_str = data.strftime("%Y-%m-%d")
+        data = dia_inicio + timedelta(days=i)
         resultado.append({
-            "data": data_str,
-            "total": dados.get(data_str, 0)
+            "data": data.strftime("%Y-%m-%d"),
+            "total": dados.get(data, 0)
         })
 
     return resultado
@@ -230,6 +205,9 @@ async def obter_metricas_tempo_real(db: AsyncSession) -> Dict[str, Any]:
     """
     Retorna métricas em tempo real para dashboard
 
+    Janelas de hoje, 7 e 30 dias (dias de Brasília, incluindo hoje) vêm da
+    consolidação diária; pendentes vêm dos contadores agregados.
+
     Args:
         db: Sessão do banco
 
@@ -237,43 +215,37 @@ async def obter_metricas_tempo_real(db: AsyncSession) -> Dict[str, Any]:
         Dict com métricas
     """
     agora = datetime.utcnow()
-    hoje_inicio = agora.replace(hour=0, minute=0, second=0, microsecond=0)
     semana_atras = agora - timedelta(days=7)
     mes_atras = agora - timedelta(days=30)
 
+    hoje = rollup_service.hoje_brasilia()
+    inicio_semana = hoje - timedelta(days=6)
+    inicio_mes = hoje - timedelta(days=29)
+
     metrics = {}
 
     # Contribuições pendentes (requer ação)
-    result_pendentes = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.status_moderacao == StatusModeracao.PENDENTE
-        )
+    metrics["pendentes_moderacao"] = await contador_service.obter_contador(
+        db,
+        DimensoesContador.CONTRIBUICOES_STATUS,
+        StatusModeracao.PENDENTE
     )
-    metrics["pendentes_moderacao"] = result_pendentes.scalar() or 0
 
-    # Contribuições hoje
-    result_hoje = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.criado_em >= hoje_inicio
-        )
-    )
-    metrics["contribuicoes_hoje"] = result_hoje.scalar() or 0
+    # Contribuições hoje, esta semana e este mês
+    await rollup_service.selar_dias_pendentes(db)
+    rollup = rollup_service.fonte_rollup(inicio_mes)
 
-    # Contribuições esta semana
-    result_semana = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.criado_em >= semana_atras
-        )
-    )
-    metrics["contribuicoes_semana"] = result_semana.scalar() or 0
-
-    # Contribuições este mês
-    result_mes = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.criado_em >= mes_atras
+    result_janelas = await db.execute(
+        select(
+            func.coalesce(func.sum(rollup.c.total).filter(rollup.c.dia >= hoje), 0).label("hoje"),
+            func.coalesce(func.sum(rollup.c.total).filter(rollup.c.dia >= inicio_semana), 0).label("semana"),
+            func.coalesce(func.sum(rollup.c.total), 0).label("mes")
         )
     )
-    metrics["contribuicoes_mes"] = result_mes.scalar() or 0
+    janelas = result_janelas.one()
+    metrics["contribuicoes_hoje"] = int(janelas.hoje)
+    metrics["contribuicoes_semana"] = int(janelas.semana)
+    metrics["contribuicoes_mes"] = int(janelas.mes)
 
     # Participantes únicos este mês
     result_participantes = await db.execute(
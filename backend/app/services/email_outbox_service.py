@@ -0,0 +1,291 @@
+"""
+Service da caixa de saída de emails (outbox)
+
+Emails são gravados na transação que os origina e enviados por um worker
+em segundo plano, fora do caminho da requisição.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.email_outbox import EmailOutbox, StatusEmail, TiposEmail
+from ..models.participante import Participante
+from ..models.protocolo import Protocolo
+from . import protocolo_service
+from .email_service import email_service
+
+logger = logging.getLogger(__name__)
+
+
+async def enfileirar_email_protocolo(
+    db: AsyncSession,
+    protocolo: Protocolo,
+    participante: Participante
+) -> EmailOutbox:
+    """
+    Enfileira o email de confirmação de protocolo
+
+    Deve ser chamado na mesma transação que cria o protocolo.
+
+    Args:
+        db: Sessão do banco
+        protocolo: Protocolo criado
+        participante: Participante do protocolo
+
+    Returns:
+        Item da caixa de saída
+    """
+    item = EmailOutbox(
+        tipo=TiposEmail.PROTOCOLO,
+        protocolo_id=protocolo.id,
+        payload={
+            "email_criptografado": participante.email_criptografado,
+            "numero_protocolo": protocolo.numero_protocolo,
+            "documento": protocolo.documento,
+            "nome_participante": participante.nome_publico,
+            "total_contribuicoes": protocolo.total_contribuicoes,
+            "data_submissao": protocolo.criado_em_brasilia.isoformat()
+        }
+    )
+    db.add(item)
+    return item
+
+
+async def reivindicar_lote(
+    db: AsyncSession,
+    limite: int
+) -> List[EmailOutbox]:
+    """
+    Reserva emails pendentes cujo horário de tentativa já chegou
+
+    FOR UPDATE SKIP LOCKED permite vários workers em paralelo sem disputa.
+    A reserva adia a próxima tentativa pelo prazo de concessão: se o worker
+    cair durante o envio, o email volta à fila quando o prazo expirar.
+
+    Args:
+        db: Sessão do banco
+        limite: Máximo de emails
+
+    Returns:
+        Emails reservados
+    """
+    agora = datetime.utcnow()
+
+    candidatos = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status == StatusEmail.PENDENTE,
+            EmailOutbox.proxima_tentativa_em <= agora
+        )
+        .order_by(EmailOutbox.proxima_tentativa_em)
+        .limit(limite)
+        .with_for_update(skip_locked=True)
+    )
+
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(candidatos))
+        .values(
+            proxima_tentativa_em=agora + timedelta(seconds=settings.EMAIL_OUTBOX_CONCESSAO_SEGUNDOS)
+        )
+        .returning(EmailOutbox),
+        execution_options={"populate_existing": True}
+    )
+    return list(result.scalars().all())
+
+
+def calcular_atraso(tentativas: int) -> float:
+    """
+    Backoff exponencial (com variação aleatória de ±10%)
+
+    Args:
+        tentativas: Tentativas já realizadas (>= 1)
+
+    Returns:
+        Atraso em segundos até a próxima tentativa
+    """
+    atraso = min(
+        settings.EMAIL_OUTBOX_BACKOFF_BASE_SEGUNDOS * 2 ** (tentativas - 1),
+        settings.EMAIL_OUTBOX_BACKOFF_MAX_SEGUNDOS
+    )
+    return atraso * random.uniform(0.9, 1.1)
+
+
+async def registrar_sucesso(db: AsyncSession, item: EmailOutbox) -> None:
+    """Marca o email como enviado (e o protocolo vinculado)"""
+    agora = datetime.utcnow()
+
+    await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == item.id)
+        .values(
+            status=StatusEmail.ENVIADO,
+            tentativas=item.tentativas + 1,
+            enviado_em=agora,
+            ultimo_erro=None
+        )
+    )
+
+    if item.protocolo_id:
+        await protocolo_service.marcar_email_enviado(db, item.protocolo_id)
+
+
+async def registrar_falha(db: AsyncSession, item: EmailOutbox, erro: str) -> None:
+    """
+    Registra falha de envio: agenda nova tentativa ou move para FALHOU
+
+    Args:
+        db: Sessão do banco
+        item: Email que falhou
+        erro: Descrição do erro
+    """
+    tentativas = item.tentativas + 1
+    valores = {"tentativas": tentativas, "ultimo_erro": erro[:2000]}
+
+    if tentativas >= settings.EMAIL_OUTBOX_MAX_TENTATIVAS:
+        # Dead letter: permanece na tabela para análise/reenvio manual
+        valores["status"] = StatusEmail.FALHOU
+        logger.error(f"Email #{item.id} ({item.tipo}) falhou após {tentativas} tentativas: {erro}")
+    else:
+        valores["proxima_tentativa_em"] = datetime.utcnow() + timedelta(
+            seconds=calcular_atraso(tentativas)
+        )
+
+    await db.execute(
+        update(EmailOutbox).where(EmailOutbox.id == item.id).values(**valores)
+    )
+
+
+async def _enviar_protocolo(payload: dict) -> None:
+    await email_service.enviar_email_protocolo(
+        email_criptografado=payload["email_criptografado"],
+        numero_protocolo=payload["numero_protocolo"],
+        documento=payload["documento"],
+        nome_participante=payload["nome_participante"],
+        total_contribuicoes=payload["total_contribuicoes"],
+        data_submissao=datetime.fromisoformat(payload["data_submissao"]),
+        contribuicoes=[]
+    )
+
+
+async def _enviar_resultado_moderacao(payload: dict) -> None:
+    await email_service.enviar_email_resultado_moderacao(**payload)
+
+
+async def _enviar_consulta_encerrada(payload: dict) -> None:
+    await email_service.enviar_email_consulta_encerrada(
+        **{**payload, "data_encerramento": datetime.fromisoformat(payload["data_encerramento"])}
+    )
+
+
+# Função de envio por tipo de email
+_ENVIOS: Dict[str, Callable[[dict], Awaitable[None]]] = {
+    TiposEmail.PROTOCOLO: _enviar_protocolo,
+    TiposEmail.RESULTADO_MODERACAO: _enviar_resultado_moderacao,
+    TiposEmail.CONSULTA_ENCERRADA: _enviar_consulta_encerrada,
+}
+
+
+async def enviar(item: EmailOutbox) -> None:
+    """
+    Envia um email da caixa de saída
+
+    Raises:
+        Exception: Se o envio falhar (a causa original, ex.: erro SMTP,
+            é gravada em ultimo_erro)
+    """
+    envio = _ENVIOS.get(item.tipo)
+    if envio is None:
+        raise ValueError(f"Tipo de email desconhecido: {item.tipo}")
+
+    await envio(item.payload)
+
+
+class ProcessadorEmailOutbox:
+    """
+    Worker em segundo plano que esvazia a caixa de saída
+
+    Processa lotes enquanto houver emails prontos; quando a fila esvazia,
+    aguarda o intervalo de verificação ou um aviso de novo email (acordar).
+    """
+
+    def __init__(self):
+        self._tarefa: Optional[asyncio.Task] = None
+        self._aviso = asyncio.Event()
+
+    def iniciar(self) -> None:
+        """Inicia o worker em segundo plano"""
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self) -> None:
+        """Encerra o worker"""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def acordar(self) -> None:
+        """Avisa que há email novo (evita esperar o intervalo)"""
+        self._aviso.set()
+
+    async def processar_lote(self) -> int:
+        """
+        Reserva e envia um lote de emails
+
+        Returns:
+            Quantidade de emails processados
+        """
+        async with AsyncSessionLocal() as db:
+            itens = await reivindicar_lote(db, settings.EMAIL_OUTBOX_TAMANHO_LOTE)
+            await db.commit()
+
+            # Envio concorrente, limitado pelo pool SMTP e pela taxa máxima
+            resultados = await asyncio.gather(
+                *(enviar(item) for item in itens),
+                return_exceptions=True
+            )
+
+            for item, resultado in zip(itens, resultados):
+                if isinstance(resultado, Exception):
+                    logger.warning(f"Falha ao enviar email #{item.id} ({item.tipo}): {resultado}")
+                    await registrar_falha(db, item, f"{type(resultado).__name__}: {resultado}")
+                else:
+                    await registrar_sucesso(db, item)
+            await db.commit()
+
+            return len(itens)
+
+    async def _executar(self) -> None:
+        while True:
+            self._aviso.clear()
+            try:
+                processados = await self.processar_lote()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Erro no processamento da caixa de saída de emails")
+                processados = 0
+
+            if processados < settings.EMAIL_OUTBOX_TAMANHO_LOTE:
+                try:
+                    await asyncio.wait_for(
+                        self._aviso.wait(),
+                        timeout=settings.EMAIL_OUTBOX_INTERVALO_SEGUNDOS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+
+# Instância global (iniciada no startup da aplicação)
+processador_email_outbox = ProcessadorEmailOutbox()
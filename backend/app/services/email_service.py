@@ -2,22 +2,177 @@
 Serviço de Envio de Emails
 """
 import aiosmtplib
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
-from typing import Optional, List, Dict, Any
+from pathlib import Path
+from typing import AsyncIterator, Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import logging
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
 from ..core.config import settings
-from ..utils.security import descriptografar_dados
+from ..utils.security import crypto_async
 
 logger = logging.getLogger(__name__)
 
+# Templates por evento: {evento}.html e {evento}.txt
+DIRETORIO_TEMPLATES = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+# Carregados e compilados uma vez por processo (cache em memória do Environment,
+# sem verificar alterações nos arquivos); o bytecode em disco evita recompilar
+# a cada reinício. Autoescape apenas nos templates HTML.
+templates_email = Environment(
+    loader=FileSystemLoader(DIRETORIO_TEMPLATES),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+
+NOMES_DOCUMENTOS = {
+    "CEO": "Código de Ética Odontológica (CEO)",
+    "CPEO": "Código de Processo Ético Odontológico (CPEO)"
+}
+
+
+class PoolSMTP:
+    """
+    Pool de conexões SMTP autenticadas e persistentes
+
+    Conexões ociosas são reutilizadas (a mais recente primeiro). Uma conexão
+    ociosa há mais de SMTP_VERIFICACAO_SEGUNDOS é verificada com NOOP antes
+    do uso; ociosa há mais de SMTP_POOL_OCIOSO_SEGUNDOS é encerrada.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        usuario: str,
+        senha: str,
+        tamanho: int,
+        ocioso_max: float,
+        verificar_apos: float,
+        timeout: float
+    ):
+        self._hostname = hostname
+        self._port = port
+        self._usuario = usuario
+        self._senha = senha
+        self._ocioso_max = ocioso_max
+        self._verificar_apos = verificar_apos
+        self._timeout = timeout
+        self._vagas = asyncio.Semaphore(tamanho)
+        self._ociosas: List[Tuple[aiosmtplib.SMTP, float]] = []  # (conexão, último uso)
+
+    async def _conectar(self) -> aiosmtplib.SMTP:
+        """Abre e autentica uma nova conexão"""
+        # Porta 465: TLS implícito; porta 587: STARTTLS obrigatório;
+        # demais portas: STARTTLS sempre que o servidor oferecer (None)
+        smtp = aiosmtplib.SMTP(
+            hostname=self._hostname,
+            port=self._port,
+            use_tls=self._port == 465,
+            start_tls=True if self._port == 587 else None,
+            timeout=self._timeout
+        )
+        await smtp.connect()
+
+        if self._usuario and self._senha:
+            await smtp.login(self._usuario, self._senha)
+
+        return smtp
+
+    @staticmethod
+    async def _fechar(smtp: aiosmtplib.SMTP) -> None:
+        """Encerra a conexão sem propagar erros"""
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def _obter_ociosa(self) -> Optional[aiosmtplib.SMTP]:
+        """Retira do pool uma conexão ociosa ainda saudável"""
+        while self._ociosas:
+            smtp, ultimo_uso = self._ociosas.pop()
+            ocioso = time.monotonic() - ultimo_uso
+
+            if ocioso > self._ocioso_max or not smtp.is_connected:
+                await self._fechar(smtp)
+                continue
+
+            if ocioso > self._verificar_apos:
+                try:
+                    await smtp.noop()
+                except Exception:
+                    await self._fechar(smtp)
+                    continue
+
+            return smtp
+
+        return None
+
+    @asynccontextmanager
+    async def conexao(self, nova: bool = False) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Empresta uma conexão do pool
+
+        A conexão volta ao pool ao final; se ocorrer erro durante o uso,
+        é descartada (a próxima requisição abre uma nova).
+
+        Args:
+            nova: Abre uma nova conexão em vez de reutilizar uma ociosa
+        """
+        async with self._vagas:
+            if nova:
+                smtp = await self._conectar()
+            else:
+                smtp = await self._obter_ociosa() or await self._conectar()
+            try:
+                yield smtp
+            except BaseException:
+                await self._fechar(smtp)
+                raise
+            self._ociosas.append((smtp, time.monotonic()))
+
+    async def fechar(self) -> None:
+        """Encerra todas as conexões ociosas"""
+        while self._ociosas:
+            smtp, _ = self._ociosas.pop()
+            await self._fechar(smtp)
+
+
+class LimitadorTaxa:
+    """Espaça operações para no máximo `por_segundo` por segundo (0 = sem limite)"""
+
+    def __init__(self, por_segundo: float):
+        self._intervalo = 1 / por_segundo if por_segundo > 0 else 0
+        self._proximo = 0.0
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self) -> None:
+        """Aguarda a vez da próxima operação"""
+        if not self._intervalo:
+            return
+
+        async with self._lock:
+            agora = time.monotonic()
+            espera = self._proximo - agora
+            self._proximo = max(agora, self._proximo) + self._intervalo
+
+        if espera > 0:
+            await asyncio.sleep(espera)
+
 
 class EmailService:
-    """Serviço para envio de emails via SMTP"""
+    """Serviço para envio de emails via SMTP (com pool de conexões)"""
 
     def __init__(self):
         self.smtp_host = settings.SMTP_HOST
@@ -25,6 +180,72 @@ class EmailService:
         self.smtp_user = settings.SMTP_USER
         self.smtp_password = settings.SMTP_PASSWORD
         self.smtp_from = settings.SMTP_FROM
+        self._pool = PoolSMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            usuario=self.smtp_user,
+            senha=self.smtp_password,
+            tamanho=settings.SMTP_POOL_TAMANHO,
+            ocioso_max=settings.SMTP_POOL_OCIOSO_SEGUNDOS,
+            verificar_apos=settings.SMTP_POOL_VERIFICACAO_SEGUNDOS,
+            timeout=settings.SMTP_TIMEOUT_SEGUNDOS
+        )
+        self._limitador = LimitadorTaxa(settings.SMTP_MAX_MENSAGENS_POR_SEGUNDO)
+
+    def _montar_mensagem(
+        self,
+        destinatario: str,
+        assunto: str,
+        corpo_html: str,
+        corpo_texto: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Monta a mensagem MIME (texto simples + HTML)"""
+        mensagem = MIMEMultipart("alternative")
+        mensagem["Subject"] = Header(assunto, "utf-8")
+        mensagem["From"] = self.smtp_from
+        mensagem["To"] = destinatario
+        mensagem["X-Mailer"] = f"{settings.APP_NAME} v{settings.APP_VERSION}"
+
+        # Adiciona corpo em texto simples (fallback)
+        if not corpo_texto:
+            # Gera texto simples a partir do HTML
+            corpo_texto = re.sub(r'<[^>]+>', '', corpo_html).replace('&nbsp;', ' ')
+        mensagem.attach(MIMEText(corpo_texto, "plain", "utf-8"))
+
+        # Adiciona corpo HTML
+        mensagem.attach(MIMEText(corpo_html, "html", "utf-8"))
+
+        return mensagem
+
+    async def _enviar_mensagem(self, mensagem: MIMEMultipart) -> None:
+        """
+        Envia uma mensagem por uma conexão do pool
+
+        Se a conexão reutilizada tiver sido encerrada pelo servidor, tenta
+        uma vez com uma conexão recém-aberta: as demais ociosas podem ter
+        sido encerradas da mesma forma.
+        """
+        await self._limitador.aguardar()
+
+        try:
+            async with self._pool.conexao() as smtp:
+                await smtp.send_message(mensagem)
+        except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+            async with self._pool.conexao(nova=True) as smtp:
+                await smtp.send_message(mensagem)
+
+    async def _enviar(
+        self,
+        destinatario: str,
+        assunto: str,
+        corpo_html: str,
+        corpo_texto: Optional[str] = None
+    ) -> None:
+        """Monta e envia o email; erros de SMTP são propagados ao chamador"""
+        mensagem = self._montar_mensagem(destinatario, assunto, corpo_html, corpo_texto)
+        await self._enviar_mensagem(mensagem)
+
+        logger.info(f"Email enviado com sucesso para {destinatario}")
 
     async def enviar_email(
         self,
@@ -46,58 +267,53 @@ class EmailService:
             True se enviado com sucesso, False caso contrário
         """
         try:
-            # Cria mensagem
-            mensagem = MIMEMultipart("alternative")
-            mensagem["Subject"] = Header(assunto, "utf-8")
-            mensagem["From"] = self.smtp_from
-            mensagem["To"] = destinatario
-            mensagem["X-Mailer"] = f"{settings.APP_NAME} v{settings.APP_VERSION}"
-
-            # Adiciona corpo em texto simples (fallback)
-            if corpo_texto:
-                parte_texto = MIMEText(corpo_texto, "plain", "utf-8")
-                mensagem.attach(parte_texto)
-            else:
-                # Gera texto simples a partir do HTML
-                import re
-                texto_simples = re.sub(r'<[^>]+>', '', corpo_html)
-                texto_simples = texto_simples.replace('&nbsp;', ' ')
-                parte_texto = MIMEText(texto_simples, "plain", "utf-8")
-                mensagem.attach(parte_texto)
-
-            # Adiciona corpo HTML
-            parte_html = MIMEText(corpo_html, "html", "utf-8")
-            mensagem.attach(parte_html)
-
-            # Determina se usa TLS ou SSL
-            use_tls = self.smtp_port == 587
-            use_ssl = self.smtp_port == 465
-
-            # Conecta e envia email
-            smtp = aiosmtplib.SMTP(
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                use_tls=use_ssl
-            )
-            
-            await smtp.connect()
-            
-            if use_tls and not use_ssl:
-                await smtp.starttls()
-            
-            if self.smtp_user and self.smtp_password:
-                await smtp.login(self.smtp_user, self.smtp_password)
-            
-            await smtp.send_message(mensagem)
-            await smtp.quit()
-
-            logger.info(f"Email enviado com sucesso para {destinatario}")
+            await self._enviar(destinatario, assunto, corpo_html, corpo_texto)
             return True
 
         except Exception as e:
             logger.error(f"Erro ao enviar email para {destinatario}: {str(e)}")
             return False
 
+    async def enviar_em_lote(
+        self,
+        emails: List[Dict[str, Any]]
+    ) -> List[bool]:
+        """
+        Envia vários emails usando todas as conexões do pool
+
+        Cada conexão envia várias mensagens em sequência, sem novo handshake;
+        o total respeita SMTP_MAX_MENSAGENS_POR_SEGUNDO.
+
+        Args:
+            emails: Lista de dicts com os argumentos de enviar_email
+                (destinatario, assunto, corpo_html e opcionalmente corpo_texto)
+
+        Returns:
+            Resultado de cada envio, na mesma ordem
+        """
+        return list(await asyncio.gather(
+            *(self.enviar_email(**email) for email in emails)
+        ))
+
+    async def fechar(self) -> None:
+        """Encerra as conexões SMTP do pool"""
+        await self._pool.fechar()
+
+    def _renderizar(self, template: str, **contexto: Any) -> Tuple[str, str]:
+        """
+        Renderiza as versões HTML e texto simples de um email
+
+        Args:
+            template: Nome do evento (arquivos {template}.html e {template}.txt)
+            **contexto: Variáveis do template
+
+        Returns:
+            Tupla (corpo_html, corpo_texto)
+        """
+        corpo_html = templates_email.get_template(f"{template}.html").render(**contexto)
+        corpo_texto = templates_email.get_template(f"{template}.txt").render(**contexto)
+        return corpo_html, corpo_texto
+
     async def enviar_email_protocolo(
         self,
         email_criptografado: str,
@@ -108,7 +324,7 @@ class EmailService:
         data_submissao: datetime,
         contribuicoes: List[Dict[str, Any]],
         public_url: Optional[str] = None
-    ) -> bool:
+    ) -> None:
         """
         Envia email de confirmação de protocolo
 
@@ -122,246 +338,128 @@ class EmailService:
             contribuicoes: Lista de contribuições
             public_url: URL pública do sistema (opcional)
 
-        Returns:
-            True se enviado com sucesso, False caso contrário
+        Raises:
+            Exception: Se a descriptografia, a renderização ou o envio falharem
         """
-        try:
-            # Descriptografa email
-            email_destinatario = descriptografar_dados(email_criptografado)
-
-            # Nome do documento
-            nome_documento = "Código de Ética Odontológica (CEO)" if documento == "CEO" else "Código de Processo Ético Odontológico (CPEO)"
-
-            # Formata data
-            data_formatada = data_submissao.strftime("%d/%m/%Y às %H:%M")
+        # Descriptografa email
+        email_destinatario = await crypto_async.decrypt(email_criptografado)
 
-            # URL para consulta do protocolo
-            url_protocolo = f"{public_url or settings.PUBLIC_URL}/protocolos/{numero_protocolo}"
+        corpo_html, corpo_texto = self._renderizar(
+            "protocolo",
+            numero_protocolo=numero_protocolo,
+            nome_documento=NOMES_DOCUMENTOS.get(documento, documento),
+            nome_participante=nome_participante,
+            total_contribuicoes=total_contribuicoes,
+            data_submissao=data_submissao.strftime("%d/%m/%Y às %H:%M"),
+            contribuicoes=contribuicoes,
+            url_protocolo=f"{public_url or settings.PUBLIC_URL}/protocolos/{numero_protocolo}"
+        )
 
-            # Gera HTML do email
-            corpo_html = self._gerar_template_email_protocolo(
-                numero_protocolo=numero_protocolo,
-                nome_documento=nome_documento,
-                nome_participante=nome_participante,
-                total_contribuicoes=total_contribuicoes,
-                data_submissao=data_formatada,
-                contribuicoes=contribuicoes,
-                url_protocolo=url_protocolo
-            )
-
-            # Gera texto simples
-            corpo_texto = self._gerar_texto_simples_protocolo(
-                numero_protocolo=numero_protocolo,
-                nome_documento=nome_documento,
-                nome_participante=nome_participante,
-                total_contribuicoes=total_contribuicoes,
-                data_submissao=data_formatada,
-                url_protocolo=url_protocolo
-            )
-
-            # Assunto
-            assunto = f"Confirmação de Protocolo - {numero_protocolo} - Consulta Pública CFO"
-
-            # Envia email
-            return await self.enviar_email(
-                destinatario=email_destinatario,
-                assunto=assunto,
-                corpo_html=corpo_html,
-                corpo_texto=corpo_texto
-            )
+        # Assunto
+        assunto = f"Confirmação de Protocolo - {numero_protocolo} - Consulta Pública CFO"
 
-        except Exception as e:
-            logger.error(f"Erro ao enviar email de protocolo: {str(e)}")
-            return False
+        # Envia email
+        await self._enviar(
+            destinatario=email_destinatario,
+            assunto=assunto,
+            corpo_html=corpo_html,
+            corpo_texto=corpo_texto
+        )
 
-    def _gerar_template_email_protocolo(
+    async def enviar_email_resultado_moderacao(
         self,
-        numero_protocolo: str,
-        nome_documento: str,
+        email_criptografado: str,
         nome_participante: str,
-        total_contribuicoes: int,
-        data_submissao: str,
-        contribuicoes: List[Dict[str, Any]],
-        url_protocolo: str
-    ) -> str:
-        """Gera template HTML do email de protocolo"""
-        template_html = """
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Confirmação de Protocolo - CFO</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: Arial, sans-serif; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 20px;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <!-- Header -->
-                    <tr>
-                        <td style="background: linear-gradient(135deg, #8D0F12 0%, #A61E22 100%); padding: 30px; text-align: center;">
-                            <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: bold;">
-                                Conselho Federal de Odontologia
-                            </h1>
-                            <p style="color: #ffffff; margin: 10px 0 0 0; font-size: 14px;">
-                                Consulta Pública
-                            </p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Conteúdo Principal -->
-                    <tr>
-                        <td style="padding: 40px 30px;">
-                            <h2 style="color: #8D0F12; margin: 0 0 20px 0; font-size: 20px;">
-                                ✅ Protocolo Gerado com Sucesso!
-                            </h2>
-                            
-                            <p style="color: #333333; font-size: 16px; line-height: 1.6; margin: 0 0 20px 0;">
-                                Prezado(a) <strong>{{ nome_participante }}</strong>,
-                            </p>
-                            
-                            <p style="color: #333333; font-size: 16px; line-height: 1.6; margin: 0 0 20px 0;">
-                                Sua contribuição para a <strong>{{ nome_documento }}</strong> foi recebida e registrada com sucesso!
-                            </p>
-                            
-                            <!-- Box de Protocolo -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f8f9fa; border-left: 4px solid #8D0F12; border-radius: 4px; padding: 20px; margin: 20px 0;">
-                                <tr>
-                                    <td>
-                                        <p style="color: #666666; font-size: 12px; margin: 0 0 5px 0; text-transform: uppercase; letter-spacing: 1px;">
-                                            Número do Protocolo
-                                        </p>
-                                        <p style="color: #8D0F12; font-size: 28px; font-weight: bold; margin: 0; font-family: 'Courier New', monospace;">
-                                            {{ numero_protocolo }}
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Informações -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 20px 0;">
-                                <tr>
-                                    <td style="padding: 10px 0; border-bottom: 1px solid #e0e0e0;">
-                                        <strong style="color: #333333;">Documento:</strong>
-                                        <span style="color: #666666; margin-left: 10px;">{{ nome_documento }}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 10px 0; border-bottom: 1px solid #e0e0e0;">
-                                        <strong style="color: #333333;">Total de Contribuições:</strong>
-                                        <span style="color: #666666; margin-left: 10px;">{{ total_contribuicoes }}</span>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 10px 0;">
-                                        <strong style="color: #333333;">Data e Hora:</strong>
-                                        <span style="color: #666666; margin-left: 10px;">{{ data_submissao }}</span>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Botão de Consulta -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin: 30px 0;">
-                                <tr>
-                                    <td align="center">
-                                        <a href="{{ url_protocolo }}" style="display: inline-block; background-color: #8D0F12; color: #ffffff; text-decoration: none; padding: 15px 30px; border-radius: 5px; font-weight: bold; font-size: 16px;">
-                                            Consultar Protocolo
-                                        </a>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Aviso LGPD -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #fff3cd; border-left: 4px solid #ffc107; border-radius: 4px; padding: 15px; margin: 20px 0;">
-                                <tr>
-                                    <td>
-                                        <p style="color: #856404; font-size: 14px; margin: 0; line-height: 1.6;">
-                                            <strong>🔒 Proteção de Dados (LGPD):</strong><br>
-                                            Seus dados pessoais estão protegidos. Este protocolo pode ser consultado publicamente, mas informações sensíveis como CPF, CNPJ e e-mail não serão divulgadas.
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <p style="color: #666666; font-size: 14px; line-height: 1.6; margin: 30px 0 0 0;">
-                                <strong>Importante:</strong> Guarde este número de protocolo para acompanhar sua contribuição. Você pode consultar o protocolo a qualquer momento através do link acima.
-                            </p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="background-color: #f8f9fa; padding: 20px 30px; text-align: center; border-top: 1px solid #e0e0e0;">
-                            <p style="color: #666666; font-size: 12px; margin: 0 0 10px 0;">
-                                Conselho Federal de Odontologia
-                            </p>
-                            <p style="color: #999999; font-size: 11px; margin: 0;">
-                                Este é um email automático, por favor não responda.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
+        documento: str,
+        artigo: str,
+        aprovada: bool,
+        motivo_rejeicao: Optional[str] = None,
+        numero_protocolo: Optional[str] = None,
+        public_url: Optional[str] = None
+    ) -> None:
         """
-        
-        template = Template(template_html)
-        return template.render(
-            numero_protocolo=numero_protocolo,
-            nome_documento=nome_documento,
+        Envia email com o resultado da moderação de uma contribuição
+
+        Args:
+            email_criptografado: Email criptografado do participante
+            nome_participante: Nome público do participante
+            documento: Documento (CEO ou CPEO)
+            artigo: Artigo da contribuição (ex: Art. 7º)
+            aprovada: True se aprovada, False se rejeitada
+            motivo_rejeicao: Motivo (apenas rejeição)
+            numero_protocolo: Protocolo da contribuição (opcional, gera link)
+            public_url: URL pública do sistema (opcional)
+
+        Raises:
+            Exception: Se a descriptografia, a renderização ou o envio falharem
+        """
+        email_destinatario = await crypto_async.decrypt(email_criptografado)
+
+        url_protocolo = None
+        if numero_protocolo:
+            url_protocolo = f"{public_url or settings.PUBLIC_URL}/protocolos/{numero_protocolo}"
+
+        corpo_html, corpo_texto = self._renderizar(
+            "resultado_moderacao",
             nome_participante=nome_participante,
-            total_contribuicoes=total_contribuicoes,
-            data_submissao=data_submissao,
+            nome_documento=NOMES_DOCUMENTOS.get(documento, documento),
+            artigo=artigo,
+            aprovada=aprovada,
+            motivo_rejeicao=motivo_rejeicao,
+            numero_protocolo=numero_protocolo,
             url_protocolo=url_protocolo
         )
 
-    def _gerar_texto_simples_protocolo(
-        self,
-        numero_protocolo: str,
-        nome_documento: str,
-        nome_participante: str,
-        total_contribuicoes: int,
-        data_submissao: str,
-        url_protocolo: str
-    ) -> str:
-        """Gera versão em texto simples do email"""
-        return f"""
-CONSELHO FEDERAL DE ODONTOLOGIA
-Consulta Pública
+        resultado = "Aprovada" if aprovada else "Não Aprovada"
+        assunto = f"Contribuição {resultado} - {artigo} - Consulta Pública CFO"
 
-PROTOCOLO GERADO COM SUCESSO!
-
-Prezado(a) {nome_participante},
-
-Sua contribuição para a {nome_documento} foi recebida e registrada com sucesso!
+        await self._enviar(
+            destinatario=email_destinatario,
+            assunto=assunto,
+            corpo_html=corpo_html,
+            corpo_texto=corpo_texto
+        )
 
-NÚMERO DO PROTOCOLO: {numero_protocolo}
+    async def enviar_email_consulta_encerrada(
+        self,
+        email_criptografado: str,
+        nome_participante: str,
+        titulo_consulta: str,
+        data_encerramento: datetime,
+        public_url: Optional[str] = None
+    ) -> None:
+        """
+        Envia aviso de encerramento da consulta a um participante
 
-INFORMAÇÕES:
-- Documento: {nome_documento}
-- Total de Contribuições: {total_contribuicoes}
-- Data e Hora: {data_submissao}
+        Args:
+            email_criptografado: Email criptografado do participante
+            nome_participante: Nome público do participante
+            titulo_consulta: Título da consulta pública
+            data_encerramento: Data/hora do encerramento
+            public_url: URL pública do sistema (opcional)
 
-CONSULTAR PROTOCOLO:
-{url_protocolo}
+        Raises:
+            Exception: Se a descriptografia, a renderização ou o envio falharem
+        """
+        email_destinatario = await crypto_async.decrypt(email_criptografado)
 
-IMPORTANTE:
-- Guarde este número de protocolo para acompanhar sua contribuição
-- Você pode consultar o protocolo a qualquer momento através do link acima
+        corpo_html, corpo_texto = self._renderizar(
+            "consulta_encerrada",
+            nome_participante=nome_participante,
+            titulo_consulta=titulo_consulta,
+            data_encerramento=data_encerramento.strftime("%d/%m/%Y às %H:%M"),
+            url_resultados=public_url or settings.PUBLIC_URL
+        )
 
-PROTEÇÃO DE DADOS (LGPD):
-Seus dados pessoais estão protegidos. Este protocolo pode ser consultado publicamente, mas informações sensíveis como CPF, CNPJ e e-mail não serão divulgadas.
+        assunto = f"Consulta Pública Encerrada - {titulo_consulta} - CFO"
 
----
-Conselho Federal de Odontologia
-Este é um email automático, por favor não responda.
-        """.strip()
+        await self._enviar(
+            destinatario=email_destinatario,
+            assunto=assunto,
+            corpo_html=corpo_html,
+            corpo_texto=corpo_texto
+        )
 
 
 # Instância global do serviço
 email_service = EmailService()
-
@@ -0,0 +1,165 @@
+"""
+Service para transmissão de métricas em tempo real (Server-Sent Events)
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from . import dashboard_service, moderacao_service
+
+logger = logging.getLogger(__name__)
+
+
+def _formatar_evento(evento: str, dados: Dict[str, Any]) -> str:
+    """Formata uma mensagem no protocolo SSE"""
+    return f"event: {evento}\ndata: {json.dumps(dados, default=str)}\n\n"
+
+
+def _calcular_delta(
+    anterior: Dict[str, Dict[str, Any]],
+    atual: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Retorna apenas os campos que mudaram entre dois snapshots
+
+    Args:
+        anterior: Snapshot anterior {grupo: {campo: valor}}
+        atual: Snapshot atual
+
+    Returns:
+        Dict {grupo: {campo: novo_valor}} (vazio se nada mudou)
+    """
+    delta = {}
+    for grupo, valores in atual.items():
+        valores_anteriores = anterior.get(grupo, {})
+        alterados = {
+            campo: valor
+            for campo, valor in valores.items()
+            if valores_anteriores.get(campo) != valor
+        }
+        if alterados:
+            delta[grupo] = alterados
+    return delta
+
+
+class TransmissorMetricas:
+    """
+    Produtor único de métricas compartilhado por todos os assinantes
+
+    A cada intervalo as métricas são calculadas uma única vez (uma sessão
+    de banco, independente do número de conexões) e apenas os campos
+    alterados são enviados. Novos assinantes recebem o snapshot completo.
+    O produtor inicia com o primeiro assinante e encerra com o último.
+    """
+
+    def __init__(self, intervalo: float, limite_fila: int):
+        self.intervalo = intervalo
+        self.limite_fila = limite_fila
+        self._assinantes: Set[asyncio.Queue] = set()
+        self._snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+        self._produtor: Optional[asyncio.Task] = None
+
+    @property
+    def total_assinantes(self) -> int:
+        return len(self._assinantes)
+
+    async def _calcular_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Calcula as métricas do dashboard e da moderação em uma sessão"""
+        async with AsyncSessionLocal() as db:
+            metricas = await dashboard_service.obter_metricas_tempo_real(db)
+            moderacao = await moderacao_service.obter_estatisticas_moderacao(db)
+            # Persiste a eventual consolidação de dias feita durante a leitura
+            await db.commit()
+
+        return {"metricas": metricas, "moderacao": moderacao}
+
+    def _enviar(self, fila: asyncio.Queue, mensagem: str) -> None:
+        """
+        Entrega uma mensagem sem bloquear o produtor
+
+        Se o assinante estiver atrasado, as mensagens pendentes são
+        descartadas e substituídas pelo snapshot completo atual.
+        """
+        try:
+            fila.put_nowait(mensagem)
+        except asyncio.QueueFull:
+            while not fila.empty():
+                fila.get_nowait()
+            fila.put_nowait(_formatar_evento("snapshot", self._snapshot))
+
+    async def _produzir(self) -> None:
+        """Loop do produtor: calcula, compara e distribui"""
+        while self._assinantes:
+            try:
+                atual = await self._calcular_snapshot()
+            except Exception:
+                logger.exception("Erro ao calcular métricas em tempo real")
+                atual = None
+
+            if atual is not None:
+                if self._snapshot is None:
+                    self._snapshot = atual
+                    mensagem = _formatar_evento("snapshot", atual)
+                else:
+                    delta = _calcular_delta(self._snapshot, atual)
+                    self._snapshot = atual
+                    # Sem mudanças: comentário SSE mantém a conexão viva
+                    mensagem = _formatar_evento("delta", delta) if delta else ": ping\n\n"
+
+                for fila in list(self._assinantes):
+                    self._enviar(fila, mensagem)
+
+            await asyncio.sleep(self.intervalo)
+
+    def assinar(self) -> asyncio.Queue:
+        """
+        Registra um assinante e garante que o produtor esteja ativo
+
+        Returns:
+            Fila de mensagens SSE do assinante
+        """
+        fila: asyncio.Queue = asyncio.Queue(maxsize=self.limite_fila)
+
+        if self._snapshot is not None:
+            fila.put_nowait(_formatar_evento("snapshot", self._snapshot))
+
+        self._assinantes.add(fila)
+
+        if self._produtor is None or self._produtor.done():
+            self._snapshot = None
+            self._produtor = asyncio.create_task(self._produzir())
+
+        return fila
+
+    def cancelar(self, fila: asyncio.Queue) -> None:
+        """Remove um assinante; o produtor encerra quando não houver nenhum"""
+        self._assinantes.discard(fila)
+
+        if not self._assinantes and self._produtor is not None:
+            self._produtor.cancel()
+            self._produtor = None
+            self._snapshot = None
+
+    async def transmitir(self):
+        """
+        Gerador de mensagens SSE para uma conexão
+
+        Yields:
+            Mensagens no formato text/event-stream
+        """
+        fila = self.assinar()
+        try:
+            yield f"retry: {int(self.intervalo * 1000)}\n\n"
+            while True:
+                yield await fila.get()
+        finally:
+            self.cancelar(fila)
+
+
+transmissor_metricas = TransmissorMetricas(
+    intervalo=settings.METRICAS_STREAM_INTERVALO_SEGUNDOS,
+    limite_fila=settings.METRICAS_STREAM_LIMITE_FILA
+)
@@ -2,14 +2,68 @@
 Service para moderação de contribuições
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, or_
-from typing import List, Optional, Tuple
+from sqlalchemy import select, update, insert, and_, func, or_, any_, bindparam, cast, literal, Integer, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from ..core.config import settings
 from ..models.contribuicao import Contribuicao, StatusModeracao, DocumentoConsulta, TipoContribuicao
 from ..models.historico_moderacao import HistoricoModeracao, AcaoModeracao
 from ..models.participante import Participante
 from ..utils.security import descriptografar_dados
+from . import contador_service, rollup_service
+from .contribuicao_service import filtrar_por_dispositivo
+from ..utils.dispositivo import FiltroDispositivo
+from .contador_service import DimensoesContador
+from ..utils.cache import EventosCache, registrar_evento
+
+
+def _disponivel_para(admin_id: int, agora: datetime):
+    """Condição: contribuição sem reserva ativa de outro moderador"""
+    return or_(
+        Contribuicao.reservado_por_id.is_(None),
+        Contribuicao.reservado_por_id == admin_id,
+        Contribuicao.reservado_ate <= agora
+    )
+
+
+async def _atualizar_se_pendente(
+    db: AsyncSession,
+    contribuicao_id: int,
+    admin_id: int,
+    **valores
+) -> Optional[Contribuicao]:
+    """
+    Modera a contribuição apenas se ainda estiver PENDENTE
+
+    Um único UPDATE ... RETURNING: a verificação de status (e de reserva por
+    outro moderador) e a escrita são atômicas, e a linha atualizada volta na
+    mesma ida ao banco. A reserva da contribuição é liberada.
+
+    Returns:
+        Contribuicao atualizada ou None se não encontrada/já moderada/reservada
+    """
+    agora = datetime.utcnow()
+
+    result = await db.execute(
+        update(Contribuicao)
+        .where(
+            Contribuicao.id == contribuicao_id,
+            Contribuicao.status_moderacao == StatusModeracao.PENDENTE,
+            _disponivel_para(admin_id, agora)
+        )
+        .values(
+            moderado_por_id=admin_id,
+            moderado_em=agora,
+            reservado_por_id=None,
+            reservado_ate=None,
+            **valores
+        )
+        .returning(Contribuicao),
+        execution_options={"populate_existing": True}
+    )
+    return result.scalar_one_or_none()
 
 
 async def aprovar_contribuicao(
@@ -26,24 +80,21 @@ async def aprovar_contribuicao(
         admin_id: ID do admin que está aprovando
 
     Returns:
-        Contribuicao aprovada ou None se não encontrada/já moderada
+        Contribuicao aprovada ou None se não encontrada/já moderada/reservada
     """
-    contribuicao = await db.get(Contribuicao, contribuicao_id)
+    # Só pode aprovar se estiver PENDENTE
+    contribuicao = await _atualizar_se_pendente(
+        db,
+        contribuicao_id,
+        admin_id,
+        status_moderacao=StatusModeracao.APROVADA,
+        motivo_rejeicao=None
+    )
 
     if not contribuicao:
         return None
 
-    # Só pode aprovar se estiver PENDENTE
-    if contribuicao.status_moderacao != StatusModeracao.PENDENTE:
-        return None
-
-    # Atualiza status
-    contribuicao.status_moderacao = StatusModeracao.APROVADA
-    contribuicao.moderado_por_id = admin_id
-    contribuicao.moderado_em = datetime.utcnow()
-    contribuicao.motivo_rejeicao = None
-
-    # Cria registro de histórico
+    # Cria registro de histórico (gravado no próximo flush/commit)
     historico = HistoricoModeracao(
         contribuicao_id=contribuicao_id,
         admin_id=admin_id,
@@ -51,8 +102,10 @@ async def aprovar_contribuicao(
     )
     db.add(historico)
 
-    await db.flush()
-    await db.refresh(contribuicao)
+    # Atualiza contadores na mesma transação
+    await contador_service.registrar_moderacao(db, contribuicao, StatusModeracao.PENDENTE)
+    await rollup_service.registrar_moderacao(db, contribuicao, StatusModeracao.PENDENTE)
+    registrar_evento(db, EventosCache.MODERACAO)
 
     return contribuicao
 
@@ -73,24 +126,21 @@ async def rejeitar_contribuicao(
         motivo: Motivo da rejeição (obrigatório)
 
     Returns:
-        Contribuicao rejeitada ou None se não encontrada/já moderada
+        Contribuicao rejeitada ou None se não encontrada/já moderada/reservada
     """
-    contribuicao = await db.get(Contribuicao, contribuicao_id)
+    # Só pode rejeitar se estiver PENDENTE
+    contribuicao = await _atualizar_se_pendente(
+        db,
+        contribuicao_id,
+        admin_id,
+        status_moderacao=StatusModeracao.REJEITADA,
+        motivo_rejeicao=motivo
+    )
 
     if not contribuicao:
         return None
 
-    # Só pode rejeitar se estiver PENDENTE
-    if contribuicao.status_moderacao != StatusModeracao.PENDENTE:
-        return None
-
-    # Atualiza status
-    contribuicao.status_moderacao = StatusModeracao.REJEITADA
-    contribuicao.moderado_por_id = admin_id
-    contribuicao.moderado_em = datetime.utcnow()
-    contribuicao.motivo_rejeicao = motivo
-
-    # Cria registro de histórico
+    # Cria registro de histórico (gravado no próximo flush/commit)
     historico = HistoricoModeracao(
         contribuicao_id=contribuicao_id,
         admin_id=admin_id,
@@ -99,17 +149,112 @@ async def rejeitar_contribuicao(
     )
     db.add(historico)
 
-    await db.flush()
-    await db.refresh(contribuicao)
+    # Atualiza contadores na mesma transação
+    await contador_service.registrar_moderacao(db, contribuicao, StatusModeracao.PENDENTE)
+    await rollup_service.registrar_moderacao(db, contribuicao, StatusModeracao.PENDENTE)
+    registrar_evento(db, EventosCache.MODERACAO)
 
     return contribuicao
 
 
+async def _moderar_em_lote(
+    db: AsyncSession,
+    contribuicao_ids: List[int],
+    admin_id: int,
+    status: StatusModeracao,
+    acao: AcaoModeracao,
+    motivo: Optional[str] = None
+) -> Tuple[List[int], Dict[int, str]]:
+    """
+    Modera em lote as contribuições ainda PENDENTES
+
+    Um UPDATE ... WHERE id = ANY(:ids) ... RETURNING para o lote inteiro
+    (ignorando as reservadas por outro moderador),
+    seguido de um único INSERT ... SELECT no histórico e de uma instrução
+    por agregado (contadores e rollup), independente do tamanho do lote.
+
+    Returns:
+        Tupla (IDs moderados, {ID ignorado: motivo})
+    """
+    agora = datetime.utcnow()
+    ids = bindparam("ids", contribuicao_ids, type_=ARRAY(Integer))
+
+    result = await db.execute(
+        update(Contribuicao)
+        .where(
+            Contribuicao.id == any_(ids),
+            Contribuicao.status_moderacao == StatusModeracao.PENDENTE,
+            _disponivel_para(admin_id, agora)
+        )
+        .values(
+            status_moderacao=status,
+            moderado_por_id=admin_id,
+            moderado_em=agora,
+            motivo_rejeicao=motivo,
+            reservado_por_id=None,
+            reservado_ate=None
+        )
+        .returning(
+            Contribuicao.id,
+            Contribuicao.status_moderacao,
+            Contribuicao.documento,
+            Contribuicao.tipo,
+            Contribuicao.artigo_numero,
+            Contribuicao.criado_em
+        )
+        .execution_options(synchronize_session=False)
+    )
+    moderadas = result.all()
+    moderados_ids = sorted(linha.id for linha in moderadas)
+
+    # Motivo de cada ID ignorado (consulta apenas os que não mudaram)
+    ignorados = {}
+    restantes = sorted(set(contribuicao_ids) - set(moderados_ids))
+    if restantes:
+        result = await db.execute(
+            select(Contribuicao.id, Contribuicao.status_moderacao)
+            .where(Contribuicao.id == any_(bindparam("restantes", restantes, type_=ARRAY(Integer))))
+        )
+        status_atual = dict(result.all())
+        for contribuicao_id in restantes:
+            if contribuicao_id not in status_atual:
+                ignorados[contribuicao_id] = "Contribuição não encontrada"
+            elif status_atual[contribuicao_id] == StatusModeracao.PENDENTE:
+                ignorados[contribuicao_id] = "Contribuição reservada por outro moderador"
+            else:
+                ignorados[contribuicao_id] = f"Contribuição já moderada ({status_atual[contribuicao_id].value})"
+
+    if not moderados_ids:
+        return moderados_ids, ignorados
+
+    # Histórico: uma linha por contribuição moderada, em uma única instrução
+    moderados = bindparam("moderados", moderados_ids, type_=ARRAY(Integer))
+    await db.execute(
+        insert(HistoricoModeracao).from_select(
+            ["contribuicao_id", "admin_id", "acao", "motivo", "criado_em"],
+            select(
+                func.unnest(moderados),
+                literal(admin_id),
+                cast(literal(acao.value), HistoricoModeracao.acao.type),
+                cast(literal(motivo), Text),
+                literal(agora)
+            )
+        )
+    )
+
+    # Atualiza contadores na mesma transação
+    await contador_service.registrar_moderacoes(db, moderadas, StatusModeracao.PENDENTE)
+    await rollup_service.registrar_moderacoes(db, moderadas, StatusModeracao.PENDENTE, status)
+    registrar_evento(db, EventosCache.MODERACAO)
+
+    return moderados_ids, ignorados
+
+
 async def aprovar_em_lote(
     db: AsyncSession,
     contribuicao_ids: List[int],
     admin_id: int
-) -> int:
+) -> Tuple[List[int], Dict[int, str]]:
     """
     Aprova múltiplas contribuições
 
@@ -119,15 +264,15 @@ async def aprovar_em_lote(
         admin_id: ID do admin
 
     Returns:
-        Quantidade de contribuições aprovadas
+        Tupla (IDs aprovados, {ID ignorado: motivo})
     """
-    count = 0
-    for contrib_id in contribuicao_ids:
-        result = await aprovar_contribuicao(db, contrib_id, admin_id)
-        if result:
-            count += 1
-
-    return count
+    return await _moderar_em_lote(
+        db,
+        contribuicao_ids,
+        admin_id,
+        StatusModeracao.APROVADA,
+        AcaoModeracao.APROVAR
+    )
 
 
 async def rejeitar_em_lote(
@@ -135,7 +280,7 @@ async def rejeitar_em_lote(
     contribuicao_ids: List[int],
     admin_id: int,
     motivo: str
-) -> int:
+) -> Tuple[List[int], Dict[int, str]]:
     """
     Rejeita múltiplas contribuições
 
@@ -146,15 +291,116 @@ async def rejeitar_em_lote(
         motivo: Motivo da rejeição
 
     Returns:
-        Quantidade de contribuições rejeitadas
+        Tupla (IDs rejeitados, {ID ignorado: motivo})
+    """
+    return await _moderar_em_lote(
+        db,
+        contribuicao_ids,
+        admin_id,
+        StatusModeracao.REJEITADA,
+        AcaoModeracao.REJEITAR,
+        motivo
+    )
+
+
+async def reivindicar_pendentes(
+    db: AsyncSession,
+    admin_id: int,
+    quantidade: int,
+    documento: Optional[DocumentoConsulta] = None,
+    tipo: Optional[TipoContribuicao] = None,
+    filtro: Optional[FiltroDispositivo] = None
+) -> Tuple[List[Contribuicao], datetime]:
+    """
+    Reserva para o moderador as próximas contribuições pendentes da fila
+
+    SELECT ... FOR UPDATE SKIP LOCKED: moderadores simultâneos recebem
+    contribuições distintas, sem esperar uns pelos outros. Reservas do
+    próprio moderador são renovadas; reservas expiradas voltam à fila.
+
+    Args:
+        db: Sessão do banco
+        admin_id: ID do moderador
+        quantidade: Máximo de contribuições
+        documento: Filtrar por documento (CEO/CPEO)
+        tipo: Filtrar por tipo de contribuição
+        filtro: Filtrar por localização (artigo, intervalo, capítulo)
+
+    Returns:
+        Tupla (contribuições reservadas, mais antigas primeiro; fim da reserva)
+    """
+    agora = datetime.utcnow()
+    reservado_ate = agora + timedelta(seconds=settings.MODERACAO_RESERVA_SEGUNDOS)
+
+    candidatos = select(Contribuicao.id).where(
+        Contribuicao.status_moderacao == StatusModeracao.PENDENTE,
+        _disponivel_para(admin_id, agora)
+    )
+
+    if documento:
+        candidatos = candidatos.where(Contribuicao.documento == documento)
+
+    if tipo:
+        candidatos = candidatos.where(Contribuicao.tipo == tipo)
+
+    candidatos = filtrar_por_dispositivo(candidatos, filtro)
+    candidatos = (
+        candidatos
+        .order_by(Contribuicao.criado_em.asc())
+        .limit(quantidade)
+        .with_for_update(skip_locked=True)
+    )
+
+    result = await db.execute(
+        update(Contribuicao)
+        .where(Contribuicao.id.in_(candidatos))
+        .values(
+            reservado_por_id=admin_id,
+            reservado_ate=reservado_ate,
+            atualizado_em=Contribuicao.atualizado_em  # Reserva não altera o conteúdo
+        )
+        .returning(Contribuicao),
+        execution_options={"populate_existing": True}
+    )
+    contribuicoes = sorted(result.scalars().all(), key=lambda c: (c.criado_em, c.id))
+
+    return contribuicoes, reservado_ate
+
+
+async def liberar_reservas(
+    db: AsyncSession,
+    admin_id: int,
+    contribuicao_ids: Optional[List[int]] = None
+) -> int:
+    """
+    Devolve à fila contribuições reservadas pelo moderador
+
+    Args:
+        db: Sessão do banco
+        admin_id: ID do moderador
+        contribuicao_ids: IDs a liberar (None = todas as reservas do moderador)
+
+    Returns:
+        Quantidade de reservas liberadas
     """
-    count = 0
-    for contrib_id in contribuicao_ids:
-        result = await rejeitar_contribuicao(db, contrib_id, admin_id, motivo)
-        if result:
-            count += 1
+    stmt = (
+        update(Contribuicao)
+        .where(Contribuicao.reservado_por_id == admin_id)
+        .values(
+            reservado_por_id=None,
+            reservado_ate=None,
+            atualizado_em=Contribuicao.atualizado_em
+        )
+        .execution_options(synchronize_session=False)
+    )
 
-    return count
+    if contribuicao_ids is not None:
+        stmt = stmt.where(
+            Contribuicao.id == any_(bindparam("ids", contribuicao_ids, type_=ARRAY(Integer)))
+        )
+
+    result = await db.execute(stmt)
+    return result.rowcount
 
 
 async def listar_contribuicoes_pendentes(
@@ -163,6 +409,7 @@ async def listar_contribuicoes_pendentes(
     tipo: Optional[TipoContribuicao] = None,
     data_inicio: Optional[datetime] = None,
     data_fim: Optional[datetime] = None,
+    filtro: Optional[FiltroDispositivo] = None,
     page: int = 1,
     per_page: int = 20
 ) -> Tuple[List[Contribuicao], int]:
@@ -175,6 +422,7 @@ async def listar_contribuicoes_pendentes(
         tipo: Filtrar por tipo de contribuição
         data_inicio: Filtrar por data de criação (início)
         data_fim: Filtrar por data de criação (fim)
+        filtro: Filtrar por localização (artigo, intervalo, capítulo)
         page: Página (1-indexed)
         per_page: Itens por página
 
@@ -199,6 +447,8 @@ async def listar_contribuicoes_pendentes(
     if data_fim:
         query = query.where(Contribuicao.criado_em <= data_fim)
 
+    query = filtrar_por_dispositivo(query, filtro)
+
     # Conta total
     count_query = select(func.count()).select_from(query.subquery())
     count_result = await db.execute(count_query)
@@ -221,6 +471,7 @@ async def listar_contribuicoes_com_filtros(
     tipo: Optional[TipoContribuicao] = None,
     data_inicio: Optional[datetime] = None,
     data_fim: Optional[datetime] = None,
+    filtro: Optional[FiltroDispositivo] = None,
     page: int = 1,
     per_page: int = 20
 ) -> Tuple[List[Contribuicao], int]:
@@ -234,6 +485,7 @@ async def listar_contribuicoes_com_filtros(
         tipo: Filtrar por tipo
         data_inicio: Filtrar por data
         data_fim: Filtrar por data
+        filtro: Filtrar por localização (artigo, intervalo, capítulo)
         page: Página
         per_page: Itens por página
 
@@ -258,6 +510,8 @@ async def listar_contribuicoes_com_filtros(
     if data_fim:
         query = query.where(Contribuicao.criado_em <= data_fim)
 
+    query = filtrar_por_dispositivo(query, filtro)
+
     # Conta total
     count_query = select(func.count()).select_from(query.subquery())
     count_result = await db.execute(count_query)
@@ -299,54 +553,42 @@ async def obter_estatisticas_moderacao(db: AsyncSession) -> dict:
     """
     Retorna estatísticas de moderação
 
+    Totais por status vêm dos contadores agregados; as janelas de tempo
+    (hoje e última semana) são calculadas em uma única consulta filtrada.
+
     Returns:
         Dict com estatísticas
     """
     # Total por status
-    result_pendentes = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.status_moderacao == StatusModeracao.PENDENTE
-        )
-    )
-    total_pendentes = result_pendentes.scalar() or 0
+    por_status = (await contador_service.obter_contadores(
+        db, [DimensoesContador.CONTRIBUICOES_STATUS]
+    )).get(DimensoesContador.CONTRIBUICOES_STATUS, {})
 
-    result_aprovadas = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.status_moderacao == StatusModeracao.APROVADA
-        )
-    )
-    total_aprovadas = result_aprovadas.scalar() or 0
-
-    result_rejeitadas = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            Contribuicao.status_moderacao == StatusModeracao.REJEITADA
-        )
-    )
-    total_rejeitadas = result_rejeitadas.scalar() or 0
+    total_pendentes = por_status.get(StatusModeracao.PENDENTE.value, 0)
+    total_aprovadas = por_status.get(StatusModeracao.APROVADA.value, 0)
+    total_rejeitadas = por_status.get(StatusModeracao.REJEITADA.value, 0)
 
-    # Contribuições moderadas hoje
+    # Contribuições moderadas hoje e na última semana
     hoje_inicio = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    result_hoje = await db.execute(
-        select(func.count(Contribuicao.id)).where(
-            and_(
-                Contribuicao.moderado_em >= hoje_inicio,
-                Contribuicao.status_moderacao != StatusModeracao.PENDENTE
-            )
-        )
-    )
-    total_hoje = result_hoje.scalar() or 0
-
-    # Contribuições moderadas na última semana
     semana_atras = datetime.utcnow() - timedelta(days=7)
-    result_semana = await db.execute(
-        select(func.count(Contribuicao.id)).where(
+    result_periodos = await db.execute(
+        select(
+            func.count(Contribuicao.id).filter(
+                Contribuicao.moderado_em >= hoje_inicio
+            ).label("hoje"),
+            func.count(Contribuicao.id).filter(
+                Contribuicao.moderado_em >= semana_atras
+            ).label("semana")
+        ).where(
             and_(
                 Contribuicao.moderado_em >= semana_atras,
                 Contribuicao.status_moderacao != StatusModeracao.PENDENTE
             )
         )
     )
-    total_ultima_semana = result_semana.scalar() or 0
+    periodos = result_periodos.one()
+    total_hoje = periodos.hoje or 0
+    total_ultima_semana = periodos.semana or 0
 
     # Taxa de aprovação
     total_moderadas = total_aprovadas + total_rejeitadas
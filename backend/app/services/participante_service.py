@@ -2,23 +2,91 @@
 Serviço de Participante
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from ..models.participante import Participante, TipoParticipante
 from ..schemas.participante import ParticipantePFCreate, ParticipantePJCreate
-from ..utils.security import crypto, hash_cpf_cnpj
+from ..utils.security import crypto_async, hash_cpf_cnpj
+from . import contador_service
+from ..utils.cache import EventosCache, registrar_evento
 
 
-async def criar_participante_pf(
+async def _obter_por_hash(
+    db: AsyncSession,
+    coluna_hash,
+    valor_hash: str
+) -> Optional[Participante]:
+    """Busca participante pelo hash do documento (índice único parcial)"""
+    result = await db.execute(select(Participante).where(coluna_hash == valor_hash))
+    return result.scalar_one_or_none()
+
+
+async def _inserir_ou_obter(
+    db: AsyncSession,
+    valores: dict,
+    coluna_hash,
+    sensiveis: Dict[str, Optional[str]]
+) -> Tuple[Participante, bool]:
+    """
+    Obtém o participante com o mesmo hash ou o insere
+
+    Participante existente: um SELECT pelo índice único do hash, sem escrita
+    e sem criptografia. Novo: criptografa os dados sensíveis e grava com
+    INSERT ... ON CONFLICT DO NOTHING RETURNING; se uma requisição concorrente
+    inserir o mesmo hash antes, nada volta e a linha dela é lida.
+
+    Args:
+        db: Sessão do banco
+        valores: Colunas do participante (sem os dados sensíveis)
+        coluna_hash: Coluna do hash do documento (cpf_hash ou cnpj_hash)
+        sensiveis: {coluna criptografada: valor em claro}
+
+    Returns:
+        Tupla (participante, criado)
+    """
+    valor_hash = valores[coluna_hash.key]
+
+    participante = await _obter_por_hash(db, coluna_hash, valor_hash)
+    if participante is not None:
+        return participante, False
+
+    # Criptografa dados sensíveis (apenas para participante novo)
+    criptografados = await crypto_async.encrypt_many(list(sensiveis.values()))
+
+    stmt = (
+        insert(Participante)
+        .values(**valores, **dict(zip(sensiveis, criptografados)))
+        .on_conflict_do_nothing(
+            index_elements=[coluna_hash],
+            index_where=coluna_hash.isnot(None)
+        )
+        .returning(Participante)
+    )
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    participante = result.scalar_one_or_none()
+
+    if participante is None:
+        # Inserido por outra transação (já commitada) entre o SELECT e o INSERT
+        return await _obter_por_hash(db, coluna_hash, valor_hash), False
+
+    # Atualiza contadores na mesma transação
+    await contador_service.registrar_participante_criado(db, participante)
+    registrar_evento(db, EventosCache.PARTICIPANTE)
+
+    return participante, True
+
+
+async def identificar_participante_pf(
     db: AsyncSession,
     data: ParticipantePFCreate,
     ip_origem: Optional[str] = None,
     user_agent: Optional[str] = None
-) -> Participante:
+) -> Tuple[Participante, bool]:
     """
-    Cria participante Pessoa Física
+    Identifica participante Pessoa Física (cria se o CPF for novo)
 
     Args:
         db: Sessão do banco
@@ -27,44 +95,37 @@ async def criar_participante_pf(
         user_agent: User agent do navegador
 
     Returns:
-        Participante criado
+        Tupla (participante, criado)
     """
-    # Criptografa dados sensíveis
-    cpf_criptografado = crypto.encrypt(data.cpf)
-    email_criptografado = crypto.encrypt(data.email)
-
-    # Hash para busca (sem possibilidade de reversão)
-    cpf_hash = hash_cpf_cnpj(data.cpf)
-
-    # Cria participante
-    participante = Participante(
-        tipo=TipoParticipante.PESSOA_FISICA,
-        nome_completo=data.nome_completo,
-        cpf_hash=cpf_hash,
-        cpf_criptografado=cpf_criptografado,
-        categoria_pf=data.categoria,
-        email_criptografado=email_criptografado,
-        uf=data.uf,
-        consentimento_lgpd=datetime.utcnow(),
-        ip_origem=ip_origem,
-        user_agent=user_agent
+    return await _inserir_ou_obter(
+        db,
+        {
+            "tipo": TipoParticipante.PESSOA_FISICA,
+            "nome_completo": data.nome_completo,
+            # Hash para busca (sem possibilidade de reversão)
+            "cpf_hash": hash_cpf_cnpj(data.cpf),
+            "categoria_pf": data.categoria,
+            "uf": data.uf,
+            "consentimento_lgpd": datetime.utcnow(),
+            "ip_origem": ip_origem,
+            "user_agent": user_agent
+        },
+        Participante.cpf_hash,
+        {
+            "cpf_criptografado": data.cpf,
+            "email_criptografado": data.email
+        }
     )
 
-    db.add(participante)
-    await db.flush()
-    await db.refresh(participante)
 
-    return participante
-
-
-async def criar_participante_pj(
+async def identificar_participante_pj(
     db: AsyncSession,
     data: ParticipantePJCreate,
     ip_origem: Optional[str] = None,
     user_agent: Optional[str] = None
-) -> Participante:
+) -> Tuple[Participante, bool]:
     """
-    Cria participante Pessoa Jurídica
+    Identifica participante Pessoa Jurídica (cria se o CNPJ for novo)
 
     Args:
         db: Sessão do banco
@@ -73,40 +134,31 @@ async def criar_participante_pj(
         user_agent: User agent do navegador
 
     Returns:
-        Participante criado
+        Tupla (participante, criado)
     """
-    # Criptografa dados sensíveis
-    cnpj_criptografado = crypto.encrypt(data.cnpj)
-    cpf_responsavel_criptografado = crypto.encrypt(data.cpf_responsavel)
-    email_criptografado = crypto.encrypt(data.email)
-
-    # Hashes para busca
-    cnpj_hash = hash_cpf_cnpj(data.cnpj)
-    cpf_responsavel_hash = hash_cpf_cnpj(data.cpf_responsavel)
-
-    # Cria participante
-    participante = Participante(
-        tipo=TipoParticipante.PESSOA_JURIDICA,
-        razao_social=data.razao_social,
-        cnpj_hash=cnpj_hash,
-        cnpj_criptografado=cnpj_criptografado,
-        natureza_entidade=data.natureza_entidade,
-        nome_responsavel_legal=data.nome_responsavel_legal,
-        cpf_responsavel_hash=cpf_responsavel_hash,
-        cpf_responsavel_criptografado=cpf_responsavel_criptografado,
-        email_criptografado=email_criptografado,
-        uf=data.uf,
-        consentimento_lgpd=datetime.utcnow(),
-        ip_origem=ip_origem,
-        user_agent=user_agent
+    return await _inserir_ou_obter(
+        db,
+        {
+            "tipo": TipoParticipante.PESSOA_JURIDICA,
+            "razao_social": data.razao_social,
+            # Hashes para busca
+            "cnpj_hash": hash_cpf_cnpj(data.cnpj),
+            "natureza_entidade": data.natureza_entidade,
+            "nome_responsavel_legal": data.nome_responsavel_legal,
+            "cpf_responsavel_hash": hash_cpf_cnpj(data.cpf_responsavel),
+            "uf": data.uf,
+            "consentimento_lgpd": datetime.utcnow(),
+            "ip_origem": ip_origem,
+            "user_agent": user_agent
+        },
+        Participante.cnpj_hash,
+        {
+            "cnpj_criptografado": data.cnpj,
+            "cpf_responsavel_criptografado": data.cpf_responsavel,
+            "email_criptografado": data.email
+        }
     )
 
-    db.add(participante)
-    await db.flush()
-    await db.refresh(participante)
-
-    return participante
-
 
 async def buscar_participante_por_id(
     db: AsyncSession,
@@ -119,6 +171,17 @@ async def buscar_participante_por_id(
     return result.scalar_one_or_none()
 
 
+async def participante_existe(
+    db: AsyncSession,
+    participante_id: int
+) -> bool:
+    """Verifica se o participante existe (sem carregar a linha)"""
+    result = await db.execute(
+        select(exists().where(Participante.id == participante_id))
+    )
+    return bool(result.scalar())
+
+
 async def buscar_participante_por_cpf(
     db: AsyncSession,
     cpf: str
@@ -147,3 +210,67 @@ async def buscar_participante_por_cnpj(
         )
     )
     return result.scalar_one_or_none()
+
+
+async def iterar_participantes(
+    db: AsyncSession,
+    tipo: Optional[TipoParticipante] = None,
+    uf: Optional[str] = None,
+    tamanho_lote: int = 1000
+) -> AsyncIterator[List]:
+    """
+    Percorre participantes em lotes por keyset (criado_em, id) decrescente
+
+    Cada lote é uma consulta independente (sem OFFSET), com apenas as
+    colunas necessárias para exportação, ainda criptografadas.
+
+    Args:
+        db: Sessão do banco
+        tipo: Filtrar por tipo
+        uf: Filtrar por UF
+        tamanho_lote: Linhas por lote
+
+    Yields:
+        Listas de linhas (id, tipo, nome_completo, razao_social,
+        cpf_criptografado, cnpj_criptografado, email_criptografado, uf, criado_em)
+    """
+    query = select(
+        Participante.id,
+        Participante.tipo,
+        Participante.nome_completo,
+        Participante.razao_social,
+        Participante.cpf_criptografado,
+        Participante.cnpj_criptografado,
+        Participante.email_criptografado,
+        Participante.uf,
+        Participante.criado_em
+    )
+
+    if tipo:
+        query = query.where(Participante.tipo == tipo)
+
+    if uf:
+        query = query.where(Participante.uf == uf.upper())
+
+    query = query.order_by(Participante.criado_em.desc(), Participante.id.desc())
+
+    ultimo = None
+    while True:
+        lote_query = query
+        if ultimo is not None:
+            lote_query = lote_query.where(
+                tuple_(Participante.criado_em, Participante.id) < tuple_(*ultimo)
+            )
+
+        result = await db.execute(lote_query.limit(tamanho_lote))
+        lote = result.all()
+
+        if not lote:
+            break
+
+        yield lote
+
+        if len(lote) < tamanho_lote:
+            break
+
+        ultimo = (lote[-1].criado_em, lote[-1].id)
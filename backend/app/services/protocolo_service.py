@@ -2,14 +2,19 @@
 Serviço de Protocolo
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import Optional, List
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 from ..models.protocolo import Protocolo
+from ..models.sequencial_protocolo import SequencialProtocolo
+from ..models.protocolo_contribuicao import ProtocoloContribuicao
 from ..models.participante import Participante
 from ..models.contribuicao import Contribuicao, DocumentoConsulta
 from ..utils.protocol import gerar_protocolo, obter_timestamp_brasilia
+from . import contador_service
+from ..utils.cache import EventosCache, registrar_evento
 
 
 async def obter_proximo_sequencial(
@@ -27,21 +32,20 @@ async def obter_proximo_sequencial(
 
     Returns:
         Próximo número sequencial
-    """
-    # Busca o maior sequencial existente para o documento/ano
-    query = select(func.max(Protocolo.id)).where(
-        Protocolo.documento == documento,
-        func.extract('year', Protocolo.criado_em_brasilia) == ano
-    )
 
-    result = await db.execute(query)
-    max_seq = result.scalar()
-
-    # Se não existe nenhum protocolo, começa do 1
-    if max_seq is None:
-        return 1
+    A linha (documento, ano) fica bloqueada até o fim da transação:
+    finalizações concorrentes recebem números distintos, e um rollback
+    devolve o número (sem lacunas).
+    """
+    # Primeiro protocolo do documento/ano cria a linha com 1
+    stmt = insert(SequencialProtocolo).values(documento=documento, ano=ano, ultimo=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SequencialProtocolo.documento, SequencialProtocolo.ano],
+        set_={"ultimo": SequencialProtocolo.ultimo + 1}
+    ).returning(SequencialProtocolo.ultimo)
 
-    return max_seq + 1
+    result = await db.execute(stmt)
+    return result.scalar_one()
 
 
 async def criar_protocolo(
@@ -74,7 +78,7 @@ async def criar_protocolo(
     sequencial = await obter_proximo_sequencial(db, documento.value, ano)
 
     # Gera número do protocolo
-    numero_protocolo = gerar_protocolo(documento.value, sequencial)
+    numero_protocolo = gerar_protocolo(documento.value, sequencial, ano)
 
     # Cria protocolo
     protocolo = Protocolo(
@@ -83,15 +87,30 @@ async def criar_protocolo(
         documento=documento.value,
         total_contribuicoes=len(contribuicoes_ids),
         contribuicoes_ids=contribuicoes_ids,
-        criado_em_brasilia=timestamp_brasilia,
+        # Coluna sem timezone: grava o horário local de Brasília (asyncpg
+        # rejeita datetime com tzinfo em TIMESTAMP WITHOUT TIME ZONE)
+        criado_em_brasilia=timestamp_brasilia.replace(tzinfo=None),
         criado_em_utc=datetime.utcnow(),
         ip_origem=ip_origem,
         user_agent=user_agent
     )
 
+    # INSERT ... RETURNING id (demais valores já são conhecidos no cliente)
     db.add(protocolo)
     await db.flush()
-    await db.refresh(protocolo)
+
+    # Vincula as contribuições (um único INSERT multi-linha)
+    if contribuicoes_ids:
+        await db.execute(
+            insert(ProtocoloContribuicao).values([
+                {"protocolo_id": protocolo.id, "contribuicao_id": contribuicao_id}
+                for contribuicao_id in dict.fromkeys(contribuicoes_ids)
+            ])
+        )
+
+    # Atualiza contadores na mesma transação
+    await contador_service.registrar_protocolo_criado(db, protocolo)
+    registrar_evento(db, EventosCache.PROTOCOLO)
 
     return protocolo
 
@@ -107,6 +126,42 @@ async def buscar_protocolo_por_numero(
     return result.scalar_one_or_none()
 
 
+async def obter_versao_protocolo(
+    db: AsyncSession,
+    numero_protocolo: str
+) -> Optional[Tuple[int, Optional[datetime]]]:
+    """
+    Carimbo de versão da página pública do protocolo (para ETag)
+
+    O protocolo é imutável após a finalização; apenas o status de moderação
+    das contribuições muda. Uma única consulta indexada retorna o ID do
+    protocolo e a última moderação de suas contribuições.
+
+    Returns:
+        Tupla (id do protocolo, última moderação) ou None se não existir
+    """
+    ultima_moderacao = (
+        select(func.max(Contribuicao.moderado_em))
+        .join(
+            ProtocoloContribuicao,
+            ProtocoloContribuicao.contribuicao_id == Contribuicao.id
+        )
+        .where(ProtocoloContribuicao.protocolo_id == Protocolo.id)
+        .correlate(Protocolo)
+        .scalar_subquery()
+    )
+
+    result = await db.execute(
+        select(Protocolo.id, ultima_moderacao).where(
+            Protocolo.numero_protocolo == numero_protocolo
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return row[0], row[1]
+
+
 async def buscar_protocolo_completo(
     db: AsyncSession,
     numero_protocolo: str
@@ -116,24 +171,30 @@ async def buscar_protocolo_completo(
 
     Returns:
         Dict com protocolo, participante e contribuições
-    """
-    protocolo = await buscar_protocolo_por_numero(db, numero_protocolo)
-    if not protocolo:
-        return None
 
-    # Busca participante
+    Uma única consulta: protocolo e participante se repetem em cada linha
+    (uma por contribuição vinculada).
+    """
     result = await db.execute(
-        select(Participante).where(Participante.id == protocolo.participante_id)
+        select(Protocolo, Participante, Contribuicao)
+        .join(Participante, Participante.id == Protocolo.participante_id)
+        .outerjoin(
+            ProtocoloContribuicao,
+            ProtocoloContribuicao.protocolo_id == Protocolo.id
+        )
+        .outerjoin(
+            Contribuicao,
+            Contribuicao.id == ProtocoloContribuicao.contribuicao_id
+        )
+        .where(Protocolo.numero_protocolo == numero_protocolo)
+        .order_by(Contribuicao.criado_em, Contribuicao.id)
     )
-    participante = result.scalar_one_or_none()
+    rows = result.all()
+    if not rows:
+        return None
 
-    # Busca contribuições
-    result = await db.execute(
-        select(Contribuicao).where(
-            Contribuicao.id.in_(protocolo.contribuicoes_ids)
-        ).order_by(Contribuicao.criado_em)
-    )
-    contribuicoes = list(result.scalars().all())
+    protocolo, participante, _ = rows[0]
+    contribuicoes = [row[2] for row in rows if row[2] is not None]
 
     return {
         "protocolo": protocolo,
@@ -147,11 +208,8 @@ async def marcar_email_enviado(
     protocolo_id: int
 ) -> None:
     """Marca que o email de confirmação foi enviado"""
-    result = await db.execute(
-        select(Protocolo).where(Protocolo.id == protocolo_id)
+    await db.execute(
+        update(Protocolo)
+        .where(Protocolo.id == protocolo_id)
+        .values(email_enviado=datetime.utcnow())
     )
-    protocolo = result.scalar_one_or_none()
-
-    if protocolo:
-        protocolo.email_enviado = datetime.utcnow()
-        await db.flush()
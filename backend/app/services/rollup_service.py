@@ -0,0 +1,471 @@
+"""
+Service para consolidação diária de contribuições (rollup)
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, union_all, cast, any_, bindparam, Date, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+import pytz
+
+from ..core.config import settings
+from ..models.contribuicao import Contribuicao, StatusModeracao
+from ..models.contribuicao_diaria import ContribuicaoDiaria, DiaSelado
+from ..models.participante import Participante
+from ..utils.protocol import obter_timestamp_brasilia
+
+# Último dia selado observado no banco (evita consulta a cada leitura)
+_selado_ate: Optional[date] = None
+
+# Advisory lock que serializa a selagem com escritas em dias não selados
+_BLOQUEIO_SELAGEM = 0x726F6C6C
+
+
+def dia_brasilia(coluna):
+    """Expressão SQL do dia (horário de Brasília) de um timestamp UTC sem timezone"""
+    return func.date(func.timezone(settings.TIMEZONE, func.timezone("UTC", coluna)))
+
+
+def hoje_brasilia() -> date:
+    """Dia corrente no horário de Brasília"""
+    return obter_timestamp_brasilia().date()
+
+
+def converter_para_dia_brasilia(momento_utc: datetime) -> date:
+    """Converte timestamp UTC sem timezone para o dia em Brasília"""
+    tz = pytz.timezone(settings.TIMEZONE)
+    return pytz.utc.localize(momento_utc).astimezone(tz).date()
+
+
+def inicio_dia_utc(dia: date) -> datetime:
+    """Início (00:00 em Brasília) de um dia, em UTC sem timezone"""
+    tz = pytz.timezone(settings.TIMEZONE)
+    inicio = tz.localize(datetime.combine(dia, time.min))
+    return inicio.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def _consulta_agregada(dia_inicio: date, dia_fim: date):
+    """
+    SELECT que agrega contribuições por (dia, documento, tipo, uf, status)
+    para o intervalo [dia_inicio, dia_fim] (dias de Brasília)
+    """
+    dia_expr = dia_brasilia(Contribuicao.criado_em)
+
+    return (
+        select(
+            dia_expr.label("dia"),
+            Contribuicao.documento,
+            Contribuicao.tipo,
+            Participante.uf,
+            Contribuicao.status_moderacao,
+            func.count(Contribuicao.id).label("total")
+        )
+        .join(Participante, Contribuicao.participante_id == Participante.id)
+        .where(
+            Contribuicao.criado_em >= inicio_dia_utc(dia_inicio),
+            Contribuicao.criado_em < inicio_dia_utc(dia_fim + timedelta(days=1))
+        )
+        .group_by(
+            dia_expr,
+            Contribuicao.documento,
+            Contribuicao.tipo,
+            Participante.uf,
+            Contribuicao.status_moderacao
+        )
+    )
+
+
+async def selar_dias_pendentes(db: AsyncSession) -> List[date]:
+    """
+    Consolida na tabela de rollup todos os dias encerrados ainda não selados
+
+    Os dias são reservados em `rollup_dias_selados` com ON CONFLICT DO NOTHING,
+    de modo que, entre workers concorrentes, apenas um consolida cada dia.
+    A consolidação é serializada com as escritas no rollup (criação e
+    moderação) por advisory lock, ver `_aguardar_selagem`.
+
+    Args:
+        db: Sessão do banco
+
+    Returns:
+        Lista de dias selados nesta chamada
+    """
+    global _selado_ate
+
+    ontem = hoje_brasilia() - timedelta(days=1)
+
+    if _selado_ate is not None and _selado_ate >= ontem:
+        return []
+
+    result = await db.execute(select(func.max(DiaSelado.dia)))
+    ultimo_selado = result.scalar()
+
+    if ultimo_selado is not None:
+        if ultimo_selado >= ontem:
+            _selado_ate = ultimo_selado
+            return []
+        primeiro_dia = ultimo_selado + timedelta(days=1)
+    else:
+        result = await db.execute(select(func.min(Contribuicao.criado_em)))
+        primeira_contribuicao = result.scalar()
+        if primeira_contribuicao is None:
+            return []
+        primeiro_dia = converter_para_dia_brasilia(primeira_contribuicao)
+
+    if primeiro_dia > ontem:
+        return []
+
+    # Espera as escritas em curso (ver _aguardar_selagem): o marcador e o
+    # agregado abaixo são instruções novas e enxergam tudo que foi commitado
+    await db.execute(select(func.pg_advisory_xact_lock(_BLOQUEIO_SELAGEM)))
+
+    # Reserva os dias (só quem inserir o marcador consolida o dia)
+    dias = [
+        primeiro_dia + timedelta(days=i)
+        for i in range((ontem - primeiro_dia).days + 1)
+    ]
+    reserva = (
+        insert(DiaSelado)
+        .values([{"dia": dia, "selado_em": datetime.utcnow()} for dia in dias])
+        .on_conflict_do_nothing(index_elements=[DiaSelado.dia])
+        .returning(DiaSelado.dia)
+    )
+    result = await db.execute(reserva)
+    selados = sorted(result.scalars().all())
+
+    if not selados:
+        return []
+
+    agregado = _consulta_agregada(selados[0], selados[-1])
+    agregado = agregado.where(dia_brasilia(Contribuicao.criado_em).in_(selados))
+
+    stmt = insert(ContribuicaoDiaria).from_select(
+        ["dia", "documento", "tipo", "uf", "status_moderacao", "total"],
+        agregado
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ContribuicaoDiaria.dia,
+            ContribuicaoDiaria.documento,
+            ContribuicaoDiaria.tipo,
+            ContribuicaoDiaria.uf,
+            ContribuicaoDiaria.status_moderacao
+        ],
+        set_={"total": stmt.excluded.total}
+    )
+    await db.execute(stmt)
+
+    return selados
+
+
+def _longe_da_selagem(dias: Iterable[date]) -> bool:
+    """
+    Indica se todos os dias são o dia corrente, fora da janela antes da
+    meia-noite (ROLLUP_MARGEM_SELAGEM_SEGUNDOS)
+
+    O dia corrente só é selado depois da meia-noite; uma transação que o
+    escreve bem antes disso termina antes da selagem e entra no agregado.
+    """
+    hoje = hoje_brasilia()
+
+    if any(dia != hoje for dia in dias):
+        return False
+
+    restante = inicio_dia_utc(hoje + timedelta(days=1)) - datetime.utcnow()
+    return restante.total_seconds() > settings.ROLLUP_MARGEM_SELAGEM_SEGUNDOS
+
+
+async def _aguardar_selagem(db: AsyncSession, dias: Iterable[date]) -> bool:
+    """
+    Serializa uma escrita em dias possivelmente não selados com a selagem
+
+    Escritas tomam o advisory lock compartilhado e a selagem o exclusivo,
+    ambos até o fim da transação. Em READ COMMITTED isso garante que:
+    - a selagem espera as escritas em curso e as enxerga no agregado;
+    - escritas posteriores enxergam o marcador do dia selado e gravam o delta.
+
+    Deve ser chamado antes de verificar se o dia está selado. Dias que este
+    processo já viu selados (e commitados) dispensam o lock; o dia corrente,
+    longe da meia-noite, dispensa o lock e o delta.
+
+    Returns:
+        False se nenhum dos dias pode estar selado (não há delta a gravar)
+    """
+    dias = list(dias)
+
+    if _selado_ate is not None and all(dia <= _selado_ate for dia in dias):
+        return True
+
+    if _longe_da_selagem(dias):
+        return False
+
+    await db.execute(select(func.pg_advisory_xact_lock_shared(_BLOQUEIO_SELAGEM)))
+    return True
+
+
+async def _registrar_deltas(
+    db: AsyncSession,
+    contribuicao: Contribuicao,
+    deltas: List[Tuple[StatusModeracao, int]]
+) -> None:
+    """
+    Aplica deltas por status à linha do rollup da contribuição, se o dia dela
+    já estiver selado
+
+    Executa em uma única instrução: se o dia não estiver selado, nenhuma
+    linha é gerada (o dia ainda será consolidado com o status atual).
+    """
+    dia = converter_para_dia_brasilia(contribuicao.criado_em)
+    if not await _aguardar_selagem(db, [dia]):
+        return
+
+    selado = select(DiaSelado.dia).where(DiaSelado.dia == dia).exists()
+
+    def _linha(status: StatusModeracao, delta: int):
+        return select(
+            cast(literal(dia), Date).label("dia"),
+            cast(literal(contribuicao.documento.value), ContribuicaoDiaria.documento.type).label("documento"),
+            cast(literal(contribuicao.tipo.value), ContribuicaoDiaria.tipo.type).label("tipo"),
+            Participante.uf,
+            cast(literal(status.value), ContribuicaoDiaria.status_moderacao.type).label("status_moderacao"),
+            cast(literal(delta), Integer).label("total")
+        ).where(
+            Participante.id == contribuicao.participante_id,
+            selado
+        )
+
+    stmt = insert(ContribuicaoDiaria).from_select(
+        ["dia", "documento", "tipo", "uf", "status_moderacao", "total"],
+        union_all(*(_linha(status, delta) for status, delta in deltas))
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ContribuicaoDiaria.dia,
+            ContribuicaoDiaria.documento,
+            ContribuicaoDiaria.tipo,
+            ContribuicaoDiaria.uf,
+            ContribuicaoDiaria.status_moderacao
+        ],
+        set_={"total": ContribuicaoDiaria.total + stmt.excluded.total}
+    )
+    await db.execute(stmt)
+
+
+async def registrar_contribuicao_criada(
+    db: AsyncSession,
+    contribuicao: Contribuicao
+) -> None:
+    """
+    Conta no rollup uma contribuição cujo dia foi selado antes do commit dela
+
+    Caso de uma contribuição criada perto da meia-noite: sem isto, ela
+    ficaria fora do dia selado.
+
+    Args:
+        db: Sessão do banco
+        contribuicao: Contribuição recém-criada (criado_em preenchido)
+    """
+    await _registrar_deltas(db, contribuicao, [(contribuicao.status_moderacao, 1)])
+
+
+async def registrar_moderacao(
+    db: AsyncSession,
+    contribuicao: Contribuicao,
+    status_anterior: StatusModeracao
+) -> None:
+    """
+    Move a contribuição de status no rollup, se o dia dela já estiver selado
+
+    Args:
+        db: Sessão do banco
+        contribuicao: Contribuição já com o novo status
+        status_anterior: Status antes da moderação
+    """
+    await _registrar_deltas(
+        db,
+        contribuicao,
+        [(status_anterior, -1), (contribuicao.status_moderacao, 1)]
+    )
+
+
+async def registrar_moderacoes(
+    db: AsyncSession,
+    contribuicoes: List,
+    status_anterior: StatusModeracao,
+    status_novo: StatusModeracao
+) -> None:
+    """
+    Move várias contribuições de status no rollup (uma única instrução)
+
+    Agrega as contribuições por (dia, documento, tipo, uf); apenas as de dias
+    já selados geram linhas.
+
+    Args:
+        db: Sessão do banco
+        contribuicoes: Contribuições moderadas (ou linhas com id e criado_em)
+        status_anterior: Status antes da moderação
+        status_novo: Status após a moderação
+    """
+    if not contribuicoes:
+        return
+
+    # Basta o intervalo de dias (evita converter o fuso linha a linha)
+    criacoes = [c.criado_em for c in contribuicoes]
+    dias = {converter_para_dia_brasilia(min(criacoes)), converter_para_dia_brasilia(max(criacoes))}
+    if not await _aguardar_selagem(db, dias):
+        return
+
+    dia_expr = dia_brasilia(Contribuicao.criado_em)
+    ids = bindparam("ids", [c.id for c in contribuicoes], type_=ARRAY(Integer))
+
+    def _linhas(status: StatusModeracao, sinal: int):
+        return (
+            select(
+                dia_expr.label("dia"),
+                Contribuicao.documento,
+                Contribuicao.tipo,
+                Participante.uf,
+                cast(literal(status.value), ContribuicaoDiaria.status_moderacao.type).label("status_moderacao"),
+                (sinal * func.count(Contribuicao.id)).label("total")
+            )
+            .join(Participante, Contribuicao.participante_id == Participante.id)
+            .join(DiaSelado, DiaSelado.dia == dia_expr)
+            .where(Contribuicao.id == any_(ids))
+            .group_by(dia_expr, Contribuicao.documento, Contribuicao.tipo, Participante.uf)
+        )
+
+    stmt = insert(ContribuicaoDiaria).from_select(
+        ["dia", "documento", "tipo", "uf", "status_moderacao", "total"],
+        union_all(
+            _linhas(status_anterior, -1),
+            _linhas(status_novo, 1)
+        )
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ContribuicaoDiaria.dia,
+            ContribuicaoDiaria.documento,
+            ContribuicaoDiaria.tipo,
+            ContribuicaoDiaria.uf,
+            ContribuicaoDiaria.status_moderacao
+        ],
+        set_={"total": ContribuicaoDiaria.total + stmt.excluded.total}
+    )
+    await db.execute(stmt)
+
+
+def fonte_rollup(dia_inicio: Optional[date] = None):
+    """
+    Subconsulta que une dias selados (rollup) e o dia corrente (ao vivo)
+
+    Colunas: dia, documento, tipo, uf, status_moderacao, total
+
+    Args:
+        dia_inicio: Primeiro dia considerado (None = desde o início)
+
+    Returns:
+        Subquery pronta para agregação
+    """
+    hoje = hoje_brasilia()
+
+    selados = select(
+        ContribuicaoDiaria.dia,
+        ContribuicaoDiaria.documento,
+        ContribuicaoDiaria.tipo,
+        ContribuicaoDiaria.uf,
+        ContribuicaoDiaria.status_moderacao,
+        ContribuicaoDiaria.total
+    ).where(ContribuicaoDiaria.dia < hoje)
+
+    if dia_inicio is not None:
+        selados = selados.where(ContribuicaoDiaria.dia >= dia_inicio)
+
+    ao_vivo = (
+        select(
+            cast(literal(hoje), Date).label("dia"),
+            Contribuicao.documento,
+            Contribuicao.tipo,
+            Participante.uf,
+            Contribuicao.status_moderacao,
+            func.count(Contribuicao.id).label("total")
+        )
+        .join(Participante, Contribuicao.participante_id == Participante.id)
+        .where(Contribuicao.criado_em >= inicio_dia_utc(hoje))
+        .group_by(
+            Contribuicao.documento,
+            Contribuicao.tipo,
+            Participante.uf,
+            Contribuicao.status_moderacao
+        )
+    )
+
+    return union_all(selados, ao_vivo).subquery("rollup")
+
+
+async def reconciliar_rollup(
+    db: AsyncSession,
+    corrigir: bool = True
+) -> List[dict]:
+    """
+    Compara o rollup dos dias selados com a tabela de contribuições
+
+    Args:
+        db: Sessão do banco
+        corrigir: Se True, regrava os totais divergentes
+
+    Returns:
+        Lista de divergências {chave, armazenado, esperado}
+    """
+    result = await db.execute(select(func.min(DiaSelado.dia), func.max(DiaSelado.dia)))
+    primeiro, ultimo = result.one()
+
+    if primeiro is None:
+        return []
+
+    def _chave(row) -> Tuple:
+        return (row.dia, row.documento, row.tipo, row.uf, row.status_moderacao)
+
+    result = await db.execute(_consulta_agregada(primeiro, ultimo))
+    esperados: Dict[Tuple, int] = {_chave(row): row.total for row in result.all()}
+
+    result = await db.execute(select(ContribuicaoDiaria))
+    armazenados: Dict[Tuple, int] = {
+        _chave(linha): linha.total for linha in result.scalars().all()
+    }
+
+    divergencias = []
+    for chave in sorted(set(esperados) | set(armazenados), key=lambda c: (c[0], *[str(v) for v in c[1:]])):
+        esperado = esperados.get(chave, 0)
+        armazenado = armazenados.get(chave, 0)
+        if esperado != armazenado:
+            divergencias.append({
+                "chave": chave,
+                "armazenado": armazenado,
+                "esperado": esperado
+            })
+
+    if corrigir and divergencias:
+        stmt = insert(ContribuicaoDiaria).values([
+            {
+                "dia": d["chave"][0],
+                "documento": d["chave"][1],
+                "tipo": d["chave"][2],
+                "uf": d["chave"][3],
+                "status_moderacao": d["chave"][4],
+                "total": d["esperado"]
+            }
+            for d in divergencias
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                ContribuicaoDiaria.dia,
+                ContribuicaoDiaria.documento,
+                ContribuicaoDiaria.tipo,
+                ContribuicaoDiaria.uf,
+                ContribuicaoDiaria.status_moderacao
+            ],
+            set_={"total": stmt.excluded.total}
+        )
+        await db.execute(stmt)
+
+    return divergencias
@@ -0,0 +1,184 @@
+"""
+Cache assíncrono em memória: TTL por chave, single-flight e invalidação por eventos
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+# Constantes para eventos de escrita que invalidam caches (para consistência)
+class EventosCache:
+    """Constantes para eventos de invalidação de cache"""
+    CONTRIBUICAO = "CONTRIBUICAO"  # Contribuição criada
+    MODERACAO = "MODERACAO"        # Contribuição aprovada/rejeitada
+    PARTICIPANTE = "PARTICIPANTE"  # Participante criado
+    PROTOCOLO = "PROTOCOLO"        # Protocolo gerado
+
+
+class CacheAssincrono:
+    """
+    Cache em processo para resultados de corrotinas
+
+    - TTL por chave
+    - Single-flight: chamadas concorrentes para a mesma chave ausente
+      aguardam um único cálculo
+    - Invalidação por eventos (ex: moderação invalida estatísticas)
+    - Contadores de acertos/falhas para ajuste de TTLs
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._valores: Dict[str, Tuple[float, Any]] = {}  # chave -> (expira_em, valor)
+        self._em_andamento: Dict[str, asyncio.Future] = {}
+        self._versoes: Dict[str, int] = {}  # incrementada a cada invalidação da chave
+        self._chaves_por_evento: Dict[str, Set[str]] = {}
+
+        self.acertos = 0
+        self.falhas = 0
+        self.deduplicadas = 0
+        self.invalidacoes = 0
+
+        _caches.append(self)
+
+    async def obter_ou_calcular(
+        self,
+        chave: str,
+        ttl: float,
+        calcular: Callable[[], Awaitable[Any]],
+        eventos: Iterable[str] = ()
+    ) -> Any:
+        """
+        Retorna o valor em cache ou calcula (uma única vez entre concorrentes)
+
+        Args:
+            chave: Chave do cache (deve incluir os parâmetros da consulta)
+            ttl: Tempo de vida em segundos
+            calcular: Corrotina sem argumentos que produz o valor
+            eventos: Eventos (EventosCache) que invalidam esta chave
+
+        Returns:
+            Valor calculado ou em cache
+        """
+        while True:
+            item = self._valores.get(chave)
+            if item is not None and item[0] > time.monotonic():
+                self.acertos += 1
+                return item[1]
+
+            futuro = self._em_andamento.get(chave)
+            if futuro is None:
+                break
+
+            # Outro cálculo em andamento: aguarda o mesmo resultado
+            self.deduplicadas += 1
+            try:
+                return await asyncio.shield(futuro)
+            except asyncio.CancelledError:
+                if futuro.cancelled():
+                    # Quem calculava foi cancelado; tenta novamente
+                    continue
+                raise
+
+        self.falhas += 1
+        futuro = asyncio.get_running_loop().create_future()
+        self._em_andamento[chave] = futuro
+        versao = self._versoes.get(chave, 0)
+
+        for evento in eventos:
+            self._chaves_por_evento.setdefault(evento, set()).add(chave)
+
+        try:
+            valor = await calcular()
+        except asyncio.CancelledError:
+            futuro.cancel()
+            raise
+        except Exception as exc:
+            futuro.set_exception(exc)
+            futuro.exception()  # Evita aviso de exceção não consumida
+            raise
+        else:
+            # Não grava se a chave foi invalidada durante o cálculo
+            if self._versoes.get(chave, 0) == versao:
+                self._valores[chave] = (time.monotonic() + ttl, valor)
+            futuro.set_result(valor)
+            return valor
+        finally:
+            if self._em_andamento.get(chave) is futuro:
+                del self._em_andamento[chave]
+
+    def invalidar(self, chave: str) -> None:
+        """Remove uma chave do cache"""
+        self._valores.pop(chave, None)
+        self._versoes[chave] = self._versoes.get(chave, 0) + 1
+        self.invalidacoes += 1
+
+    def invalidar_evento(self, evento: str) -> None:
+        """Remove todas as chaves associadas a um evento"""
+        for chave in self._chaves_por_evento.get(evento, set()):
+            self.invalidar(chave)
+
+    def limpar(self) -> None:
+        """Remove todas as chaves"""
+        for chave in list(self._valores):
+            self.invalidar(chave)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna contadores de uso do cache"""
+        consultas = self.acertos + self.falhas
+        return {
+            "nome": self.nome,
+            "chaves": len(self._valores),
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "deduplicadas": self.deduplicadas,
+            "invalidacoes": self.invalidacoes,
+            "taxa_acerto": round(self.acertos / consultas * 100, 2) if consultas else 0
+        }
+
+
+# Registro de caches do processo (para invalidação por eventos)
+_caches: List[CacheAssincrono] = []
+
+_CHAVE_EVENTOS = "eventos_cache"
+
+
+def registrar_evento(db: AsyncSession, evento: str) -> None:
+    """
+    Agenda a invalidação dos caches afetados por um evento de escrita
+
+    A invalidação só ocorre após o commit da sessão; em caso de rollback,
+    o evento é descartado.
+
+    Args:
+        db: Sessão do banco em que a escrita foi feita
+        evento: Evento (EventosCache)
+    """
+    db.info.setdefault(_CHAVE_EVENTOS, set()).add(evento)
+
+
+def invalidar_evento(evento: str) -> None:
+    """Invalida imediatamente, em todos os caches, as chaves ligadas ao evento"""
+    for cache in _caches:
+        cache.invalidar_evento(evento)
+
+
+def estatisticas_caches() -> List[Dict[str, Any]]:
+    """Retorna estatísticas de todos os caches do processo"""
+    return [cache.estatisticas() for cache in _caches]
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_apos_commit(session: Session) -> None:
+    """Aplica as invalidações agendadas na sessão após o commit"""
+    for evento in session.info.pop(_CHAVE_EVENTOS, ()):
+        invalidar_evento(evento)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_eventos(session: Session) -> None:
+    """Descarta invalidações agendadas quando a transação é desfeita"""
+    session.info.pop(_CHAVE_EVENTOS, None)
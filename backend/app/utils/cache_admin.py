@@ -0,0 +1,151 @@
+"""
+Cache do principal de administradores (id, role, ativo)
+
+Evita um round trip ao banco por requisição administrativa. A invalidação é
+imediata no processo que fez a alteração (após o commit) e chega aos demais
+workers via Postgres LISTEN/NOTIFY.
+"""
+import asyncio
+import logging
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import async_engine
+from ..models.admin import Admin, AdminRole
+from .cache import CacheAssincrono
+
+logger = logging.getLogger(__name__)
+
+# Canal NOTIFY com o ID do admin alterado como payload
+CANAL_INVALIDACAO_ADMIN = "admin_principal_invalidado"
+
+# Intervalo de verificação da conexão LISTEN (e espera antes de reconectar)
+_INTERVALO_VERIFICACAO_SEGUNDOS = 30
+
+_CHAVE_ADMINS_ALTERADOS = "admins_alterados"
+
+
+class PrincipalAdmin(NamedTuple):
+    """Dados do administrador autenticado necessários para autorização"""
+    id: int
+    role: AdminRole
+    ativo: bool
+
+
+cache_principais = CacheAssincrono("admins")
+
+
+async def obter_principal(db: AsyncSession, admin_id: int) -> Optional[PrincipalAdmin]:
+    """
+    Busca o principal do admin (em cache por CACHE_ADMIN_TTL_SEGUNDOS)
+
+    Args:
+        db: Sessão do banco
+        admin_id: ID do admin
+
+    Returns:
+        PrincipalAdmin ou None se não encontrado
+    """
+    async def calcular():
+        result = await db.execute(
+            select(Admin.id, Admin.role, Admin.ativo).where(Admin.id == admin_id)
+        )
+        row = result.first()
+        return PrincipalAdmin(row.id, row.role, row.ativo) if row else None
+
+    return await cache_principais.obter_ou_calcular(
+        str(admin_id),
+        settings.CACHE_ADMIN_TTL_SEGUNDOS,
+        calcular
+    )
+
+
+async def registrar_alteracao_admin(db: AsyncSession, admin_id: int) -> None:
+    """
+    Agenda a invalidação do principal de um admin alterado
+
+    O NOTIFY é emitido na mesma transação: o Postgres só o entrega aos
+    outros workers após o commit (e o descarta em caso de rollback).
+
+    Args:
+        db: Sessão do banco em que a alteração foi feita
+        admin_id: ID do admin alterado
+    """
+    db.info.setdefault(_CHAVE_ADMINS_ALTERADOS, set()).add(admin_id)
+    await db.execute(
+        select(func.pg_notify(CANAL_INVALIDACAO_ADMIN, str(admin_id)))
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_apos_commit(session: Session) -> None:
+    """Invalida no processo local os admins alterados na sessão"""
+    for admin_id in session.info.pop(_CHAVE_ADMINS_ALTERADOS, ()):
+        cache_principais.invalidar(str(admin_id))
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_alteracoes(session: Session) -> None:
+    """Descarta invalidações agendadas quando a transação é desfeita"""
+    session.info.pop(_CHAVE_ADMINS_ALTERADOS, None)
+
+
+class OuvinteInvalidacaoAdmin:
+    """
+    Escuta o canal de invalidação e remove principais do cache local
+
+    Mantém uma conexão dedicada em LISTEN. Se a conexão cair, o cache é
+    limpo ao reconectar, pois notificações podem ter sido perdidas.
+    """
+
+    def __init__(self):
+        self._tarefa: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        """Inicia a escuta em segundo plano"""
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.create_task(self._escutar())
+
+    async def parar(self) -> None:
+        """Encerra a escuta"""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def _ao_notificar(self, conexao, pid: int, canal: str, payload: str) -> None:
+        cache_principais.invalidar(payload)
+
+    async def _escutar(self) -> None:
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    conexao = (await conn.get_raw_connection()).driver_connection
+                    await conexao.add_listener(CANAL_INVALIDACAO_ADMIN, self._ao_notificar)
+                    cache_principais.limpar()
+                    try:
+                        while True:
+                            await asyncio.sleep(_INTERVALO_VERIFICACAO_SEGUNDOS)
+                            await conexao.execute("SELECT 1")
+                    finally:
+                        if not conexao.is_closed():
+                            await conexao.remove_listener(
+                                CANAL_INVALIDACAO_ADMIN, self._ao_notificar
+                            )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha na escuta de invalidação de admins; reconectando")
+                cache_principais.limpar()
+                await asyncio.sleep(_INTERVALO_VERIFICACAO_SEGUNDOS)
+
+
+# Instância global (iniciada no startup da aplicação)
+ouvinte_invalidacao_admin = OuvinteInvalidacaoAdmin()
@@ -0,0 +1,190 @@
+"""
+Normalização da localização na minuta (capítulo, artigo, parágrafo, inciso, alínea)
+
+Os campos de localização são texto livre ("Art. 7º", "art 7", "Artigo 7",
+"§ 2º, inciso IV"). Este módulo extrai uma chave numérica ordenável e
+indexável a partir deles.
+"""
+import re
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, Query, status
+
+
+class ChaveDispositivo(NamedTuple):
+    """
+    Chave numérica de um dispositivo da minuta
+
+    Componentes ausentes valem 0 (ex: caput tem paragrafo=0).
+    `artigo` é None quando o texto não permite identificar o artigo.
+    """
+    artigo: Optional[int]
+    paragrafo: int = 0
+    inciso: int = 0
+    alinea: int = 0
+
+
+_VALORES_ROMANOS = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+
+_RE_ARTIGO = re.compile(r"\bart(?:igo|\.)?\s*(\d+)", re.IGNORECASE)
+_RE_NUMERO = re.compile(r"(\d+)")
+_RE_PARAGRAFO_UNICO = re.compile(r"(?:§|par[aá]grafo)\s*[uú]nico", re.IGNORECASE)
+_RE_PARAGRAFO = re.compile(r"(?:§+|\bpar[aá]grafo|\bpar\.)\s*(\d+)", re.IGNORECASE)
+_RE_INCISO = re.compile(r"\binc(?:iso|\.)?\s*([IVXLCDM]+|\d+)\b", re.IGNORECASE)
+_RE_ALINEA = re.compile(r"\bal[ií]nea\s*[\"'“‘(]?([a-z])\b", re.IGNORECASE)
+_RE_CAPITULO = re.compile(r"\bcap(?:[ií]tulo|\.)?\s*([IVXLCDM]+|\d+)\b", re.IGNORECASE)
+
+
+def romano_para_inteiro(romano: str) -> Optional[int]:
+    """
+    Converte numeral romano para inteiro
+
+    Args:
+        romano: Numeral romano (ex: "XIV")
+
+    Returns:
+        Inteiro ou None se inválido
+    """
+    romano = romano.upper()
+    if not romano or any(c not in _VALORES_ROMANOS for c in romano):
+        return None
+
+    total = 0
+    for i, c in enumerate(romano):
+        valor = _VALORES_ROMANOS[c]
+        if i + 1 < len(romano) and valor < _VALORES_ROMANOS[romano[i + 1]]:
+            total -= valor
+        else:
+            total += valor
+    return total
+
+
+def _numero(texto: str) -> Optional[int]:
+    """Converte número arábico ou romano"""
+    return int(texto) if texto.isdigit() else romano_para_inteiro(texto)
+
+
+def extrair_numero_artigo(artigo: Optional[str]) -> Optional[int]:
+    """
+    Extrai o número do artigo ("Art. 7º", "art 7", "Artigo 7", "7")
+
+    Returns:
+        Número do artigo ou None
+    """
+    if not artigo:
+        return None
+
+    match = _RE_ARTIGO.search(artigo) or _RE_NUMERO.search(artigo)
+    return int(match.group(1)) if match else None
+
+
+def extrair_numero_capitulo(titulo_capitulo: Optional[str]) -> Optional[int]:
+    """
+    Extrai o número do capítulo ("Capítulo III - Dos Deveres" -> 3)
+
+    Returns:
+        Número do capítulo ou None
+    """
+    if not titulo_capitulo:
+        return None
+
+    match = _RE_CAPITULO.search(titulo_capitulo)
+    return _numero(match.group(1)) if match else None
+
+
+def extrair_chave_dispositivo(
+    artigo: Optional[str],
+    paragrafo_inciso_alinea: Optional[str] = None
+) -> ChaveDispositivo:
+    """
+    Extrai a chave numérica do dispositivo
+
+    Parágrafo, inciso e alínea são procurados nos dois campos, pois é comum
+    o participante escrever "Art. 7º, inciso IV" apenas no campo de artigo.
+
+    Args:
+        artigo: Campo de artigo (texto livre)
+        paragrafo_inciso_alinea: Campo complementar (texto livre)
+
+    Returns:
+        ChaveDispositivo
+    """
+    texto = " ".join(parte for parte in (artigo, paragrafo_inciso_alinea) if parte)
+
+    paragrafo = 0
+    if _RE_PARAGRAFO_UNICO.search(texto):
+        paragrafo = 1
+    else:
+        match = _RE_PARAGRAFO.search(texto)
+        if match:
+            paragrafo = int(match.group(1))
+
+    inciso = 0
+    match = _RE_INCISO.search(texto)
+    if match:
+        inciso = _numero(match.group(1)) or 0
+
+    alinea = 0
+    match = _RE_ALINEA.search(texto)
+    if match:
+        alinea = ord(match.group(1).lower()) - ord("a") + 1
+
+    return ChaveDispositivo(
+        artigo=extrair_numero_artigo(artigo),
+        paragrafo=paragrafo,
+        inciso=inciso,
+        alinea=alinea
+    )
+
+
+class FiltroDispositivo(NamedTuple):
+    """Filtro por localização na minuta (sobre a chave normalizada)"""
+    artigo: Optional[ChaveDispositivo] = None  # Dispositivo específico (componentes 0 são ignorados)
+    artigo_texto: Optional[str] = None         # Texto não reconhecido (comparação exata)
+    artigo_inicio: Optional[int] = None
+    artigo_fim: Optional[int] = None
+    capitulo: Optional[int] = None
+
+
+def obter_filtro_dispositivo(
+    artigo: Optional[str] = Query(None, description="Artigo/dispositivo (ex: \"Art. 7º\", \"art 7, inciso IV\")"),
+    artigo_inicio: Optional[int] = Query(None, ge=1, description="Primeiro artigo do intervalo"),
+    artigo_fim: Optional[int] = Query(None, ge=1, description="Último artigo do intervalo"),
+    capitulo: Optional[str] = Query(None, description="Capítulo (ex: \"III\", \"3\")")
+) -> FiltroDispositivo:
+    """
+    Dependency que converte os parâmetros de localização em FiltroDispositivo
+
+    Raises:
+        HTTPException: 400 se o capítulo ou o intervalo forem inválidos
+    """
+    chave = None
+    artigo_texto = None
+    if artigo:
+        chave = extrair_chave_dispositivo(artigo)
+        if chave.artigo is None:
+            chave = None
+            artigo_texto = artigo
+
+    if artigo_inicio is not None and artigo_fim is not None and artigo_inicio > artigo_fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Intervalo de artigos inválido"
+        )
+
+    numero_capitulo = None
+    if capitulo:
+        numero_capitulo = extrair_numero_capitulo(capitulo) or _numero(capitulo.strip())
+        if numero_capitulo is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Capítulo inválido"
+            )
+
+    return FiltroDispositivo(
+        artigo=chave,
+        artigo_texto=artigo_texto,
+        artigo_inicio=artigo_inicio,
+        artigo_fim=artigo_fim,
+        capitulo=numero_capitulo
+    )
@@ -0,0 +1,123 @@
+"""
+Utilitários de cache HTTP (ETag / Last-Modified / 304)
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def gerar_etag(*partes) -> str:
+    """
+    Gera um ETag forte a partir de um carimbo de versão
+
+    Args:
+        partes: Valores que identificam a versão do recurso
+
+    Returns:
+        ETag entre aspas
+    """
+    base = "|".join(str(parte) for parte in partes)
+    return '"' + hashlib.sha256(base.encode()).hexdigest()[:32] + '"'
+
+
+def etag_codificado(etag: str, codificacao: str) -> str:
+    """ETag da representação com Content-Encoding (distinto da identidade, RFC 9110)"""
+    return etag[:-1] + "-" + codificacao + '"'
+
+
+def aceita_codificacao(request: Request, codificacao: str) -> bool:
+    """
+    Verifica se o cliente aceita um content-coding (Accept-Encoding com q-values)
+
+    Codificação listada com q=0 é recusada; sem menção explícita, vale o "*".
+    """
+    qualidade_curinga = None
+
+    for item in request.headers.get("accept-encoding", "").split(","):
+        nome, _, parametros = item.partition(";")
+        nome = nome.strip().lower()
+        if not nome:
+            continue
+
+        qualidade = 1.0
+        for parametro in parametros.split(";"):
+            chave, _, valor = parametro.partition("=")
+            if chave.strip().lower() == "q":
+                try:
+                    qualidade = float(valor)
+                except ValueError:
+                    qualidade = 0.0
+
+        if nome == codificacao:
+            return qualidade > 0
+        if nome == "*":
+            qualidade_curinga = qualidade
+
+    return qualidade_curinga is not None and qualidade_curinga > 0
+
+
+def formatar_http_data(momento_utc: datetime) -> str:
+    """Formata timestamp UTC (sem timezone) para cabeçalhos HTTP"""
+    if momento_utc.tzinfo is None:
+        momento_utc = momento_utc.replace(tzinfo=timezone.utc)
+    else:
+        momento_utc = momento_utc.astimezone(timezone.utc)
+    return format_datetime(momento_utc.replace(microsecond=0), usegmt=True)
+
+
+def nao_modificado(
+    request: Request,
+    etag: str,
+    ultima_modificacao: Optional[datetime] = None
+) -> bool:
+    """
+    Verifica se o cliente já possui a versão atual do recurso
+
+    If-None-Match tem precedência sobre If-Modified-Since (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidatos = [tag.strip() for tag in if_none_match.split(",")]
+        # Comparação fraca, como exige a RFC para If-None-Match
+        return any(tag.removeprefix("W/") == etag for tag in candidatos)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and ultima_modificacao is not None:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        return ultima_modificacao.replace(microsecond=0, tzinfo=timezone.utc) <= desde
+
+    return False
+
+
+def aplicar_cabecalhos(
+    response: Response,
+    etag: str,
+    cache_control: str,
+    ultima_modificacao: Optional[datetime] = None
+) -> None:
+    """Define ETag, Cache-Control e Last-Modified na resposta"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if ultima_modificacao is not None:
+        response.headers["Last-Modified"] = formatar_http_data(ultima_modificacao)
+
+
+def resposta_304(
+    etag: str,
+    cache_control: str,
+    ultima_modificacao: Optional[datetime] = None
+) -> Response:
+    """Resposta 304 Not Modified com os mesmos cabeçalhos de validação"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    aplicar_cabecalhos(response, etag, cache_control, ultima_modificacao)
+    return response
@@ -0,0 +1,81 @@
+"""
+Utilitários de paginação por cursor (keyset)
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def _codificar(valores: list) -> str:
+    """Serializa valores em base64 URL-safe"""
+    dados = json.dumps(valores, separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def _decodificar(cursor: str) -> list:
+    """Desserializa valores codificados por _codificar"""
+    preenchimento = "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+
+
+def codificar_cursor(criado_em: datetime, id: int) -> str:
+    """
+    Codifica a posição (criado_em, id) em um cursor opaco
+
+    Args:
+        criado_em: Data de criação do último item da página
+        id: ID do último item da página
+
+    Returns:
+        Cursor em base64 URL-safe
+    """
+    return _codificar([criado_em.isoformat(), id])
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica um cursor gerado por codificar_cursor
+
+    Args:
+        cursor: Cursor opaco
+
+    Returns:
+        Tupla (criado_em, id)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        criado_em, id = _decodificar(cursor)
+        return datetime.fromisoformat(criado_em), int(id)
+    except Exception as exc:
+        raise ValueError("Cursor inválido") from exc
+
+
+def codificar_cursor_relevancia(relevancia: float, id: int) -> str:
+    """
+    Codifica a posição (relevância, id) de uma busca em um cursor opaco
+
+    Args:
+        relevancia: Relevância do último item da página
+        id: ID do último item da página
+
+    Returns:
+        Cursor em base64 URL-safe
+    """
+    return _codificar([relevancia, id])
+
+
+def decodificar_cursor_relevancia(cursor: str) -> Tuple[float, int]:
+    """
+    Decodifica um cursor gerado por codificar_cursor_relevancia
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        relevancia, id = _decodificar(cursor)
+        return float(relevancia), int(id)
+    except Exception as exc:
+        raise ValueError("Cursor inválido") from exc
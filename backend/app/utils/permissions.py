@@ -5,18 +5,20 @@ from fastapi import HTTPException, Depends, Header, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ..core.database import get_db
-from ..models.admin import Admin, AdminRole
+from ..models.admin import AdminRole
+from .cache_admin import PrincipalAdmin, obter_principal
 from .security import verificar_token_admin
 
 
 async def obter_admin_atual(
     authorization: str = Header(..., description="Bearer token"),
     db: AsyncSession = Depends(get_db)
-) -> Admin:
+) -> PrincipalAdmin:
     """
     Dependency para obter administrador autenticado
 
-    Valida token JWT e retorna o admin autenticado.
+    Valida token JWT e retorna o principal do admin (id, role, ativo),
+    consultado no cache de principais (utils/cache_admin).
     Levanta HTTPException 401 se token inválido ou admin não encontrado.
 
     Args:
@@ -24,7 +26,7 @@ async def obter_admin_atual(
         db: Sessão do banco de dados
 
     Returns:
-        Admin autenticado
+        PrincipalAdmin autenticado
 
     Raises:
         HTTPException: 401 se não autenticado
@@ -58,7 +60,7 @@ async def obter_admin_atual(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    admin = await db.get(Admin, admin_id)
+    admin = await obter_principal(db, admin_id)
 
     if not admin:
         raise HTTPException(
@@ -81,7 +83,7 @@ def require_role(allowed_roles: List[AdminRole]):
 
     Exemplo de uso:
         @router.get("/admin/users")
-        async def listar_users(admin: Admin = Depends(require_role([AdminRole.SUPER_ADMIN]))):
+        async def listar_users(admin: PrincipalAdmin = Depends(require_role([AdminRole.SUPER_ADMIN]))):
             ...
 
     Args:
@@ -90,7 +92,7 @@ def require_role(allowed_roles: List[AdminRole]):
     Returns:
         Dependency function que valida role
     """
-    async def role_checker(admin: Admin = Depends(obter_admin_atual)) -> Admin:
+    async def role_checker(admin: PrincipalAdmin = Depends(obter_admin_atual)) -> PrincipalAdmin:
         if admin.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -117,7 +119,7 @@ def require_analista():
     return require_role([AdminRole.SUPER_ADMIN, AdminRole.MODERADOR, AdminRole.ANALISTA])
 
 
-async def verificar_pode_moderar(admin: Admin) -> bool:
+async def verificar_pode_moderar(admin: PrincipalAdmin) -> bool:
     """
     Verifica se admin pode moderar contribuições
 
@@ -130,7 +132,7 @@ async def verificar_pode_moderar(admin: Admin) -> bool:
     return admin.role in [AdminRole.SUPER_ADMIN, AdminRole.MODERADOR]
 
 
-async def verificar_pode_gerenciar_admins(admin: Admin) -> bool:
+async def verificar_pode_gerenciar_admins(admin: PrincipalAdmin) -> bool:
     """
     Verifica se admin pode gerenciar outros admins
 
@@ -143,7 +145,7 @@ async def verificar_pode_gerenciar_admins(admin: Admin) -> bool:
     return admin.role == AdminRole.SUPER_ADMIN
 
 
-async def verificar_pode_gerenciar_consultas(admin: Admin) -> bool:
+async def verificar_pode_gerenciar_consultas(admin: PrincipalAdmin) -> bool:
     """
     Verifica se admin pode gerenciar consultas públicas
 
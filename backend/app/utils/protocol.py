@@ -5,13 +5,14 @@ Exemplo: CP-CEO-2026-000001
 """
 from datetime import datetime
 import pytz
-from typing import Literal
+from typing import Literal, Optional
 from ..core.config import settings
 
 
 def gerar_protocolo(
     documento: Literal["CEO", "CPEO"],
-    sequencial: int
+    sequencial: int,
+    ano: Optional[int] = None
 ) -> str:
     """
     Gera protocolo único para contribuição
@@ -19,14 +20,15 @@ def gerar_protocolo(
     Args:
         documento: CEO ou CPEO
         sequencial: Número sequencial da contribuição
+        ano: Ano do sequencial (padrão: ano atual em horário de Brasília)
 
     Returns:
         Protocolo formatado: CP-{DOC}-{ANO}-{SEQ}
     """
     # Obtém ano atual em horário de Brasília
-    tz = pytz.timezone(settings.TIMEZONE)
-    agora = datetime.now(tz)
-    ano = agora.year
+    if ano is None:
+        tz = pytz.timezone(settings.TIMEZONE)
+        ano = datetime.now(tz).year
 
     # Formata sequencial com 6 dígitos
     seq_formatado = str(sequencial).zfill(6)
@@ -3,11 +3,15 @@ Utilitários de segurança: criptografia, hashing, tokens
 """
 import hashlib
 import base64
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from cryptography.fernet import Fernet
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, TypeVar
 import secrets
+import threading
 from passlib.context import CryptContext
 from ..core.config import settings
 
@@ -43,6 +47,85 @@ class Encryption:
 # Instância global de criptografia
 crypto = Encryption()
 
+T = TypeVar("T")
+
+
+class CriptografiaAssincrona:
+    """
+    Fachada assíncrona para criptografia (não bloqueia o event loop)
+
+    As operações rodam em um pool de threads limitado e exclusivo, para que
+    rajadas de criptografia não disputem o executor padrão do asyncio.
+    Use os métodos *_many para processar lotes em um único salto de thread.
+    """
+
+    def __init__(self, encryption: Encryption, max_workers: int):
+        self._encryption = encryption
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="crypto"
+        )
+
+    async def executar(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Executa uma função síncrona no pool de criptografia"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    def _encrypt_lote(self, dados: List[Optional[str]]) -> List[Optional[str]]:
+        return [
+            self._encryption.encrypt(item) if item is not None else None
+            for item in dados
+        ]
+
+    def _decrypt_lote(self, dados: List[Optional[str]]) -> List[Optional[str]]:
+        return [
+            self._encryption.decrypt(item) if item is not None else None
+            for item in dados
+        ]
+
+    async def encrypt(self, data: str) -> str:
+        """Criptografa uma string"""
+        return await self.executar(self._encryption.encrypt, data)
+
+    async def decrypt(self, encrypted_data: str) -> str:
+        """Descriptografa uma string"""
+        return await self.executar(self._encryption.decrypt, encrypted_data)
+
+    async def encrypt_many(self, dados: List[Optional[str]]) -> List[Optional[str]]:
+        """
+        Criptografa um lote (None é preservado)
+
+        Args:
+            dados: Strings em texto plano
+
+        Returns:
+            Strings criptografadas, na mesma ordem
+        """
+        if not dados:
+            return []
+        return await self.executar(self._encrypt_lote, list(dados))
+
+    async def decrypt_many(self, dados: List[Optional[str]]) -> List[Optional[str]]:
+        """
+        Descriptografa um lote (None é preservado)
+
+        Args:
+            dados: Strings criptografadas
+
+        Returns:
+            Strings em texto plano, na mesma ordem
+        """
+        if not dados:
+            return []
+        return await self.executar(self._decrypt_lote, list(dados))
+
+
+# Instância global da fachada assíncrona
+crypto_async = CriptografiaAssincrona(crypto, settings.CRYPTO_MAX_WORKERS)
+
 # Context para hash bcrypt (senhas de admin)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -127,6 +210,74 @@ def verificar_senha(senha_plana: str, senha_hash: str) -> bool:
             return False
 
 
+# Hash bcrypt (mesmo custo das senhas reais) usado na verificação fictícia
+HASH_SENHA_FICTICIO = "$2b$12$jTSi4Im5oYv6WhOYlLTH7uC3Q6HAGOK81qEQ2mPPa4REI4Qe8d3c2"
+
+
+class ExecutorSenhasSaturado(Exception):
+    """Fila do executor de senhas cheia (requisição deve ser rejeitada)"""
+
+
+class ExecutorSenhas:
+    """
+    Executor limitado para hash/verificação bcrypt
+
+    Cada operação bcrypt leva centenas de milissegundos de CPU. Elas rodam
+    em threads dedicadas e, quando há mais de `max_workers + limite_fila`
+    operações pendentes, novas chamadas são rejeitadas imediatamente em vez
+    de acumular uma fila sem limite (ex: ataque de credential stuffing).
+    """
+
+    def __init__(self, max_workers: int, limite_fila: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="bcrypt"
+        )
+        self._vagas = threading.BoundedSemaphore(max_workers + limite_fila)
+
+    async def executar(self, func: Callable[..., T], *args) -> T:
+        """
+        Executa uma operação de senha no pool dedicado
+
+        Raises:
+            ExecutorSenhasSaturado: Se não houver vaga na fila
+        """
+        if not self._vagas.acquire(blocking=False):
+            raise ExecutorSenhasSaturado()
+
+        try:
+            futuro = self._executor.submit(func, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+
+        # A vaga só é liberada quando a thread termina, mesmo que a
+        # requisição seja cancelada antes
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        return await asyncio.wrap_future(futuro)
+
+    async def hash(self, senha: str) -> str:
+        """Gera hash bcrypt da senha"""
+        return await self.executar(hash_senha, senha)
+
+    async def verificar(self, senha_plana: str, senha_hash: Optional[str]) -> bool:
+        """
+        Verifica senha contra hash bcrypt
+
+        Sem hash (ex: email inexistente), verifica contra HASH_SENHA_FICTICIO
+        e retorna False, para que o tempo de resposta não revele se o email
+        está cadastrado.
+        """
+        if not senha_hash:
+            await self.executar(verificar_senha, senha_plana, HASH_SENHA_FICTICIO)
+            return False
+        return await self.executar(verificar_senha, senha_plana, senha_hash)
+
+
+# Instância global do executor de senhas
+executor_senhas = ExecutorSenhas(settings.SENHAS_MAX_WORKERS, settings.SENHAS_LIMITE_FILA)
+
+
 def gerar_token_sessao(participante_id: int, tipo: str) -> str:
     """
     Gera token JWT para sessão de contribuição
@@ -0,0 +1,107 @@
+"""
+Sessão de participantes: validação do token e cache de existência
+"""
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import get_db
+from ..services import participante_service
+from .security import verificar_token_sessao
+
+
+class CacheExistencia:
+    """
+    Cache LRU com TTL de IDs confirmados no banco
+
+    Guarda apenas resultados positivos: participantes não são removidos,
+    então um ID confirmado continua válido; um ID ausente pode passar a
+    existir e por isso sempre volta a ser consultado.
+    """
+
+    def __init__(self, max_itens: int, ttl: float):
+        self._max_itens = max_itens
+        self._ttl = ttl
+        self._ids: "OrderedDict[int, float]" = OrderedDict()  # id -> expira_em
+
+    def contem(self, id: int) -> bool:
+        """Verifica se o ID está confirmado (e renova sua posição no LRU)"""
+        expira_em = self._ids.get(id)
+        if expira_em is None:
+            return False
+        if expira_em <= time.monotonic():
+            del self._ids[id]
+            return False
+        self._ids.move_to_end(id)
+        return True
+
+    def adicionar(self, id: int) -> None:
+        """Registra um ID confirmado, descartando o menos usado se cheio"""
+        self._ids[id] = time.monotonic() + self._ttl
+        self._ids.move_to_end(id)
+        while len(self._ids) > self._max_itens:
+            self._ids.popitem(last=False)
+
+
+participantes_confirmados = CacheExistencia(
+    settings.CACHE_PARTICIPANTES_MAX_ITENS,
+    settings.CACHE_PARTICIPANTES_TTL_SEGUNDOS
+)
+
+
+async def obter_participante_da_sessao(
+    authorization: str = Header(...),
+    db: AsyncSession = Depends(get_db)
+) -> int:
+    """
+    Dependency para obter participante do token
+
+    A existência do participante é consultada no banco apenas na primeira
+    requisição da sessão (ou após expirar no cache).
+
+    Args:
+        authorization: Header Authorization com Bearer token
+        db: Sessão do banco
+
+    Returns:
+        ID do participante
+
+    Raises:
+        HTTPException 401: Token inválido ou ausente
+        HTTPException 404: Participante não encontrado
+    """
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido"
+        )
+
+    token = authorization.replace("Bearer ", "")
+    payload = verificar_token_sessao(token)
+
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Sessão expirada ou inválida"
+        )
+
+    participante_id = payload.get("participante_id")
+    if not participante_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido"
+        )
+
+    # Verifica se participante existe
+    if not participantes_confirmados.contem(participante_id):
+        if not await participante_service.participante_existe(db, participante_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Participante não encontrado"
+            )
+        participantes_confirmados.adicionar(participante_id)
+
+    return participante_id
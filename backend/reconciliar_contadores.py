@@ -0,0 +1,71 @@
+"""
+Reconciliação dos contadores agregados e da consolidação diária
+
+Recalcula os contadores e o rollup dos dias selados a partir das tabelas
+base (contribuições, participantes e protocolos), reporta divergências e
+corrige-as.
+
+Uso:
+    python reconciliar_contadores.py                    # verifica e corrige
+    python reconciliar_contadores.py --apenas-verificar # só reporta
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal
+from app.services import contador_service, rollup_service
+
+
+async def main(corrigir: bool) -> int:
+    async with AsyncSessionLocal() as db:
+        divergencias = await contador_service.reconciliar_contadores(db, corrigir=corrigir)
+        divergencias_rollup = await rollup_service.reconciliar_rollup(db, corrigir=corrigir)
+
+        if corrigir:
+            await db.commit()
+        else:
+            await db.rollback()
+
+    if not divergencias and not divergencias_rollup:
+        print("Contadores e consolidação diária consistentes com as tabelas base.")
+        return 0
+
+    if divergencias:
+        print(f"{len(divergencias)} divergência(s) nos contadores:")
+        for d in divergencias:
+            print(
+                f"  {d['dimensao']}={d['valor']}: "
+                f"armazenado={d['armazenado']} esperado={d['esperado']} "
+                f"(drift={d['armazenado'] - d['esperado']:+d})"
+            )
+
+    if divergencias_rollup:
+        print(f"{len(divergencias_rollup)} divergência(s) na consolidação diária:")
+        for d in divergencias_rollup:
+            dia, documento, tipo, uf, status = d["chave"]
+            print(
+                f"  {dia} {documento.value}/{tipo.value}/{uf}/{status.value}: "
+                f"armazenado={d['armazenado']} esperado={d['esperado']} "
+                f"(drift={d['armazenado'] - d['esperado']:+d})"
+            )
+
+    if corrigir:
+        print("Divergências corrigidas.")
+        return 0
+
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reconcilia contadores agregados e consolidação diária"
+    )
+    parser.add_argument(
+        "--apenas-verificar",
+        action="store_true",
+        help="Apenas reporta divergências, sem corrigir"
+    )
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(corrigir=not args.apenas_verificar)))
@@ -0,0 +1,82 @@
+"""
+Carga de dados para os testes com PostgreSQL real
+
+Insere linhas diretamente (em massa) e acerta os contadores agregados pela
+reconciliação, sem passar pelos endpoints.
+"""
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.admin import Admin, AdminRole
+from app.models.contribuicao import Contribuicao, DocumentoConsulta, StatusModeracao, TipoContribuicao
+from app.models.participante import Participante, TipoParticipante
+from app.services import contador_service
+
+
+async def criar_admin(db: AsyncSession, nome: str) -> int:
+    admin = Admin(
+        email_hash=nome,
+        email_criptografado="x",
+        senha_hash="x",
+        nome=nome,
+        role=AdminRole.MODERADOR
+    )
+    db.add(admin)
+    await db.flush()
+    return admin.id
+
+
+async def criar_participante(db: AsyncSession, uf: str = "SP") -> int:
+    participante = Participante(
+        tipo=TipoParticipante.PESSOA_FISICA,
+        nome_completo="Participante Teste",
+        email_criptografado="x",
+        uf=uf,
+        consentimento_lgpd=datetime.utcnow()
+    )
+    db.add(participante)
+    await db.flush()
+    return participante.id
+
+
+async def inserir_contribuicoes(
+    db: AsyncSession,
+    participante_id: int,
+    quantidade: int,
+    **valores
+) -> List[int]:
+    """
+    Insere contribuições em massa (INSERT em lotes, via insertmanyvalues)
+
+    Args:
+        valores: Sobrescreve colunas (ex.: status_moderacao, criado_em)
+
+    Returns:
+        IDs inseridos, em ordem
+    """
+    linhas = [
+        {
+            "participante_id": participante_id,
+            "documento": DocumentoConsulta.CEO,
+            "titulo_capitulo": "Capítulo I - Disposições Gerais",
+            "artigo": f"Art. {i % 50 + 1}º",
+            "artigo_numero": i % 50 + 1,
+            "tipo": TipoContribuicao.ALTERACAO,
+            "texto_proposto": "Nova redação proposta para o artigo.",
+            "fundamentacao": "Fundamentação da proposta de alteração.",
+            "status_moderacao": StatusModeracao.PENDENTE,
+            "criado_em": datetime.utcnow(),
+            **valores
+        }
+        for i in range(quantidade)
+    ]
+    result = await db.execute(insert(Contribuicao).returning(Contribuicao.id), linhas)
+    return sorted(result.scalars().all())
+
+
+async def acertar_contadores(db: AsyncSession) -> None:
+    """Recalcula os contadores a partir das tabelas base"""
+    await contador_service.reconciliar_contadores(db, corrigir=True)
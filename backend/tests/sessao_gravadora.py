@@ -0,0 +1,128 @@
+"""
+Sessão assíncrona falsa que grava as instruções executadas
+
+Permite verificar quantas consultas um service faz (e quais) sem banco.
+Os resultados são devolvidos na ordem em que foram enfileirados; sem
+resultado enfileirado, execute devolve um resultado vazio.
+"""
+from typing import Any, List, Optional
+
+
+class ResultadoFalso:
+    """Resultado mínimo com a interface usada pelos services"""
+
+    def __init__(self, linhas: Optional[List[Any]] = None, rowcount: Optional[int] = None):
+        self._linhas = list(linhas or [])
+        self.rowcount = len(self._linhas) if rowcount is None else rowcount
+
+    def all(self) -> List[Any]:
+        return list(self._linhas)
+
+    def one(self) -> Any:
+        assert len(self._linhas) == 1, f"esperada uma linha, obtidas {len(self._linhas)}"
+        return self._linhas[0]
+
+    def first(self) -> Any:
+        return self._linhas[0] if self._linhas else None
+
+    def one_or_none(self) -> Any:
+        return self.first()
+
+    def scalar(self) -> Any:
+        linha = self.first()
+        if isinstance(linha, tuple):
+            return linha[0]
+        return linha
+
+    def scalar_one(self) -> Any:
+        assert self._linhas, "nenhuma linha"
+        return self.scalar()
+
+    def scalar_one_or_none(self) -> Any:
+        return self.scalar()
+
+    def scalars(self) -> "ResultadoFalso":
+        return ResultadoFalso([
+            linha[0] if isinstance(linha, tuple) else linha
+            for linha in self._linhas
+        ])
+
+
+class SessaoGravadora:
+    """
+    Sessão falsa: grava execute/flush e falha em refresh/get
+
+    Attributes:
+        instrucoes: Instruções passadas a execute, na ordem
+        adicionados: Objetos passados a add
+    """
+
+    def __init__(self, *resultados: ResultadoFalso):
+        self.instrucoes: List[Any] = []
+        self.adicionados: List[Any] = []
+        self.info: dict = {}
+        self._resultados = list(resultados)
+        self._proximo_id = 1
+
+    async def execute(self, stmt, *args, **kwargs) -> ResultadoFalso:
+        self.instrucoes.append(stmt)
+        if self._resultados:
+            return self._resultados.pop(0)
+        return ResultadoFalso()
+
+    async def scalar(self, stmt, *args, **kwargs) -> Any:
+        return (await self.execute(stmt, *args, **kwargs)).scalar()
+
+    def add(self, obj) -> None:
+        self.adicionados.append(obj)
+
+    async def flush(self, *args, **kwargs) -> None:
+        # Simula o INSERT ... RETURNING id e os defaults do lado do cliente
+        for obj in self.adicionados:
+            if getattr(obj, "id", None) is None:
+                obj.id = self._proximo_id
+                self._proximo_id += 1
+            for coluna in obj.__table__.columns:
+                if getattr(obj, coluna.key, None) is None and coluna.default is not None:
+                    if coluna.default.is_callable:
+                        setattr(obj, coluna.key, coluna.default.arg(None))
+                    elif coluna.default.is_scalar:
+                        setattr(obj, coluna.key, coluna.default.arg)
+
+    async def refresh(self, *args, **kwargs) -> None:
+        raise AssertionError("refresh inesperado: valores já são conhecidos após a escrita")
+
+    async def get(self, *args, **kwargs) -> None:
+        raise AssertionError("get inesperado: valores já são conhecidos após a escrita")
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+    def releituras(self) -> List[Any]:
+        """
+        SELECTs que leem uma tabela já escrita antes na mesma sessão
+
+        Indicam um refresh/re-SELECT de valores que a escrita (RETURNING ou
+        valores do cliente) já deveria ter fornecido.
+        """
+        from sqlalchemy.sql.util import find_tables
+
+        escritas = set()
+        releituras = []
+        for stmt in self.instrucoes:
+            if getattr(stmt, "is_dml", False):
+                escritas.add(stmt.table.name)
+            elif getattr(stmt, "is_select", False):
+                lidas = {tabela.name for tabela in find_tables(stmt, include_joins=True)}
+                if lidas & escritas:
+                    releituras.append(stmt)
+        return releituras
+
+    @property
+    def sql(self) -> List[str]:
+        """Instruções compiladas para o dialeto PostgreSQL (asyncpg)"""
+        from sqlalchemy.dialects.postgresql import asyncpg
+        return [str(stmt.compile(dialect=asyncpg.dialect())) for stmt in self.instrucoes]
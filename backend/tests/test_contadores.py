@@ -0,0 +1,54 @@
+"""
+Incrementos de contadores (PostgreSQL real)
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.contador import Contador
+from app.services import contador_service
+
+pytestmark = pytest.mark.postgres
+
+
+async def _totais(db) -> dict:
+    result = await db.execute(select(Contador.dimensao, Contador.valor, Contador.total))
+    return {(dimensao, valor): total for dimensao, valor, total in result.all()}
+
+
+async def test_decremento_de_chave_ausente_nao_cria_contador(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+
+    async with sessoes() as db:
+        await contador_service.incrementar(db, {("status", "PENDENTE"): -1})
+        await db.commit()
+
+    async with sessoes() as db:
+        assert await _totais(db) == {}
+
+
+async def test_incrementos_e_decrementos_na_mesma_instrucao(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+
+    async with sessoes() as db:
+        await contador_service.incrementar(db, {("status", "PENDENTE"): 5})
+        await db.commit()
+
+    async with sessoes() as db:
+        await contador_service.incrementar(db, {
+            ("status", "PENDENTE"): -3,
+            ("status", "APROVADA"): 3,
+            ("status", "REJEITADA"): -1,  # Ausente: ignorado
+        })
+        await db.commit()
+
+    async with sessoes() as db:
+        assert await _totais(db) == {("status", "PENDENTE"): 2, ("status", "APROVADA"): 3}
+
+    # Apenas decrementos
+    async with sessoes() as db:
+        await contador_service.incrementar(db, {("status", "PENDENTE"): -2, ("status", "APROVADA"): -1})
+        await db.commit()
+
+    async with sessoes() as db:
+        assert await _totais(db) == {("status", "PENDENTE"): 0, ("status", "APROVADA"): 2}
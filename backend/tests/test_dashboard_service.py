@@ -0,0 +1,70 @@
+"""
+Estatísticas gerais do dashboard: número de consultas e formato da resposta
+"""
+from types import SimpleNamespace
+
+from app.services import dashboard_service
+from tests.sessao_gravadora import ResultadoFalso, SessaoGravadora
+
+# Chaves da resposta antes da consolidação das consultas
+CHAVES_ESTATISTICAS = {
+    "total_contribuicoes",
+    "contribuicoes_pendente",
+    "contribuicoes_aprovada",
+    "contribuicoes_rejeitada",
+    "por_tipo",
+    "por_documento",
+    "total_participantes",
+    "participantes_pf",
+    "participantes_pj",
+    "total_protocolos",
+    "contribuicoes_24h",
+    "taxa_crescimento_24h",
+}
+
+
+def _contador(dimensao: str, valor: str, total: int) -> SimpleNamespace:
+    return SimpleNamespace(dimensao=dimensao, valor=valor, total=total)
+
+
+async def test_estatisticas_gerais_em_duas_consultas():
+    db = SessaoGravadora(
+        ResultadoFalso([
+            _contador("contribuicoes_status", "PENDENTE", 3),
+            _contador("contribuicoes_status", "APROVADA", 5),
+            _contador("aprovadas_tipo", "ALTERACAO", 5),
+            _contador("aprovadas_documento", "CEO", 5),
+            _contador("participantes_tipo", "PESSOA_FISICA", 4),
+            _contador("protocolos_documento", "CEO", 2),
+        ]),
+        ResultadoFalso([SimpleNamespace(ultimas_24h=6, anteriores_24h=3)])
+    )
+
+    stats = await dashboard_service.obter_estatisticas_gerais(db)
+
+    # Contadores agregados + janelas de 24h/48h
+    assert len(db.instrucoes) == 2
+    assert "FILTER (WHERE" in db.sql[1]
+
+    assert set(stats) == CHAVES_ESTATISTICAS
+    assert stats["total_contribuicoes"] == 8
+    assert stats["contribuicoes_pendente"] == 3
+    assert stats["contribuicoes_rejeitada"] == 0
+    assert stats["total_participantes"] == 4
+    assert stats["participantes_pj"] == 0
+    assert stats["total_protocolos"] == 2
+    assert stats["contribuicoes_24h"] == 6
+    assert stats["taxa_crescimento_24h"] == 100.0
+
+
+async def test_estatisticas_gerais_sem_dados():
+    db = SessaoGravadora(
+        ResultadoFalso(),
+        ResultadoFalso([SimpleNamespace(ultimas_24h=0, anteriores_24h=0)])
+    )
+
+    stats = await dashboard_service.obter_estatisticas_gerais(db)
+
+    assert set(stats) == CHAVES_ESTATISTICAS
+    assert stats["total_contribuicoes"] == 0
+    assert stats["taxa_crescimento_24h"] == 0
@@ -0,0 +1,186 @@
+"""
+Caixa de saída de emails contra um servidor SMTP local (aiosmtpd)
+
+Entrega, nova tentativa com backoff após falha do servidor e dead letter
+(FALHOU) ao esgotar EMAIL_OUTBOX_MAX_TENTATIVAS; o erro SMTP real fica em
+ultimo_erro.
+"""
+import email
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox, StatusEmail, TiposEmail
+from app.services import email_outbox_service
+from app.services.email_service import EmailService
+from app.utils.security import crypto_async
+
+pytestmark = pytest.mark.postgres
+
+DESTINATARIO = "participante@example.com"
+
+
+class ServidorSMTP:
+    """Handler do aiosmtpd: recusa (451) as primeiras `falhas` mensagens"""
+
+    def __init__(self):
+        self.falhas = 0
+        self.recebidas = []
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.falhas:
+            self.falhas -= 1
+            return "451 4.3.0 Caixa temporariamente indisponível"
+        self.recebidas.append(envelope)
+        return "250 OK"
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def servidor_smtp():
+    handler = ServidorSMTP()
+    controller = Controller(handler, hostname="127.0.0.1", port=_porta_livre())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+@pytest_asyncio.fixture
+async def processador(engine_postgres, servidor_smtp, monkeypatch):
+    """Processador da caixa de saída ligado ao banco e ao SMTP de teste"""
+    _, porta = servidor_smtp
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", porta)
+    monkeypatch.setattr(settings, "SMTP_USER", "")
+    monkeypatch.setattr(settings, "SMTP_PASSWORD", "")
+    monkeypatch.setattr(settings, "SMTP_MAX_MENSAGENS_POR_SEGUNDO", 0)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_TENTATIVAS", 3)
+
+    servico = EmailService()
+    monkeypatch.setattr(email_outbox_service, "email_service", servico)
+    monkeypatch.setattr(
+        email_outbox_service,
+        "AsyncSessionLocal",
+        async_sessionmaker(engine_postgres, expire_on_commit=False)
+    )
+
+    yield email_outbox_service.ProcessadorEmailOutbox()
+    await servico.fechar()
+
+
+async def _enfileirar(sessoes) -> int:
+    async with sessoes() as db:
+        item = EmailOutbox(
+            tipo=TiposEmail.RESULTADO_MODERACAO,
+            payload={
+                "email_criptografado": await crypto_async.encrypt(DESTINATARIO),
+                "nome_participante": "Participante Teste",
+                "documento": "CEO",
+                "artigo": "Art. 7º",
+                "aprovada": True
+            }
+        )
+        db.add(item)
+        await db.commit()
+        return item.id
+
+
+async def _obter(sessoes, item_id: int) -> EmailOutbox:
+    async with sessoes() as db:
+        return await db.scalar(select(EmailOutbox).where(EmailOutbox.id == item_id))
+
+
+async def _antecipar_tentativa(sessoes, item_id: int) -> None:
+    """Simula a passagem do tempo de backoff"""
+    async with sessoes() as db:
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == item_id)
+            .values(proxima_tentativa_em=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+async def test_entrega(engine_postgres, servidor_smtp, processador):
+    handler, _ = servidor_smtp
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    item_id = await _enfileirar(sessoes)
+
+    assert await processador.processar_lote() == 1
+
+    item = await _obter(sessoes, item_id)
+    assert item.status == StatusEmail.ENVIADO
+    assert item.tentativas == 1
+    assert item.enviado_em is not None
+    assert item.ultimo_erro is None
+    assert [e.rcpt_tos for e in handler.recebidas] == [[DESTINATARIO]]
+    mensagem = email.message_from_bytes(handler.recebidas[0].content)
+    texto = mensagem.get_payload(0).get_payload(decode=True).decode()
+    assert "Art. 7º" in texto
+
+
+async def test_nova_tentativa_com_backoff(engine_postgres, servidor_smtp, processador):
+    handler, _ = servidor_smtp
+    handler.falhas = 2
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    item_id = await _enfileirar(sessoes)
+    base = settings.EMAIL_OUTBOX_BACKOFF_BASE_SEGUNDOS
+
+    for tentativa in (1, 2):
+        antes = datetime.utcnow()
+        assert await processador.processar_lote() == 1
+
+        item = await _obter(sessoes, item_id)
+        assert item.status == StatusEmail.PENDENTE
+        assert item.tentativas == tentativa
+        # Erro SMTP original, não um genérico
+        assert item.ultimo_erro.startswith("SMTPDataError")
+        assert "Caixa temporariamente indisponível" in item.ultimo_erro
+
+        # Backoff exponencial (±10%): base, 2 * base, ...
+        atraso = (item.proxima_tentativa_em - antes).total_seconds()
+        esperado = base * 2 ** (tentativa - 1)
+        assert esperado * 0.9 - 1 <= atraso <= esperado * 1.1 + 1
+
+        # Antes do prazo, o email não é reenviado
+        assert await processador.processar_lote() == 0
+        await _antecipar_tentativa(sessoes, item_id)
+
+    assert await processador.processar_lote() == 1
+
+    item = await _obter(sessoes, item_id)
+    assert item.status == StatusEmail.ENVIADO
+    assert item.tentativas == 3
+    assert item.ultimo_erro is None
+    assert len(handler.recebidas) == 1
+
+
+async def test_dead_letter_apos_max_tentativas(engine_postgres, servidor_smtp, processador):
+    handler, _ = servidor_smtp
+    handler.falhas = 100
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    item_id = await _enfileirar(sessoes)
+
+    for _ in range(settings.EMAIL_OUTBOX_MAX_TENTATIVAS):
+        assert await processador.processar_lote() == 1
+        await _antecipar_tentativa(sessoes, item_id)
+
+    item = await _obter(sessoes, item_id)
+    assert item.status == StatusEmail.FALHOU
+    assert item.tentativas == settings.EMAIL_OUTBOX_MAX_TENTATIVAS
+    assert item.ultimo_erro.startswith("SMTPDataError")
+    assert handler.recebidas == []
+
+    # Fora da fila: não é mais reivindicado
+    assert await processador.processar_lote() == 0
@@ -0,0 +1,205 @@
+"""
+Escritas de linha única: os valores voltam da própria escrita
+
+Falha se algum service voltar a fazer refresh/get ou um SELECT da tabela
+recém-escrita (a sessão gravadora rejeita refresh e get).
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy.sql import Insert, Update
+
+from app.models.admin import Admin, AdminRole
+from app.models.contribuicao import Contribuicao, DocumentoConsulta, StatusModeracao, TipoContribuicao
+from app.models.historico_moderacao import HistoricoModeracao
+from app.models.participante import Participante, TipoParticipante
+from app.schemas.admin import AdminUpdate
+from app.schemas.contribuicao import ContribuicaoCreate
+from app.schemas.participante import ParticipantePFCreate
+from app.services import admin_service, contribuicao_service, moderacao_service
+from app.services import participante_service, protocolo_service
+from tests.sessao_gravadora import ResultadoFalso, SessaoGravadora
+
+
+def _admin(**valores) -> Admin:
+    return Admin(
+        id=7,
+        nome="Admin Teste",
+        role=AdminRole.MODERADOR,
+        ativo=True,
+        **valores
+    )
+
+
+def _contribuicao(status: StatusModeracao) -> Contribuicao:
+    return Contribuicao(
+        id=3,
+        participante_id=5,
+        documento=DocumentoConsulta.CEO,
+        tipo=TipoContribuicao.ALTERACAO,
+        artigo_numero=12,
+        status_moderacao=status,
+        criado_em=datetime.utcnow()
+    )
+
+
+def _assert_update_returning(db: SessaoGravadora, tabela: str) -> None:
+    escrita = db.instrucoes[0]
+    assert isinstance(escrita, Update)
+    assert escrita.table.name == tabela
+    assert " RETURNING " in db.sql[0]
+    assert db.releituras() == []
+
+
+@pytest.mark.parametrize("operacao", [
+    lambda db: admin_service.atualizar_admin(db, 7, AdminUpdate(nome="Novo Nome")),
+    lambda db: admin_service.desativar_admin(db, 7),
+    lambda db: admin_service.ativar_admin(db, 7),
+    lambda db: admin_service.resetar_senha(db, 7, "NovaSenha@123"),
+], ids=["atualizar", "desativar", "ativar", "resetar_senha"])
+async def test_admin_atualizado_em_um_update_returning(operacao, monkeypatch):
+    # O custo do bcrypt não interessa aqui, só as instruções executadas
+    async def _hash(senha: str) -> str:
+        return "hash"
+    monkeypatch.setattr(admin_service.executor_senhas, "hash", _hash)
+
+    admin = _admin()
+    db = SessaoGravadora(ResultadoFalso([admin]))
+
+    assert await operacao(db) is admin
+
+    _assert_update_returning(db, "admins")
+    # UPDATE ... RETURNING + NOTIFY de invalidação do principal
+    assert len(db.instrucoes) == 2
+
+
+async def test_admin_inexistente_nao_notifica():
+    db = SessaoGravadora(ResultadoFalso())
+
+    assert await admin_service.desativar_admin(db, 7) is None
+    assert len(db.instrucoes) == 1
+
+
+@pytest.mark.parametrize("operacao, status", [
+    (lambda db: moderacao_service.aprovar_contribuicao(db, 3, 1), StatusModeracao.APROVADA),
+    (lambda db: moderacao_service.rejeitar_contribuicao(db, 3, 1, "Fora do escopo"), StatusModeracao.REJEITADA),
+], ids=["aprovar", "rejeitar"])
+async def test_moderacao_em_um_update_returning(operacao, status):
+    contribuicao = _contribuicao(status)
+    db = SessaoGravadora(ResultadoFalso([contribuicao]))
+
+    assert await operacao(db) is contribuicao
+
+    _assert_update_returning(db, "contribuicoes")
+    assert "status_moderacao = " in db.sql[0].split(" RETURNING ")[0]
+    # Histórico gravado no próximo flush, sem consulta adicional
+    assert [type(obj) for obj in db.adicionados] == [HistoricoModeracao]
+    assert all(not isinstance(stmt, Update) for stmt in db.instrucoes[1:])
+
+
+async def test_moderacao_de_contribuicao_ja_moderada():
+    db = SessaoGravadora(ResultadoFalso())
+
+    assert await moderacao_service.aprovar_contribuicao(db, 3, 1) is None
+    assert len(db.instrucoes) == 1
+    assert db.adicionados == []
+
+
+def _dados_participante() -> ParticipantePFCreate:
+    return ParticipantePFCreate(
+        nome_completo="Maria da Silva",
+        cpf="529.982.247-25",
+        email="maria@example.com",
+        uf="SP",
+        consentimento_lgpd=True
+    )
+
+
+@pytest.fixture
+def criptografias(monkeypatch):
+    """Registra as chamadas de criptografia do service de participante"""
+    chamadas = []
+
+    async def _encrypt_many(dados):
+        chamadas.append(dados)
+        return [f"cripto:{dado}" for dado in dados]
+
+    monkeypatch.setattr(participante_service.crypto_async, "encrypt_many", _encrypt_many)
+    return chamadas
+
+
+async def test_participante_novo_em_um_insert_returning(criptografias):
+    participante = Participante(id=5, tipo=TipoParticipante.PESSOA_FISICA, uf="SP")
+    db = SessaoGravadora(ResultadoFalso(), ResultadoFalso([participante]))
+
+    resultado = await participante_service.identificar_participante_pf(db, _dados_participante())
+
+    assert resultado == (participante, True)
+    escrita = db.instrucoes[1]
+    assert isinstance(escrita, Insert)
+    assert "ON CONFLICT" in db.sql[1] and "DO NOTHING" in db.sql[1] and " RETURNING " in db.sql[1]
+    assert db.releituras() == []
+    # Busca pelo hash + INSERT + contadores
+    assert len(db.instrucoes) == 3
+    assert criptografias == [["52998224725", "maria@example.com"]]
+
+
+async def test_participante_existente_sem_escrita_nem_criptografia(criptografias):
+    participante = Participante(id=5, tipo=TipoParticipante.PESSOA_FISICA, uf="SP")
+    db = SessaoGravadora(ResultadoFalso([participante]))
+
+    resultado = await participante_service.identificar_participante_pf(db, _dados_participante())
+
+    assert resultado == (participante, False)
+    assert len(db.instrucoes) == 1
+    assert db.sql[0].startswith("SELECT")
+    assert criptografias == []
+
+
+async def test_participante_inserido_concorrentemente(criptografias):
+    participante = Participante(id=5, tipo=TipoParticipante.PESSOA_FISICA, uf="SP")
+    # SELECT vazio, INSERT sem retorno (conflito), SELECT do existente
+    db = SessaoGravadora(ResultadoFalso(), ResultadoFalso(), ResultadoFalso([participante]))
+
+    resultado = await participante_service.identificar_participante_pf(db, _dados_participante())
+
+    assert resultado == (participante, False)
+    assert len(db.instrucoes) == 3  # Sem contadores
+
+
+async def test_contribuicao_criada_sem_releitura():
+    db = SessaoGravadora()
+
+    dados = ContribuicaoCreate(
+        documento=DocumentoConsulta.CEO,
+        titulo_capitulo="Capítulo I - Disposições Gerais",
+        artigo="Art. 12",
+        tipo=TipoContribuicao.ALTERACAO,
+        texto_proposto="Nova redação proposta para o artigo.",
+        fundamentacao="Fundamentação da proposta de alteração."
+    )
+    contribuicao = await contribuicao_service.criar_contribuicao(db, 5, dados)
+
+    assert db.adicionados == [contribuicao]
+    assert contribuicao.id is not None
+    assert contribuicao.status_moderacao == StatusModeracao.PENDENTE
+    assert db.releituras() == []
+
+
+async def test_protocolo_criado_sem_releitura():
+    db = SessaoGravadora(ResultadoFalso([(1,)]))
+
+    protocolo = await protocolo_service.criar_protocolo(db, 5, DocumentoConsulta.CEO, [3, 4])
+
+    assert db.adicionados == [protocolo]
+    assert protocolo.numero_protocolo.endswith("-000001")
+    assert db.releituras() == []
+
+
+async def test_marcar_email_enviado_em_um_update():
+    db = SessaoGravadora()
+
+    await protocolo_service.marcar_email_enviado(db, 9)
+
+    assert len(db.instrucoes) == 1
+    assert isinstance(db.instrucoes[0], Update)
@@ -0,0 +1,142 @@
+"""
+Moderação em lote de 10 mil contribuições (PostgreSQL real)
+
+Verifica IDs moderados e ignorados, o histórico gravado por INSERT ...
+SELECT unnest e os deltas de contadores e rollup; reporta o tempo do lote.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.models.contador import Contador
+from app.models.contribuicao import Contribuicao, StatusModeracao
+from app.models.historico_moderacao import AcaoModeracao, HistoricoModeracao
+from app.services import contador_service, moderacao_service, rollup_service
+from app.services.contador_service import DimensoesContador
+from tests.dados_postgres import acertar_contadores, criar_admin, criar_participante, inserir_contribuicoes
+
+pytestmark = pytest.mark.postgres
+
+PENDENTES = settings.MODERACAO_LOTE_MAX_ITENS
+JA_MODERADAS = 200
+RESERVADAS = 100
+INEXISTENTES = [10_000_000 + i for i in range(50)]
+
+# Meta: bem menos de 1 s em um PostgreSQL local. O limite padrão tem folga
+# para máquinas de CI compartilhadas e pode ser ajustado por variável de ambiente.
+TEMPO_MAXIMO_SEGUNDOS = float(os.environ.get("TEST_MODERACAO_LOTE_MAX_SEGUNDOS", "1.5"))
+
+
+async def _contadores(db) -> dict:
+    result = await db.execute(
+        select(Contador.valor, Contador.total)
+        .where(Contador.dimensao == DimensoesContador.CONTRIBUICOES_STATUS)
+    )
+    return dict(result.all())
+
+
+async def test_aprovar_lote_de_10_mil(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+
+    async with sessoes() as db:
+        admin_id = await criar_admin(db, "moderador")
+        outro_admin_id = await criar_admin(db, "outro")
+        participante_id = await criar_participante(db)
+
+        # Metade das pendentes em um dia já encerrado (selado no rollup)
+        anteontem = datetime.utcnow() - timedelta(days=2)
+        pendentes = (
+            await inserir_contribuicoes(db, participante_id, PENDENTES // 2, criado_em=anteontem)
+            + await inserir_contribuicoes(db, participante_id, PENDENTES - PENDENTES // 2)
+        )
+        ja_moderadas = await inserir_contribuicoes(
+            db, participante_id, JA_MODERADAS, status_moderacao=StatusModeracao.REJEITADA
+        )
+        reservadas = await inserir_contribuicoes(db, participante_id, RESERVADAS)
+        await db.execute(
+            update(Contribuicao)
+            .where(Contribuicao.id.in_(reservadas))
+            .values(reservado_por_id=outro_admin_id, reservado_ate=datetime.utcnow() + timedelta(minutes=10))
+        )
+
+        await acertar_contadores(db)
+        await rollup_service.selar_dias_pendentes(db)
+        await db.commit()
+
+    ids = pendentes + ja_moderadas + reservadas + INEXISTENTES
+
+    async with sessoes() as db:
+        inicio = time.perf_counter()
+        moderados, ignorados = await moderacao_service.aprovar_em_lote(db, ids, admin_id)
+        await db.commit()
+        decorrido = time.perf_counter() - inicio
+
+    print(f"\nLote de {len(ids)} IDs ({len(moderados)} aprovados) em {decorrido * 1000:.0f} ms")
+    assert decorrido < TEMPO_MAXIMO_SEGUNDOS
+
+    assert moderados == pendentes
+    assert set(ignorados) == set(ja_moderadas) | set(reservadas) | set(INEXISTENTES)
+    assert all(ignorados[i] == "Contribuição já moderada (REJEITADA)" for i in ja_moderadas)
+    assert all(ignorados[i] == "Contribuição reservada por outro moderador" for i in reservadas)
+    assert all(ignorados[i] == "Contribuição não encontrada" for i in INEXISTENTES)
+
+    async with sessoes() as db:
+        # Uma linha de histórico por contribuição aprovada
+        result = await db.execute(
+            select(HistoricoModeracao.contribuicao_id)
+            .where(HistoricoModeracao.admin_id == admin_id, HistoricoModeracao.acao == AcaoModeracao.APROVAR)
+        )
+        assert sorted(result.scalars().all()) == pendentes
+
+        result = await db.execute(select(func.count(HistoricoModeracao.id)))
+        assert result.scalar_one() == PENDENTES
+
+        # Deltas dos contadores
+        assert await _contadores(db) == {
+            StatusModeracao.PENDENTE.value: RESERVADAS,
+            StatusModeracao.APROVADA.value: PENDENTES,
+            StatusModeracao.REJEITADA.value: JA_MODERADAS,
+        }
+        result = await db.execute(
+            select(Contador.total).where(
+                Contador.dimensao == DimensoesContador.APROVADAS_DOCUMENTO,
+                Contador.valor == "CEO"
+            )
+        )
+        assert result.scalar_one() == PENDENTES
+
+        # Contadores e rollup dos dias selados batem com as tabelas base
+        assert await contador_service.reconciliar_contadores(db, corrigir=False) == []
+        assert await rollup_service.reconciliar_rollup(db, corrigir=False) == []
+        await db.rollback()
+
+
+async def test_lote_sem_pendentes_nao_escreve(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+
+    async with sessoes() as db:
+        admin_id = await criar_admin(db, "moderador")
+        participante_id = await criar_participante(db)
+        aprovadas = await inserir_contribuicoes(
+            db, participante_id, 3, status_moderacao=StatusModeracao.APROVADA
+        )
+        await acertar_contadores(db)
+        await db.commit()
+
+    async with sessoes() as db:
+        antes = await _contadores(db)
+        moderados, ignorados = await moderacao_service.rejeitar_em_lote(db, aprovadas, admin_id, "Motivo")
+        await db.commit()
+
+    assert moderados == []
+    assert set(ignorados) == set(aprovadas)
+
+    async with sessoes() as db:
+        assert await _contadores(db) == antes
+        result = await db.execute(select(func.count(HistoricoModeracao.id)))
+        assert result.scalar_one() == 0
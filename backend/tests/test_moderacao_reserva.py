@@ -0,0 +1,173 @@
+"""
+Fila de moderação com reservas (PostgreSQL real)
+
+Reivindicações simultâneas (FOR UPDATE SKIP LOCKED), expiração de reservas,
+liberação restrita ao próprio moderador e bloqueio da moderação, individual
+e em lote, por reserva ativa de outro moderador.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.contribuicao import Contribuicao, StatusModeracao
+from app.services import moderacao_service
+from tests.dados_postgres import acertar_contadores, criar_admin, criar_participante, inserir_contribuicoes
+
+pytestmark = pytest.mark.postgres
+
+MODERADORES = 8
+POR_RESERVA = 25
+
+
+async def _reservas(db) -> dict:
+    result = await db.execute(
+        select(Contribuicao.id, Contribuicao.reservado_por_id).order_by(Contribuicao.id)
+    )
+    return dict(result.all())
+
+
+async def _preparar(sessoes, moderadores: int, quantidade: int):
+    async with sessoes() as db:
+        admins = [await criar_admin(db, f"moderador{i}") for i in range(moderadores)]
+        participante_id = await criar_participante(db)
+        ids = await inserir_contribuicoes(db, participante_id, quantidade)
+        await acertar_contadores(db)
+        await db.commit()
+    return admins, ids
+
+
+async def test_reivindicacoes_simultaneas_sao_disjuntas(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    # Menos pendentes do que a soma dos pedidos: a fila esgota durante a disputa
+    admins, ids = await _preparar(sessoes, MODERADORES, MODERADORES * POR_RESERVA - 30)
+
+    async def reivindicar(admin_id):
+        async with sessoes() as db:
+            contribuicoes, _ = await moderacao_service.reivindicar_pendentes(db, admin_id, POR_RESERVA)
+            await db.commit()
+            return [c.id for c in contribuicoes]
+
+    reservas = await asyncio.gather(*(reivindicar(a) for a in admins))
+
+    reivindicados = [i for lote in reservas for i in lote]
+    assert len(reivindicados) == len(set(reivindicados))
+    assert sorted(reivindicados) == ids
+    assert all(len(lote) <= POR_RESERVA for lote in reservas)
+
+    async with sessoes() as db:
+        dono = await _reservas(db)
+    for admin_id, lote in zip(admins, reservas):
+        assert all(dono[i] == admin_id for i in lote)
+
+
+async def test_reserva_expirada_volta_para_fila(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    (primeiro, segundo), ids = await _preparar(sessoes, 2, 10)
+
+    async with sessoes() as db:
+        contribuicoes, reservado_ate = await moderacao_service.reivindicar_pendentes(db, primeiro, 10)
+        await db.commit()
+    assert [c.id for c in contribuicoes] == ids
+    assert reservado_ate > datetime.utcnow()
+
+    # Reserva ativa: nada disponível para o segundo moderador
+    async with sessoes() as db:
+        contribuicoes, _ = await moderacao_service.reivindicar_pendentes(db, segundo, 10)
+        await db.commit()
+    assert contribuicoes == []
+
+    # Expira metade das reservas do primeiro moderador
+    expiradas = ids[:5]
+    async with sessoes() as db:
+        await db.execute(
+            update(Contribuicao)
+            .where(Contribuicao.id.in_(expiradas))
+            .values(reservado_ate=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await db.commit()
+
+    async with sessoes() as db:
+        contribuicoes, _ = await moderacao_service.reivindicar_pendentes(db, segundo, 10)
+        await db.commit()
+    assert [c.id for c in contribuicoes] == expiradas
+
+    async with sessoes() as db:
+        dono = await _reservas(db)
+    assert all(dono[i] == segundo for i in expiradas)
+    assert all(dono[i] == primeiro for i in ids[5:])
+
+
+async def test_liberar_reservas_so_do_proprio_moderador(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    (primeiro, segundo), ids = await _preparar(sessoes, 2, 10)
+
+    async with sessoes() as db:
+        do_primeiro, _ = await moderacao_service.reivindicar_pendentes(db, primeiro, 4)
+        do_segundo, _ = await moderacao_service.reivindicar_pendentes(db, segundo, 4)
+        await db.commit()
+    do_primeiro = [c.id for c in do_primeiro]
+    do_segundo = [c.id for c in do_segundo]
+
+    # IDs do outro moderador são ignorados
+    async with sessoes() as db:
+        liberadas = await moderacao_service.liberar_reservas(db, primeiro, do_segundo + do_primeiro[:1])
+        await db.commit()
+    assert liberadas == 1
+
+    async with sessoes() as db:
+        dono = await _reservas(db)
+    assert dono[do_primeiro[0]] is None
+    assert all(dono[i] == primeiro for i in do_primeiro[1:])
+    assert all(dono[i] == segundo for i in do_segundo)
+
+    # Sem IDs: libera todas as reservas restantes do moderador, e só elas
+    async with sessoes() as db:
+        liberadas = await moderacao_service.liberar_reservas(db, primeiro)
+        await db.commit()
+    assert liberadas == 3
+
+    async with sessoes() as db:
+        dono = await _reservas(db)
+    assert all(dono[i] is None for i in do_primeiro)
+    assert all(dono[i] == segundo for i in do_segundo)
+
+
+async def test_reserva_de_outro_moderador_bloqueia_moderacao(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    (dono_id, outro_id), ids = await _preparar(sessoes, 2, 6)
+
+    async with sessoes() as db:
+        reservadas, _ = await moderacao_service.reivindicar_pendentes(db, dono_id, 6)
+        await db.commit()
+    assert [c.id for c in reservadas] == ids
+
+    async with sessoes() as db:
+        assert await moderacao_service.aprovar_contribuicao(db, ids[0], outro_id) is None
+        assert await moderacao_service.rejeitar_contribuicao(db, ids[1], outro_id, "Motivo") is None
+
+        moderados, ignorados = await moderacao_service.aprovar_em_lote(db, ids[2:4], outro_id)
+        assert moderados == []
+        assert ignorados == {i: "Contribuição reservada por outro moderador" for i in ids[2:4]}
+
+        moderados, ignorados = await moderacao_service.rejeitar_em_lote(db, ids[4:], outro_id, "Motivo")
+        assert moderados == []
+        assert set(ignorados) == set(ids[4:])
+        await db.commit()
+
+    async with sessoes() as db:
+        result = await db.execute(
+            select(Contribuicao.status_moderacao).where(Contribuicao.id.in_(ids))
+        )
+        assert set(result.scalars().all()) == {StatusModeracao.PENDENTE}
+
+    # O dono da reserva modera normalmente, e a reserva é liberada
+    async with sessoes() as db:
+        aprovada = await moderacao_service.aprovar_contribuicao(db, ids[0], dono_id)
+        moderados, ignorados = await moderacao_service.aprovar_em_lote(db, ids[1:], dono_id)
+        await db.commit()
+    assert aprovada is not None and aprovada.reservado_por_id is None
+    assert moderados == ids[1:]
+    assert ignorados == {}
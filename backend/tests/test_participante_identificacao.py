@@ -0,0 +1,87 @@
+"""
+Identificação de participantes (PostgreSQL real)
+
+Reidentificação não escreve nem criptografa; identificações simultâneas do
+mesmo CPF criam um único participante (ON CONFLICT DO NOTHING + SELECT).
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import literal_column, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.participante import Participante
+from app.schemas.participante import ParticipantePFCreate
+from app.services import contador_service, participante_service
+from app.services.contador_service import DimensoesContador
+
+pytestmark = pytest.mark.postgres
+
+DADOS = ParticipantePFCreate(
+    nome_completo="Maria da Silva",
+    cpf="529.982.247-25",
+    email="maria@example.com",
+    uf="SP",
+    consentimento_lgpd=True
+)
+
+
+async def _identificar(sessoes):
+    async with sessoes() as db:
+        participante, criado = await participante_service.identificar_participante_pf(db, DADOS)
+        await db.commit()
+        return participante.id, criado
+
+
+async def _versoes(sessoes) -> list:
+    """(id, xmin) de cada participante: xmin muda a cada nova versão da linha"""
+    async with sessoes() as db:
+        result = await db.execute(
+            select(Participante.id, literal_column("participantes.xmin::text")).order_by(Participante.id)
+        )
+        return result.all()
+
+
+async def _total_pf(sessoes) -> int:
+    async with sessoes() as db:
+        return await contador_service.obter_contador(
+            db, DimensoesContador.PARTICIPANTES_TIPO, "PESSOA_FISICA"
+        )
+
+
+async def test_reidentificacao_nao_escreve_nem_criptografa(engine_postgres, monkeypatch):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    participante_id, criado = await _identificar(sessoes)
+    assert criado
+    versoes = await _versoes(sessoes)
+
+    async def _sem_criptografia(dados):
+        raise AssertionError("participante existente não deve ser criptografado")
+
+    monkeypatch.setattr(participante_service.crypto_async, "encrypt_many", _sem_criptografia)
+
+    assert await _identificar(sessoes) == (participante_id, False)
+    assert await _versoes(sessoes) == versoes
+    assert await _total_pf(sessoes) == 1
+
+
+async def test_identificacoes_simultaneas_criam_um_participante(engine_postgres, monkeypatch):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    concorrentes = 4
+
+    # Todas passam pelo SELECT (sem encontrar) antes de qualquer INSERT
+    barreira = asyncio.Barrier(concorrentes)
+    encrypt_many = participante_service.crypto_async.encrypt_many
+
+    async def _criptografar_junto(dados):
+        await barreira.wait()
+        return await encrypt_many(dados)
+
+    monkeypatch.setattr(participante_service.crypto_async, "encrypt_many", _criptografar_junto)
+
+    resultados = await asyncio.gather(*(_identificar(sessoes) for _ in range(concorrentes)))
+
+    assert len({participante_id for participante_id, _ in resultados}) == 1
+    assert sorted(criado for _, criado in resultados) == [False] * (concorrentes - 1) + [True]
+    assert len(await _versoes(sessoes)) == 1
+    assert await _total_pf(sessoes) == 1
@@ -0,0 +1,82 @@
+"""
+Pool de conexões SMTP com um cliente SMTP falso (sem rede)
+"""
+import time
+
+import aiosmtplib
+import pytest
+
+from app.core.config import settings
+from app.services import email_service as modulo_email
+from app.services.email_service import EmailService
+
+
+class SMTPFalso:
+    """Cliente SMTP falso: conexões `mortas` foram encerradas pelo servidor"""
+
+    abertas = []
+
+    def __init__(self, morta: bool = False, **opcoes):
+        self.morta = morta
+        self.enviadas = []
+        self.is_connected = True
+
+    async def connect(self):
+        SMTPFalso.abertas.append(self)
+
+    async def login(self, usuario, senha):
+        pass
+
+    async def noop(self):
+        if self.morta:
+            raise aiosmtplib.SMTPServerDisconnected("Conexão encerrada")
+
+    async def send_message(self, mensagem):
+        if self.morta:
+            raise aiosmtplib.SMTPServerDisconnected("Conexão encerrada")
+        self.enviadas.append(mensagem)
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def servico(monkeypatch):
+    monkeypatch.setattr(settings, "SMTP_MAX_MENSAGENS_POR_SEGUNDO", 0)
+    monkeypatch.setattr(modulo_email.aiosmtplib, "SMTP", SMTPFalso)
+    SMTPFalso.abertas = []
+    return EmailService()
+
+
+async def test_nova_tentativa_nao_reutiliza_conexao_ociosa_morta(servico):
+    # Todas as ociosas foram encerradas pelo servidor, mas parecem conectadas
+    # e foram usadas há pouco (não passam por NOOP)
+    mortas = [SMTPFalso(morta=True) for _ in range(3)]
+    servico._pool._ociosas = [(smtp, time.monotonic()) for smtp in mortas]
+
+    assert await servico.enviar_email("p@example.com", "Assunto", "<p>Corpo</p>")
+
+    # Uma morta falhou e foi descartada; a nova tentativa abriu uma conexão
+    assert len(SMTPFalso.abertas) == 1
+    nova = SMTPFalso.abertas[0]
+    assert len(nova.enviadas) == 1
+    assert all(not smtp.enviadas for smtp in mortas)
+    assert not mortas[-1].is_connected
+
+    # A conexão nova volta ao pool para reuso
+    assert servico._pool._ociosas[-1][0] is nova
+
+
+async def test_falha_na_nova_conexao_e_propagada(servico, monkeypatch):
+    servico._pool._ociosas = [(SMTPFalso(morta=True), time.monotonic())]
+
+    async def conectar_morta():
+        return SMTPFalso(morta=True)
+
+    monkeypatch.setattr(servico._pool, "_conectar", conectar_morta)
+
+    with pytest.raises(aiosmtplib.SMTPServerDisconnected):
+        await servico._enviar("p@example.com", "Assunto", "<p>Corpo</p>")
@@ -0,0 +1,132 @@
+"""
+Sequencial de protocolo sob finalizações concorrentes (PostgreSQL real)
+
+Cada finalização percorre a mesma transação de POST /protocolos/finalizar:
+lista as contribuições, cria o protocolo (com os vínculos), enfileira o
+email na caixa de saída e faz o commit.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.requests import Request
+
+from app.api.protocolo import finalizar_contribuicoes
+from app.models.contribuicao import DocumentoConsulta, TipoContribuicao
+from app.models.email_outbox import EmailOutbox
+from app.models.participante import Participante, TipoParticipante
+from app.models.protocolo import Protocolo
+from app.models.protocolo_contribuicao import ProtocoloContribuicao
+from app.models.sequencial_protocolo import SequencialProtocolo
+from app.schemas.contribuicao import ContribuicaoCreate
+from app.services import contribuicao_service, protocolo_service
+
+pytestmark = pytest.mark.postgres
+
+FINALIZACOES = 200
+CONTRIBUICOES_POR_PARTICIPANTE = 2
+
+# Menos conexões que finalizações: as tarefas disputam o pool (e a linha do
+# sequencial) e o total fica abaixo do max_connections padrão (100)
+POOL = {"pool_size": 40, "max_overflow": 20, "pool_timeout": 120}
+
+
+def _requisicao() -> Request:
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/protocolos/finalizar",
+        "headers": [(b"user-agent", b"pytest")],
+        "client": ("127.0.0.1", 50000),
+    })
+
+
+async def _criar_participantes(sessoes, quantidade: int) -> list:
+    """Cria participantes, cada um com contribuições ainda não finalizadas"""
+    async with sessoes() as db:
+        participantes = [
+            Participante(
+                tipo=TipoParticipante.PESSOA_FISICA,
+                nome_completo=f"Participante {i}",
+                email_criptografado="x",
+                uf="SP",
+                consentimento_lgpd=datetime.utcnow()
+            )
+            for i in range(quantidade)
+        ]
+        db.add_all(participantes)
+        await db.flush()
+
+        dados = ContribuicaoCreate(
+            documento=DocumentoConsulta.CEO,
+            titulo_capitulo="Capítulo I - Disposições Gerais",
+            artigo="Art. 1º",
+            tipo=TipoContribuicao.ALTERACAO,
+            texto_proposto="Nova redação proposta para o artigo.",
+            fundamentacao="Fundamentação da proposta de alteração."
+        )
+        for participante in participantes:
+            for _ in range(CONTRIBUICOES_POR_PARTICIPANTE):
+                await contribuicao_service.criar_contribuicao(db, participante.id, dados)
+
+        await db.commit()
+        return [participante.id for participante in participantes]
+
+
+@pytest.mark.parametrize("engine_postgres", [POOL], indirect=True)
+async def test_finalizacoes_concorrentes_sem_lacunas(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    participantes = await _criar_participantes(sessoes, FINALIZACOES)
+
+    # Todas as finalizações liberadas ao mesmo tempo, cada uma em sua transação
+    inicio = asyncio.Event()
+
+    async def finalizar(participante_id: int) -> str:
+        await inicio.wait()
+        async with sessoes() as db:
+            resposta = await finalizar_contribuicoes(
+                DocumentoConsulta.CEO, _requisicao(), participante_id, db
+            )
+            return resposta["numero_protocolo"]
+
+    tarefas = [asyncio.create_task(finalizar(p)) for p in participantes]
+    await asyncio.sleep(0)
+    inicio.set()
+    numeros = await asyncio.gather(*tarefas)
+
+    # Únicos e sem lacunas
+    assert len(set(numeros)) == FINALIZACOES
+    sequenciais = sorted(int(numero.rsplit("-", 1)[1]) for numero in numeros)
+    assert sequenciais == list(range(1, FINALIZACOES + 1))
+
+    async with sessoes() as db:
+        result = await db.execute(select(Protocolo.numero_protocolo))
+        assert sorted(result.scalars().all()) == sorted(numeros)
+
+        result = await db.execute(select(SequencialProtocolo.ultimo))
+        assert result.scalar_one() == FINALIZACOES
+
+        # Vínculos e emails gravados na mesma transação de cada protocolo
+        result = await db.execute(select(func.count()).select_from(ProtocoloContribuicao))
+        assert result.scalar_one() == FINALIZACOES * CONTRIBUICOES_POR_PARTICIPANTE
+
+        result = await db.execute(select(func.count(EmailOutbox.id)))
+        assert result.scalar_one() == FINALIZACOES
+
+
+async def test_rollback_devolve_sequencial(engine_postgres):
+    sessoes = async_sessionmaker(engine_postgres, expire_on_commit=False)
+    participante_id, = await _criar_participantes(sessoes, 1)
+
+    async with sessoes() as db:
+        await protocolo_service.criar_protocolo(db, participante_id, DocumentoConsulta.CEO, [])
+        await db.rollback()
+
+    async with sessoes() as db:
+        resposta = await finalizar_contribuicoes(
+            DocumentoConsulta.CEO, _requisicao(), participante_id, db
+        )
+
+    assert resposta["numero_protocolo"].endswith("-000001")
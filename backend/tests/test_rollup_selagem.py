@@ -0,0 +1,133 @@
+"""
+Sincronização das escritas com a selagem do rollup
+
+Escritas do dia corrente, longe da meia-noite, não tomam o advisory lock nem
+gravam delta no rollup; dias passados e a janela antes da meia-noite sim.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.contribuicao import Contribuicao, DocumentoConsulta, StatusModeracao, TipoContribuicao
+from app.schemas.contribuicao import ContribuicaoCreate
+from app.services import contribuicao_service, moderacao_service, rollup_service
+from tests.sessao_gravadora import ResultadoFalso, SessaoGravadora
+
+# Linha do RETURNING da moderação em lote
+Linha = namedtuple("Linha", "id status_moderacao documento tipo artigo_numero criado_em")
+
+
+def _tomou_lock(db: SessaoGravadora) -> bool:
+    return any("pg_advisory_xact_lock_shared" in sql for sql in db.sql)
+
+
+def _gravou_delta(db: SessaoGravadora) -> bool:
+    return any(sql.startswith("INSERT INTO contribuicoes_diarias") for sql in db.sql)
+
+
+def _contribuicao(criado_em: datetime) -> Contribuicao:
+    return Contribuicao(
+        id=3,
+        participante_id=5,
+        documento=DocumentoConsulta.CEO,
+        tipo=TipoContribuicao.ALTERACAO,
+        artigo_numero=12,
+        status_moderacao=StatusModeracao.APROVADA,
+        criado_em=criado_em
+    )
+
+
+async def _criar(db: SessaoGravadora) -> None:
+    dados = ContribuicaoCreate(
+        documento=DocumentoConsulta.CEO,
+        titulo_capitulo="Capítulo I - Disposições Gerais",
+        artigo="Art. 12",
+        tipo=TipoContribuicao.ALTERACAO,
+        texto_proposto="Nova redação proposta para o artigo.",
+        fundamentacao="Fundamentação da proposta de alteração."
+    )
+    await contribuicao_service.criar_contribuicao(db, 5, dados)
+
+
+@pytest.fixture(autouse=True)
+def sem_dias_selados(monkeypatch):
+    monkeypatch.setattr(rollup_service, "_selado_ate", None)
+
+
+@pytest.fixture
+def longe_da_meia_noite(monkeypatch):
+    # Sem janela: o resultado não depende do horário em que o teste roda
+    monkeypatch.setattr(settings, "ROLLUP_MARGEM_SELAGEM_SEGUNDOS", 0)
+
+
+@pytest.fixture
+def perto_da_meia_noite(monkeypatch):
+    # Janela maior que um dia: qualquer horário está "perto da meia-noite"
+    monkeypatch.setattr(settings, "ROLLUP_MARGEM_SELAGEM_SEGUNDOS", 86400)
+
+
+async def test_criacao_no_dia_corrente_dispensa_lock_e_delta(longe_da_meia_noite):
+    db = SessaoGravadora()
+
+    await _criar(db)
+
+    assert not _tomou_lock(db)
+    assert not _gravou_delta(db)
+    assert len(db.instrucoes) == 1  # Apenas os contadores
+
+
+async def test_criacao_perto_da_meia_noite_sincroniza(perto_da_meia_noite):
+    db = SessaoGravadora()
+
+    await _criar(db)
+
+    assert _tomou_lock(db)
+    assert _gravou_delta(db)
+
+
+async def test_moderacao_no_dia_corrente_dispensa_lock_e_delta(longe_da_meia_noite):
+    db = SessaoGravadora(ResultadoFalso([_contribuicao(datetime.utcnow())]))
+
+    await moderacao_service.aprovar_contribuicao(db, 3, 1)
+
+    assert not _tomou_lock(db)
+    assert not _gravou_delta(db)
+
+
+async def test_moderacao_de_dia_passado_sincroniza():
+    db = SessaoGravadora(ResultadoFalso([_contribuicao(datetime.utcnow() - timedelta(days=2))]))
+
+    await moderacao_service.aprovar_contribuicao(db, 3, 1)
+
+    assert _tomou_lock(db)
+    assert _gravou_delta(db)
+
+
+async def test_dia_ja_visto_selado_grava_delta_sem_lock(monkeypatch):
+    criado_em = datetime.utcnow() - timedelta(days=2)
+    monkeypatch.setattr(rollup_service, "_selado_ate", rollup_service.hoje_brasilia() - timedelta(days=1))
+    db = SessaoGravadora(ResultadoFalso([_contribuicao(criado_em)]))
+
+    await moderacao_service.aprovar_contribuicao(db, 3, 1)
+
+    assert not _tomou_lock(db)
+    assert _gravou_delta(db)
+
+
+@pytest.mark.parametrize("dias_atras, sincroniza", [(0, False), (2, True)], ids=["hoje", "passado"])
+async def test_moderacao_em_lote(dias_atras, sincroniza, longe_da_meia_noite):
+    criado_em = datetime.utcnow() - timedelta(days=dias_atras)
+    linhas = [
+        (i, StatusModeracao.APROVADA, DocumentoConsulta.CEO, TipoContribuicao.ALTERACAO, 12, criado_em)
+        for i in (1, 2)
+    ]
+    db = SessaoGravadora(ResultadoFalso([Linha(*linha) for linha in linhas]))
+
+    moderados, _ = await moderacao_service.aprovar_em_lote(db, [1, 2], 9)
+
+    assert moderados == [1, 2]
+    assert _tomou_lock(db) is sincroniza
+    assert _gravou_delta(db) is sincroniza
+
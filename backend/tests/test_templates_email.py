@@ -0,0 +1,140 @@
+"""
+Templates de email por evento (HTML e texto simples)
+"""
+from datetime import datetime
+
+import pytest
+
+from app.services.email_service import NOMES_DOCUMENTOS, email_service
+
+# Texto simples gerado antes da extração para templates (f-string inline)
+TEXTO_PROTOCOLO_ANTERIOR = """
+CONSELHO FEDERAL DE ODONTOLOGIA
+Consulta Pública
+
+PROTOCOLO GERADO COM SUCESSO!
+
+Prezado(a) {nome_participante},
+
+Sua contribuição para a {nome_documento} foi recebida e registrada com sucesso!
+
+NÚMERO DO PROTOCOLO: {numero_protocolo}
+
+INFORMAÇÕES:
+- Documento: {nome_documento}
+- Total de Contribuições: {total_contribuicoes}
+- Data e Hora: {data_submissao}
+
+CONSULTAR PROTOCOLO:
+{url_protocolo}
+
+IMPORTANTE:
+- Guarde este número de protocolo para acompanhar sua contribuição
+- Você pode consultar o protocolo a qualquer momento através do link acima
+
+PROTEÇÃO DE DADOS (LGPD):
+Seus dados pessoais estão protegidos. Este protocolo pode ser consultado publicamente, mas informações sensíveis como CPF, CNPJ e e-mail não serão divulgadas.
+
+---
+Conselho Federal de Odontologia
+Este é um email automático, por favor não responda.
+""".strip()
+
+CONTEXTO_PROTOCOLO = {
+    "numero_protocolo": "CP-CEO-2026-000154",
+    "nome_documento": NOMES_DOCUMENTOS["CEO"],
+    "nome_participante": "Maria da Silva",
+    "total_contribuicoes": 3,
+    "data_submissao": datetime(2026, 3, 10, 14, 5).strftime("%d/%m/%Y às %H:%M"),
+    "contribuicoes": [],
+    "url_protocolo": "https://consulta.cfo.org.br/protocolos/CP-CEO-2026-000154",
+}
+
+
+def test_protocolo_texto_igual_ao_anterior():
+    _, texto = email_service._renderizar("protocolo", **CONTEXTO_PROTOCOLO)
+
+    assert texto.strip() == TEXTO_PROTOCOLO_ANTERIOR.format(**CONTEXTO_PROTOCOLO)
+
+
+def test_protocolo_html():
+    html, _ = email_service._renderizar("protocolo", **CONTEXTO_PROTOCOLO)
+
+    assert html.lstrip().startswith("<!DOCTYPE html>")
+    assert "Confirmação de Protocolo - CFO" in html
+    assert "CP-CEO-2026-000154" in html
+    assert f'href="{CONTEXTO_PROTOCOLO["url_protocolo"]}"' in html
+    assert "10/03/2026 às 14:05" in html
+    # Aviso LGPD incluído do parcial
+    assert "LGPD" in html
+
+
+def test_html_escapa_dados_do_participante():
+    contexto = {**CONTEXTO_PROTOCOLO, "nome_participante": "<script>alert(1)</script> & Cia"}
+
+    html, texto = email_service._renderizar("protocolo", **contexto)
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; Cia" in html
+    # Texto simples não é escapado
+    assert "Prezado(a) <script>alert(1)</script> & Cia," in texto
+
+
+@pytest.mark.parametrize("aprovada", [True, False], ids=["aprovada", "rejeitada"])
+def test_resultado_moderacao(aprovada):
+    html, texto = email_service._renderizar(
+        "resultado_moderacao",
+        nome_participante="Maria da Silva",
+        nome_documento=NOMES_DOCUMENTOS["CPEO"],
+        artigo="Art. 7º",
+        aprovada=aprovada,
+        motivo_rejeicao="Fora do escopo da consulta",
+        numero_protocolo="CP-CPEO-2026-000010",
+        url_protocolo="https://consulta.cfo.org.br/protocolos/CP-CPEO-2026-000010"
+    )
+
+    for corpo in (html, texto):
+        assert "Maria da Silva" in corpo
+        assert "Art. 7º" in corpo
+        assert NOMES_DOCUMENTOS["CPEO"] in corpo
+        assert "CP-CPEO-2026-000010" in corpo
+        # Motivo só aparece na rejeição
+        assert ("Fora do escopo da consulta" in corpo) is not aprovada
+
+    cabecalho = texto.splitlines()[3]
+    assert cabecalho == ("CONTRIBUIÇÃO APROVADA" if aprovada else "CONTRIBUIÇÃO NÃO APROVADA")
+
+
+def test_resultado_moderacao_sem_protocolo():
+    html, texto = email_service._renderizar(
+        "resultado_moderacao",
+        nome_participante="Maria da Silva",
+        nome_documento=NOMES_DOCUMENTOS["CEO"],
+        artigo="Art. 1º",
+        aprovada=True,
+        motivo_rejeicao=None,
+        numero_protocolo=None,
+        url_protocolo=None
+    )
+
+    assert "CONSULTAR PROTOCOLO" not in texto
+    assert "Consultar Protocolo" not in html
+
+
+def test_consulta_encerrada():
+    html, texto = email_service._renderizar(
+        "consulta_encerrada",
+        nome_participante="Maria da Silva",
+        titulo_consulta="Código de Ética Odontológica",
+        data_encerramento="30/04/2026 às 23:59",
+        url_resultados="https://consulta.cfo.org.br"
+    )
+
+    for corpo in (html, texto):
+        assert "Maria da Silva" in corpo
+        assert "Código de Ética Odontológica" in corpo
+        assert "30/04/2026 às 23:59" in corpo
+        assert "https://consulta.cfo.org.br" in corpo
+
+    assert "Consulta Pública Encerrada - CFO" in html
+    assert "CONSULTA PÚBLICA ENCERRADA" in texto